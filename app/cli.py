@@ -0,0 +1,183 @@
+"""Command-line operations that are too long-running for a request.
+
+    python -m app.cli import-tasks PROJECT_ID tasks.csv --as owner@example.com
+    python -m app.cli reconcile-task-stats [--dry-run]
+    python -m app.cli prune-tombstones
+    python -m app.cli purge-projects
+
+Run from the project root with the same environment as the API.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.database import SessionLocal
+from app.exceptions import AppException
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.user_repository import UserRepository
+from app.serialization import dumps
+from app.services.project_purge import PurgeProgress, purge_pending
+from app.services.task_import import ImportProgress, TaskImportService, run_import
+from app.services.task_stats_service import ProjectDrift, reconcile
+
+
+def import_tasks(args) -> int:
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    errors_path = args.errors or f"{args.path}.errors.ndjson"
+
+    def on_progress(progress: ImportProgress) -> None:
+        print(
+            f"\r{progress.processed} rows: {progress.imported} imported, "
+            f"{progress.failed} failed",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    with SessionLocal() as db:
+        user = UserRepository.get_by_email(db, args.as_email)
+        if user is None:
+            print(f"No user with email {args.as_email}", file=sys.stderr)
+            return 2
+        try:
+            TaskImportService.check_access(db, args.project_id, user)
+        except AppException as exc:
+            print(exc.message, file=sys.stderr)
+            return 2
+        with open(args.path, encoding="utf-8-sig", newline="") as stream, open(
+            errors_path, "wb"
+        ) as errors:
+
+            def on_error(error: dict) -> None:
+                errors.write(dumps(error) + b"\n")
+
+            progress = asyncio.run(
+                run_import(
+                    db,
+                    args.project_id,
+                    user,
+                    stream,
+                    fmt,
+                    args.chunk_size,
+                    on_error,
+                    on_progress,
+                )
+            )
+    print(file=sys.stderr)
+    if progress.failed:
+        print(f"Row errors written to {errors_path}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def reconcile_task_stats(args) -> int:
+    def on_drift(drift: ProjectDrift) -> None:
+        columns = ", ".join(
+            f"{name} {stored} -> {actual}"
+            for name, (stored, actual) in drift.columns.items()
+        )
+        if drift.due_dates:
+            columns += f"{', ' if columns else ''}{drift.due_dates} due dates"
+        print(f"project {drift.project_id}: {columns}")
+
+    with SessionLocal() as db:
+        progress = reconcile(db, args.batch_size, not args.dry_run, on_drift)
+    action = "found" if args.dry_run else "fixed"
+    print(
+        f"{progress.projects} projects checked, {progress.drifted} drifted "
+        f"({action}), {progress.orphans} orphaned counters removed",
+        file=sys.stderr,
+    )
+    return 1 if progress.drifted else 0
+
+
+def prune_tombstones(args) -> int:
+    before = datetime.now(timezone.utc) - timedelta(days=args.days)
+    with SessionLocal() as db:
+        deleted = ChangeLogRepository.prune(db, before, args.batch_size)
+    print(f"{deleted} tombstones older than {args.days} days deleted", file=sys.stderr)
+    return 0
+
+
+def purge_projects(args) -> int:
+    def on_progress(progress: PurgeProgress) -> None:
+        print(
+            f"\rproject {progress.project_id}: {progress.deleted} of "
+            f"{progress.total} tasks deleted",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    with SessionLocal() as db:
+        purged = purge_pending(db, args.batch_size, on_progress)
+    if any(progress.deleted for progress in purged):
+        print(file=sys.stderr)
+    print(f"{len(purged)} deleted projects purged", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    task_import = commands.add_parser(
+        "import-tasks", help="Import tasks from a CSV or NDJSON file"
+    )
+    task_import.add_argument("project_id", type=int)
+    task_import.add_argument("path")
+    task_import.add_argument(
+        "--as",
+        dest="as_email",
+        required=True,
+        help="email of the user the tasks are created by",
+    )
+    task_import.add_argument(
+        "--format", choices=["csv", "ndjson"], help="default: from the extension"
+    )
+    task_import.add_argument(
+        "--errors", help="per-row error file (default: PATH.errors.ndjson)"
+    )
+    task_import.add_argument(
+        "--chunk-size", type=int, default=settings.TASK_IMPORT_CHUNK_SIZE
+    )
+    task_import.set_defaults(run=import_tasks)
+
+    stats = commands.add_parser(
+        "reconcile-task-stats",
+        help="Recount per-project task counters and report (and fix) drift",
+    )
+    stats.add_argument(
+        "--batch-size", type=int, default=settings.TASK_STATS_RECONCILE_BATCH_SIZE
+    )
+    stats.add_argument(
+        "--dry-run", action="store_true", help="report drift without fixing it"
+    )
+    stats.set_defaults(run=reconcile_task_stats)
+
+    prune = commands.add_parser(
+        "prune-tombstones",
+        help="Delete records of deleted tasks and assignments past retention",
+    )
+    prune.add_argument("--days", type=int, default=settings.TOMBSTONE_RETENTION_DAYS)
+    prune.add_argument("--batch-size", type=int, default=10_000)
+    prune.set_defaults(run=prune_tombstones)
+
+    purge = commands.add_parser(
+        "purge-projects",
+        help="Finish deleting projects whose background purge was interrupted",
+    )
+    purge.add_argument(
+        "--batch-size", type=int, default=settings.PROJECT_PURGE_BATCH_SIZE
+    )
+    purge.set_defaults(run=purge_projects)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
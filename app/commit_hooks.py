@@ -0,0 +1,29 @@
+"""Run callbacks once the transaction that scheduled them commits.
+
+Repositories register a callback while they write; it runs after the
+session's transaction commits and is dropped if the transaction rolls back,
+so in-process caches are never invalidated early (and re-filled with the old
+state) or for writes that did not happen.
+"""
+
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_KEY = "after_commit_callbacks"
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    db.info.setdefault(_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_callbacks(session: Session) -> None:
+    session.info.pop(_KEY, None)
@@ -4,13 +4,45 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "process"
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
     CORS_ORIGINS: str = "*"
     APP_ENV: str = "development"
     LOG_LEVEL: str = "INFO"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    COUNT_CACHE_TTL_SECONDS: int = 15
+    COUNT_CACHE_MAX_SIZE: int = 5000
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    DASHBOARD_CACHE_MAX_SIZE: int = 10000
+    TASK_BATCH_MAX_ITEMS: int = 500
+    TASK_EXPORT_CHUNK_SIZE: int = 1000
+    TASK_IMPORT_CHUNK_SIZE: int = 1000
+    TASK_IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    TASK_STATS_RECONCILE_BATCH_SIZE: int = 500
+    CHANGES_SETTLE_SECONDS: float = 5
+    TOMBSTONE_RETENTION_DAYS: int = 30
+    PROJECT_PURGE_MIN_TASKS: int = 20000
+    PROJECT_PURGE_BATCH_SIZE: int = 5000
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    EVENT_BROKER: str = "memory"
+    EVENT_REDIS_URL: str = "redis://localhost:6379/0"
+    EVENTS_REPLAY_SIZE: int = 1000
+    EVENTS_REPLAY_MAX_PROJECTS: int = 1000
+    EVENTS_CONNECTION_BUFFER: int = 256
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    EVENTS_MAX_STREAM_SECONDS: float = 300
 
     @property
     def cors_origins_list(self) -> list[str]:
@@ -0,0 +1,120 @@
+"""Short-lived per-user cache of dashboard summaries.
+
+A summary depends on the projects the user can see or has tasks in, but a
+task write does not know whose dashboards it touches. So instead of
+invalidating by user, every entry records the change clock it was built at
+and the projects it was built from, and project writes stamp those projects
+with the clock once they commit: an entry is stale as soon as any of its
+projects changed after it was built. Writes that change which projects a
+user can see (membership, roles) drop that user's entry directly; admins
+count every project, so their entries also watch project creation, deletion
+and archiving.
+
+Change times are tracked per process. Other workers' writes are only picked
+up when the entry expires, which is why the TTL is short. A project's stamp
+is dropped once it is older than the TTL; entries built before a dropped
+stamp count as stale, which only matters for an entry whose query was still
+running when the stamp was made.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, Optional
+
+from app.cache import TTLCache
+from app.config import settings
+
+
+class DashboardCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._clock = 0
+        # project id -> (clock, monotonic time), oldest stamp first.
+        self._project_changed_at: OrderedDict[int, tuple[int, float]] = OrderedDict()
+        self._pruned_through = 0
+        self._project_set_changed_at = 0
+        self.stale = 0
+
+    def now(self) -> int:
+        """The clock to build an entry at; read it before running the query,
+        so writes that commit while it runs make the entry stale."""
+        return self._clock
+
+    def projects_changed(self, project_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._clock += 1
+            stamped = time.monotonic()
+            for project_id in project_ids:
+                self._project_changed_at[project_id] = (self._clock, stamped)
+                self._project_changed_at.move_to_end(project_id)
+            self._prune(stamped - self.entries.ttl)
+
+    def _prune(self, before: float) -> None:
+        stamps = self._project_changed_at
+        while stamps:
+            project_id, (clock, stamped) = next(iter(stamps.items()))
+            if stamped > before:
+                return
+            del stamps[project_id]
+            self._pruned_through = clock
+
+    def project_set_changed(self) -> None:
+        with self._lock:
+            self._clock += 1
+            self._project_set_changed_at = self._clock
+
+    def user_changed(self, user_id: int) -> None:
+        self.entries.invalidate(user_id)
+
+    def get(self, user_id: int, today: date) -> Optional[dict]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        built_at, project_ids, all_projects, day, summary = entry
+        with self._lock:
+            stale = (
+                day != today
+                or built_at < self._pruned_through
+                or any(
+                    self._project_changed_at.get(project_id, (0, 0))[0] > built_at
+                    for project_id in project_ids
+                )
+            )
+            if all_projects and self._project_set_changed_at > built_at:
+                stale = True
+        if stale:
+            self.stale += 1
+            self.entries.invalidate(user_id)
+            return None
+        return summary
+
+    def set(
+        self,
+        user_id: int,
+        built_at: int,
+        project_ids: set[int],
+        all_projects: bool,
+        today: date,
+        summary: dict,
+    ) -> None:
+        entry = (built_at, frozenset(project_ids), all_projects, today, summary)
+        self.entries.set(user_id, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+            self._project_changed_at.clear()
+            self._project_set_changed_at = self._clock = self._pruned_through = 0
+            self.stale = 0
+
+    def stats(self) -> dict:
+        # Stale lookups also count as hits of the underlying cache.
+        return {**self.entries.stats(), "stale": self.stale}
+
+
+dashboard_cache = DashboardCache(
+    settings.DASHBOARD_CACHE_MAX_SIZE, settings.DASHBOARD_CACHE_TTL_SECONDS
+)
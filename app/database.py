@@ -1,25 +1,128 @@
-from sqlalchemy import create_engine
+import inspect
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
-from typing import Generator
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncGenerator, Callable, Generator, Union
 from app.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+if settings.DATABASE_URL.startswith("sqlite"):
+    # Local/benchmark use only: SQLite has no server-side pool to size.
+    _engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    _engine_options = {"pool_size": 10, "max_overflow": 20}
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, **_engine_options)
+
+
+def enforce_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """``connect`` listener for SQLite engines, which leave foreign keys (and
+    so ``ON DELETE CASCADE``) off unless each connection turns them on."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", enforce_sqlite_foreign_keys)
+
+# Writes hydrate their objects from INSERT/UPDATE ... RETURNING, so nothing
+# needs to be expired and re-selected after commit.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AnySession = Union[Session, AsyncSession]
+
+
+def async_database_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        **_engine_options,
+    )
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", enforce_sqlite_foreign_keys)
+    # Objects must stay readable after commit: an expired attribute would need
+    # IO outside the greenlet when the response is serialized.
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Routers depend on ``get_db``; DATABASE_ASYNC picks which stack serves them.
+get_db = get_async_db if settings.DATABASE_ASYNC else get_sync_db
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """Sessions for work that outlives the request, such as background
+    tasks: the request's own session is closed before they run."""
+    return SessionLocal
+
+
+async def run_db(db: AnySession, fn: Callable, *args, **kwargs) -> Any:
+    """Call ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Sync sessions run ``fn`` on the threadpool; async sessions run it through
+    ``AsyncSession.run_sync``, so the same repository and service code drives
+    both stacks.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+class AsyncFacade:
+    """Awaitable mirror of a repository or service class.
+
+    ``AsyncFacade(TaskService).get_task(db, ...)`` awaits
+    ``TaskService.get_task`` via :func:`run_db`. Methods that are already
+    coroutines are returned unchanged.
+    """
+
+    def __init__(self, target: type):
+        self._target = target
+
+    def __getattr__(self, name: str) -> Callable:
+        fn = getattr(self._target, name)
+        if inspect.iscoroutinefunction(fn):
+            return fn
+
+        async def call(db: AnySession, *args, **kwargs):
+            return await run_db(db, fn, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __repr__(self) -> str:
+        return f"AsyncFacade({self._target.__name__})"
@@ -1,43 +1,73 @@
 from fastapi import Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, AnySession
 from app.models.user import User, UserRole
 from app.exceptions import UnauthorizedException, ForbiddenException
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, Principal
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+def _user_from_principal(db: AnySession, principal: Principal) -> User:
+    """Return a session-bound User for a cached principal without querying.
+
+    Columns other than the cached ones are left expired, so endpoints that
+    need e.g. the username still load the row lazily on first access.
+    """
+    if isinstance(db, AsyncSession):
+        db = db.sync_session
+    existing = db.identity_map.get(db.identity_key(User, principal.user_id))
+    if existing is not None:
+        return existing
+    user = User(
+        id=principal.user_id,
+        token_version=principal.token_version,
+        is_active=principal.is_active,
+        role=principal.role,
+    )
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ) -> User:
     if not credentials:
         raise UnauthorizedException("token_required", "Authentication required")
 
     token = credentials.credentials
     payload = AuthService.decode_access_token(token)
-    user_id = payload.get("sub")
+    user_id = int(payload.get("sub"))
     token_version = payload.get("token_version", 0)
 
-    from app.repositories.user_repository import UserRepository
+    principal = AuthService.get_cached_principal(user_id)
+    # A token newer than the cached entry means the user re-authenticated
+    # after a logout handled by another worker; re-read the row.
+    if principal is not None and token_version <= principal.token_version:
+        user = _user_from_principal(db, principal)
+    else:
+        from app.repositories.user_repository import AsyncUserRepository
 
-    user = UserRepository.get_by_id(db, int(user_id))
-    if not user:
-        raise UnauthorizedException("invalid_token", "User not found")
+        user = await AsyncUserRepository.get_by_id(db, user_id)
+        if not user:
+            raise UnauthorizedException("invalid_token", "User not found")
+        principal = AuthService.cache_principal(user)
 
-    if user.token_version != token_version:
+    if principal.token_version != token_version:
         raise UnauthorizedException("invalid_token", "Token has been invalidated")
 
-    if not user.is_active:
+    if not principal.is_active:
         raise ForbiddenException("account_disabled", "Account is deactivated")
 
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.admin:
         raise ForbiddenException("permission_denied", "Admin access required")
     return current_user
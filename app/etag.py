@@ -0,0 +1,47 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Clients may reuse a stored response only after revalidating it, and shared
+# caches must not store per-user responses at all.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over ``parts``, which must identify the response exactly."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def query_key(request: Request) -> tuple:
+    """The request's query parameters in a canonical order."""
+    return tuple(sorted(request.query_params.multi_items()))
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 if the client already holds ``etag``.
+
+    Otherwise the validator headers are set on ``response`` and ``None`` is
+    returned, so the endpoint goes on to build the body.
+    """
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+    return None
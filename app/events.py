@@ -0,0 +1,484 @@
+"""Per-project change events, streamed to clients over Server-Sent Events.
+
+Services publish a compact event once a write has committed (``task.created``,
+``member.removed``, ...). ``GET /projects/{id}/events`` streams them to every
+viewer of the project, so pages apply changes instead of reloading.
+
+Each connection reads through a :class:`Subscription` with a bounded buffer.
+A connection that cannot keep up is dropped rather than buffered without
+limit or allowed to slow publishers down; the client reconnects with the id
+of the last event it received (``Last-Event-ID``) and the broker replays what
+it missed from a bounded per-project log. When those events are no longer
+available the stream starts with a ``reset`` event, and the client reloads.
+
+The broker is pluggable (``EVENT_BROKER``): ``memory`` fans out within one
+process; ``redis`` keeps one Redis stream per project, so events published
+by any worker reach the clients of every worker.
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional, Protocol
+
+from app.config import settings
+from app.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# How long EventSource clients wait before reconnecting, in milliseconds.
+RETRY_MS = 3000
+# Events waiting for the Redis publisher before new ones are dropped, and how
+# long shutdown waits for them to go out.
+PUBLISH_QUEUE_SIZE = 10_000
+PUBLISH_FLUSH_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    project_id: int
+    type: str
+    data: dict
+
+
+class StreamLagged(Exception):
+    """The connection fell further behind than its buffer allows."""
+
+
+class Subscription(Protocol):
+    # Set when the requested Last-Event-ID could not be resumed from: the id
+    # of the position the subscription starts at instead.
+    reset: Optional[str]
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """The next event, or ``None`` if none arrived within ``timeout``
+        seconds. Raises :class:`StreamLagged` once the buffer overflowed."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class EventBroker(Protocol):
+    # Called from request threads and from the event loop alike; never blocks.
+    def publish(self, project_id: int, event_type: str, data: dict) -> None: ...
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def subscribe(
+        self, project_id: int, last_event_id: Optional[str]
+    ) -> Subscription: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class _ProjectLog:
+    __slots__ = ("events", "dropped_through")
+
+    def __init__(self, size: int):
+        self.events: deque[tuple[int, Event]] = deque(maxlen=size)
+        # Highest sequence number pushed out of ``events``.
+        self.dropped_through = 0
+
+
+class MemorySubscription:
+    def __init__(self, broker: "MemoryEventBroker", project_id: int, buffer_size: int):
+        self.broker = broker
+        self.project_id = project_id
+        self.reset: Optional[str] = None
+        self.replay: deque[Event] = deque()
+        self.lagged = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[Event] = asyncio.Queue(buffer_size)
+
+    def push(self, event: Event) -> None:
+        # Called by publishers on any thread, under the broker lock, so
+        # events reach the loop in publication order.
+        self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Event) -> None:
+        if self.lagged:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+            self.broker.lagged += 1
+            self.close()
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        if self.replay:
+            return self.replay.popleft()
+        if self.lagged:
+            raise StreamLagged()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class MemoryEventBroker:
+    """In-process fan-out with a replay log of the last ``replay_size``
+    events of each of the ``max_projects`` most recently active projects.
+
+    Event ids are ``<epoch>-<sequence>``; the epoch changes with every
+    process, so ids from before a restart are reset rather than misread.
+    """
+
+    def __init__(self, replay_size: int, max_projects: int, buffer_size: int):
+        self.replay_size = replay_size
+        self.max_projects = max_projects
+        self.buffer_size = buffer_size
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+        self._logs: OrderedDict[int, _ProjectLog] = OrderedDict()
+        # Highest sequence number of any event in an evicted project log.
+        self._evicted_through = 0
+        self._subscribers: dict[int, set[MemorySubscription]] = {}
+        self._lock = threading.Lock()
+        self.published = self.lagged = self.resets = 0
+
+    def publish(self, project_id: int, event_type: str, data: dict) -> None:
+        with self._lock:
+            self._seq += 1
+            event = Event(f"{self.epoch}-{self._seq}", project_id, event_type, data)
+            log = self._logs.get(project_id)
+            if log is None:
+                log = self._logs[project_id] = _ProjectLog(self.replay_size)
+            self._logs.move_to_end(project_id)
+            if len(log.events) == log.events.maxlen:
+                log.dropped_through = log.events[0][0]
+            log.events.append((self._seq, event))
+            while len(self._logs) > self.max_projects:
+                _, evicted = self._logs.popitem(last=False)
+                self._evicted_through = max(
+                    self._evicted_through, evicted.events[-1][0]
+                )
+            self.published += 1
+            for subscription in list(self._subscribers.get(project_id, ())):
+                try:
+                    subscription.push(event)
+                except RuntimeError:
+                    # Its event loop has closed.
+                    self._remove(subscription)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def _missed(self, project_id: int, last_event_id: str) -> Optional[list[Event]]:
+        """Events after ``last_event_id``, or ``None`` if some are gone."""
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        log = self._logs.get(project_id)
+        if log is None:
+            return None if seq < self._evicted_through else []
+        if seq < log.dropped_through:
+            return None
+        return [event for s, event in log.events if s > seq]
+
+    async def subscribe(
+        self, project_id: int, last_event_id: Optional[str]
+    ) -> MemorySubscription:
+        subscription = MemorySubscription(self, project_id, self.buffer_size)
+        with self._lock:
+            # Replay and registration happen together, so nothing published
+            # in between is missed or sent twice.
+            if last_event_id is not None:
+                missed = self._missed(project_id, last_event_id)
+                if missed is None:
+                    self.resets += 1
+                    subscription.reset = f"{self.epoch}-{self._seq}"
+                else:
+                    subscription.replay.extend(missed)
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def _remove(self, subscription: MemorySubscription) -> None:
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.project_id]
+
+    def unsubscribe(self, subscription: MemorySubscription) -> None:
+        with self._lock:
+            self._remove(subscription)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._logs.clear()
+            self._subscribers.clear()
+            self._evicted_through = 0
+            self.published = self.lagged = self.resets = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "projects": len(self._logs),
+                "published": self.published,
+                "lagged": self.lagged,
+                "resets": self.resets,
+            }
+
+
+def _stream_id(value) -> tuple[int, int]:
+    if isinstance(value, bytes):
+        value = value.decode()
+    ms, _, seq = value.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class RedisSubscription:
+    def __init__(self, broker: "RedisEventBroker", project_id: int, last_id: str):
+        self.broker = broker
+        self.project_id = project_id
+        self.last_id = last_id
+        self.reset: Optional[str] = None
+        self._pending: deque[Event] = deque()
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        if not self._pending:
+            await self._read(timeout)
+        return self._pending.popleft() if self._pending else None
+
+    async def _read(self, timeout: float) -> None:
+        client, key = self.broker.async_client, self.broker.key(self.project_id)
+        # Reads are pulled a buffer at a time, at the pace of the connection.
+        response = await client.xread(
+            {key: self.last_id},
+            count=self.broker.buffer_size,
+            block=max(1, int(timeout * 1000)),
+        )
+        if not response:
+            return
+        entries = response[0][1]
+        if len(entries) == self.broker.buffer_size:
+            # A full read means this reader is behind; if the stream has
+            # been trimmed past its position, events were lost.
+            first = await client.xrange(key, count=1)
+            if first and _stream_id(first[0][0]) > _stream_id(self.last_id):
+                raise StreamLagged()
+        for entry_id, fields in entries:
+            entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            self._pending.append(
+                Event(
+                    entry_id,
+                    self.project_id,
+                    fields[b"type"].decode(),
+                    json.loads(fields[b"data"]),
+                )
+            )
+            self.last_id = entry_id
+
+    def close(self) -> None:
+        pass
+
+
+class RedisEventBroker:
+    """One Redis stream per project, capped at about ``replay_size``
+    entries, read and written through the ``redis.asyncio`` ``async_client``.
+
+    Once :meth:`start` has run on the app's loop, :meth:`publish` only hands
+    the event to that loop, where a single task writes events in order, so
+    writes never wait on Redis. Processes that do not start the broker (the
+    CLI) publish inline with the blocking ``client``. Publish errors are
+    logged, never raised into the write.
+    """
+
+    def __init__(
+        self,
+        client,
+        async_client,
+        replay_size: int,
+        buffer_size: int,
+        prefix: str = "events:",
+    ):
+        self.client = client
+        self.async_client = async_client
+        self.replay_size = replay_size
+        self.buffer_size = buffer_size
+        self.prefix = prefix
+        self.published = self.resets = self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def key(self, project_id: int) -> str:
+        return f"{self.prefix}{project_id}"
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(PUBLISH_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._publish_queued())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), PUBLISH_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %s unpublished events", self._queue.qsize())
+        self._task.cancel()
+        self._loop = self._queue = self._task = None
+
+    def publish(self, project_id: int, event_type: str, data: dict) -> None:
+        key, fields = self.key(project_id), {"type": event_type, "data": dumps(data)}
+        if self._loop is None:
+            self.client.xadd(key, fields, maxlen=self.replay_size, approximate=True)
+            self.published += 1
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, key, fields)
+
+    def _enqueue(self, key: str, fields: dict) -> None:
+        try:
+            self._queue.put_nowait((key, fields))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Publish queue full, dropped %s on %s", fields["type"], key)
+
+    async def _publish_queued(self) -> None:
+        while True:
+            key, fields = await self._queue.get()
+            try:
+                await self.async_client.xadd(
+                    key, fields, maxlen=self.replay_size, approximate=True
+                )
+                self.published += 1
+            except Exception:
+                logger.exception("Could not publish %s on %s", fields["type"], key)
+            finally:
+                self._queue.task_done()
+
+    async def _last_id(self, key: str) -> str:
+        last = await self.async_client.xrevrange(key, count=1)
+        if not last:
+            return "0-0"
+        entry_id = last[0][0]
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    async def subscribe(
+        self, project_id: int, last_event_id: Optional[str]
+    ) -> RedisSubscription:
+        key = self.key(project_id)
+        if last_event_id is None:
+            return RedisSubscription(self, project_id, await self._last_id(key))
+        subscription = RedisSubscription(self, project_id, last_event_id)
+        try:
+            position = _stream_id(last_event_id)
+        except ValueError:
+            position = None
+        first = await self.async_client.xrange(key, count=1)
+        # An id older than the oldest kept entry may have been followed by
+        # trimmed ones.
+        if position is None or (first and _stream_id(first[0][0]) > position):
+            self.resets += 1
+            subscription.last_id = await self._last_id(key)
+            subscription.reset = subscription.last_id
+        return subscription
+
+    def clear(self) -> None:
+        self.published = self.resets = self.dropped = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "published": self.published,
+            "resets": self.resets,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+def build_broker(backend: str) -> EventBroker:
+    if backend == "memory":
+        return MemoryEventBroker(
+            settings.EVENTS_REPLAY_SIZE,
+            settings.EVENTS_REPLAY_MAX_PROJECTS,
+            settings.EVENTS_CONNECTION_BUFFER,
+        )
+    if backend == "redis":
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:
+            raise RuntimeError("EVENT_BROKER=redis needs the redis package") from exc
+        return RedisEventBroker(
+            redis.Redis.from_url(settings.EVENT_REDIS_URL),
+            redis.asyncio.Redis.from_url(settings.EVENT_REDIS_URL),
+            settings.EVENTS_REPLAY_SIZE,
+            settings.EVENTS_CONNECTION_BUFFER,
+        )
+    raise ValueError(f"Unknown event broker: {backend}")
+
+
+event_broker = build_broker(settings.EVENT_BROKER)
+
+
+def publish_event(project_id: int, event_type: str, data: dict) -> None:
+    """Publish after the write commits. A broker failure is logged and the
+    write still succeeds: clients catch up when they next reload."""
+    try:
+        event_broker.publish(project_id, event_type, data)
+    except Exception:
+        logger.exception("Could not publish %s for project %s", event_type, project_id)
+
+
+def encode_event(event: Event) -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+        event.id.encode(),
+        event.type.encode(),
+        dumps(event.data),
+    )
+
+
+async def event_stream(
+    subscription: Subscription,
+    heartbeat: float,
+    max_seconds: float,
+    ends_stream: Callable[[Event], bool],
+) -> AsyncIterator[bytes]:
+    """The SSE body for ``subscription``: a comment line every ``heartbeat``
+    seconds of silence keeps proxies from closing the connection, and the
+    stream ends after ``max_seconds`` (the client reconnects and resumes),
+    when the connection lags, or after an event for which ``ends_stream``
+    is true."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        if subscription.reset is not None:
+            yield b"id: %s\nevent: reset\ndata: {}\n\n" % subscription.reset.encode()
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await subscription.next(min(heartbeat, remaining))
+            except StreamLagged:
+                return
+            if event is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield encode_event(event)
+            if ends_stream(event):
+                return
+    finally:
+        subscription.close()
@@ -44,6 +44,23 @@ class BadRequestException(AppException):
         super().__init__(400, "bad_request", message)
 
 
+class BatchFailedException(AppException):
+    def __init__(self, details, message: str = "No operations were applied"):
+        super().__init__(400, "batch_failed", message, details)
+
+
+class GoneException(AppException):
+    def __init__(self, code: str = "gone", message: str = "No longer available"):
+        super().__init__(410, code, message)
+
+
+class ServiceUnavailableException(AppException):
+    def __init__(
+        self, code: str = "service_unavailable", message: str = "Service unavailable"
+    ):
+        super().__init__(503, code, message)
+
+
 def error_response(code: str, message: str, details=None):
     return {"error": {"code": code, "message": message, "details": details}}
 
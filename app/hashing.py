@@ -0,0 +1,98 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+# This module is imported by pool worker processes, so it must not pull in
+# app.config (which requires the full environment) or any database code.
+
+EXECUTOR_MODES = ("process", "thread", "shared")
+
+
+@lru_cache
+def crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return crypt_context(rounds).hash(password)
+
+
+def _verify(plain: str, hashed: str, rounds: int) -> bool:
+    return crypt_context(rounds).verify(plain, hashed)
+
+
+class HashingOverloaded(Exception):
+    pass
+
+
+class PasswordHashExecutor:
+    """Runs bcrypt work off the request threadpool.
+
+    ``process`` uses a dedicated process pool, ``thread`` a dedicated thread
+    pool, and ``shared`` the regular Starlette threadpool (the legacy
+    behaviour, kept for comparison). At most ``max_pending`` operations may be
+    queued or running at once; further calls raise ``HashingOverloaded``
+    instead of growing the queue without bound.
+    """
+
+    def __init__(self, mode: str, workers: int, max_pending: int, rounds: int):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown password hash executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="bcrypt"
+                    )
+            return self._executor
+
+    async def _submit(self, fn: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingOverloaded()
+            self._pending += 1
+        try:
+            if self.mode == "shared":
+                return await run_in_threadpool(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password, self.rounds)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._submit(_verify, plain, hashed, self.rounds)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
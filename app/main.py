@@ -1,17 +1,30 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.events import event_broker
 from app.exceptions import register_exception_handlers
-from app.routers import auth, users, projects, tasks, assignments
+from app.services.auth_service import password_hasher
+from app.routers import auth, users, projects, tasks, assignments, dashboard, metrics
 
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await event_broker.start()
+    yield
+    await event_broker.stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title="Trello Lite API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 register_exception_handlers(app)
@@ -31,6 +45,9 @@ app.include_router(users.router, prefix=API_PREFIX)
 app.include_router(projects.router, prefix=API_PREFIX)
 app.include_router(tasks.router, prefix=API_PREFIX)
 app.include_router(assignments.router, prefix=API_PREFIX)
+app.include_router(assignments.bulk_router, prefix=API_PREFIX)
+app.include_router(dashboard.router, prefix=API_PREFIX)
+app.include_router(metrics.router, prefix=API_PREFIX)
 
 
 @app.get("/health")
@@ -3,6 +3,8 @@ from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.assignment import Assignment
+from app.models.project_task_stats import ProjectTaskStats, ProjectTaskDueCount
+from app.models.tombstone import Tombstone
 
 __all__ = [
     "User",
@@ -13,4 +15,7 @@ __all__ = [
     "TaskStatus",
     "TaskPriority",
     "Assignment",
+    "ProjectTaskStats",
+    "ProjectTaskDueCount",
+    "Tombstone",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import DDL, String, Text, Boolean, DateTime, ForeignKey, Integer, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -25,14 +25,72 @@ class Project(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Change counter for everything served under the project (the project,
+    # its tasks, assignments and members); bumped in the same transaction as
+    # each write and used to build ETags.
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    # Set when a project too large to delete in one transaction is handed to
+    # the batched purge; the project is treated as gone from then on.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     owner: Mapped["User"] = relationship(
         "User", back_populates="owned_projects", foreign_keys=[owner_id]
     )
+    # The database cascades deletes through the ON DELETE CASCADE foreign keys;
+    # passive_deletes keeps the ORM from loading the collections to do it.
     members: Mapped[list["ProjectMember"]] = relationship(
-        "ProjectMember", back_populates="project", cascade="all, delete-orphan"
+        "ProjectMember",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     tasks: Mapped[list["Task"]] = relationship(
-        "Task", back_populates="project", cascade="all, delete-orphan"
+        "Task",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+# Name search is a substring match. Postgres serves it from a trigram GIN
+# index; SQLite from an FTS5 table with the trigram tokenizer, kept in sync
+# through triggers. Migration 0003 creates the same objects on existing
+# databases.
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_projects_name_trgm ON projects USING gin (name gin_trgm_ops)",
+):
+    event.listen(
+        Project.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+SQLITE_NAME_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE projects_name_fts USING fts5("
+    "name, content='projects', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER projects_name_fts_ai AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_name_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER projects_name_fts_ad AFTER DELETE ON projects BEGIN "
+    "INSERT INTO projects_name_fts(projects_name_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER projects_name_fts_au AFTER UPDATE OF name ON projects BEGIN "
+    "INSERT INTO projects_name_fts(projects_name_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    "INSERT INTO projects_name_fts(rowid, name) VALUES (new.id, new.name); END",
+)
+
+for _statement in SQLITE_NAME_SEARCH_DDL:
+    event.listen(
+        Project.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
     )
+event.listen(
+    Project.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS projects_name_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,40 @@
+from datetime import date
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ProjectTaskStats(Base):
+    """Task counts per project, kept in step with ``tasks`` by every
+    ``TaskRepository`` write in the same transaction. Projects without tasks
+    may have no row."""
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    todo: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    in_progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    low_priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    medium_priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    high_priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ProjectTaskDueCount(Base):
+    """Open (not done) tasks per project and due date.
+
+    Whether a task is overdue changes with the date, not with a write, so it
+    cannot be a plain counter; summing the rows before today is exact and
+    reads one small index range.
+    """
+
+    __tablename__ = "project_task_due_counts"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    due_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    open_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,6 +1,16 @@
 import enum
 from datetime import datetime, date, timezone
-from sqlalchemy import String, Text, Date, DateTime, ForeignKey, Enum as SAEnum, Index
+from sqlalchemy import (
+    DDL,
+    String,
+    Text,
+    Date,
+    DateTime,
+    ForeignKey,
+    Enum as SAEnum,
+    Index,
+    event,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -22,6 +32,8 @@ class Task(Base):
     __table_args__ = (
         Index("ix_tasks_project_status", "project_id", "status"),
         Index("ix_tasks_project_priority", "project_id", "priority"),
+        # /projects/{id}/changes seeks on this.
+        Index("ix_tasks_project_updated", "project_id", "updated_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -58,5 +70,58 @@ class Task(Base):
         "User", back_populates="created_tasks", foreign_keys=[created_by]
     )
     assignments: Mapped[list["Assignment"]] = relationship(
-        "Assignment", back_populates="task", cascade="all, delete-orphan"
+        "Assignment",
+        back_populates="task",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
+
+
+# Full-text search lives outside the mapped columns so ``select(Task)`` never
+# loads it. Postgres keeps a tsvector column, filled by a trigger, with a GIN
+# index; SQLite keeps an external-content FTS5 table in sync through triggers.
+# Migration 0002 creates the same objects on existing databases.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B')"
+)
+
+for _statement in (
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector",
+    "CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger "
+    f"AS $$ BEGIN NEW.search_vector := {SEARCH_VECTOR_SQL}; "
+    "RETURN NEW; END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER tasks_search_vector_update "
+    "BEFORE INSERT OR UPDATE OF title, description ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+):
+    event.listen(
+        Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class Tombstone(Base):
+    """A deleted task (``user_id`` is null) or assignment, kept for
+    ``/projects/{id}/changes`` until ``TOMBSTONE_RETENTION_DAYS`` have passed.
+
+    Tasks and assignments are hard-deleted, so this is the only trace a
+    client polling for changes can see of them.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_project_deleted", "project_id", "deleted_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    # No foreign keys: the rows they pointed at are gone.
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
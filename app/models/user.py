@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime, Enum as SAEnum
+from sqlalchemy import String, Boolean, DateTime, Enum as SAEnum, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -40,14 +40,21 @@ class User(Base):
 
     # Relationships
     owned_projects: Mapped[list["Project"]] = relationship(
-        "Project", back_populates="owner", foreign_keys="Project.owner_id",
+        "Project",
+        back_populates="owner",
+        foreign_keys="Project.owner_id",
         passive_deletes=True,
     )
     project_memberships: Mapped[list["ProjectMember"]] = relationship(
-        "ProjectMember", back_populates="user", cascade="all, delete-orphan"
+        "ProjectMember",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     created_tasks: Mapped[list["Task"]] = relationship(
-        "Task", back_populates="creator", foreign_keys="Task.created_by",
+        "Task",
+        back_populates="creator",
+        foreign_keys="Task.created_by",
         passive_deletes=True,
     )
     assignments: Mapped[list["Assignment"]] = relationship(
@@ -55,4 +62,11 @@ class User(Base):
         back_populates="assignee",
         foreign_keys="Assignment.user_id",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
+
+
+# Lookups compare lower(email)/lower(username), which the plain column
+# indexes cannot serve.
+Index("ix_users_email_lower", func.lower(User.email))
+Index("ix_users_username_lower", func.lower(User.username))
@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from typing import Optional
 from app.models.assignment import Assignment
+from app.database import AsyncFacade
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.project_repository import ProjectRepository
 
 
 class AssignmentRepository:
@@ -16,11 +20,15 @@ class AssignmentRepository:
         return db.execute(stmt).scalar_one_or_none()
 
     @staticmethod
-    def create(db: Session, task_id: int, user_id: int, assigned_by: int) -> Assignment:
+    def create(
+        db: Session, project_id: int, task_id: int, user_id: int, assigned_by: int
+    ) -> Assignment:
         assignment = Assignment(
             task_id=task_id, user_id=user_id, assigned_by=assigned_by
         )
         db.add(assignment)
+        ChangeLogRepository.tasks_changed(db, [task_id])
+        ProjectRepository.bump_version(db, project_id)
         db.commit()
         db.refresh(assignment)
         # reload with relationships
@@ -31,8 +39,114 @@ class AssignmentRepository:
         ).scalar_one()
 
     @staticmethod
-    def delete(db: Session, assignment: Assignment) -> None:
+    def insert_many(
+        db: Session, task_id: int, user_ids: list[int], assigned_by: int
+    ) -> None:
+        """Insert all assignments in one executemany; the caller commits."""
+        AssignmentRepository.insert_pairs(
+            db, [(task_id, user_id) for user_id in user_ids], assigned_by
+        )
+
+    @staticmethod
+    def insert_pairs(
+        db: Session, pairs: list[tuple[int, int]], assigned_by: int
+    ) -> None:
+        """Insert ``(task_id, user_id)`` assignments in one executemany; the
+        caller commits."""
+        if not pairs:
+            return
+        db.execute(
+            insert(Assignment),
+            [
+                {"task_id": task_id, "user_id": user_id, "assigned_by": assigned_by}
+                for task_id, user_id in pairs
+            ],
+        )
+
+    @staticmethod
+    def upsert_pairs(
+        db: Session, pairs: list[tuple[int, int]], assigned_by: int
+    ) -> set[tuple[int, int]]:
+        """Insert ``(task_id, user_id)`` assignments in one statement, skipping
+        pairs that already exist; returns the pairs actually inserted. The
+        caller commits.
+
+        The conflict is resolved by the unique constraint, so concurrent
+        assigners cannot race a separate existence check.
+        """
+        if not pairs:
+            return set()
+        rows = [
+            {"task_id": task_id, "user_id": user_id, "assigned_by": assigned_by}
+            for task_id, user_id in pairs
+        ]
+        # Both supported backends spell ON CONFLICT the same way.
+        if db.get_bind().dialect.name == "postgresql":
+            dialect_insert = postgresql.insert
+        else:
+            dialect_insert = sqlite.insert
+        stmt = (
+            dialect_insert(Assignment)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["task_id", "user_id"])
+            .returning(Assignment.task_id, Assignment.user_id)
+        )
+        return {tuple(row) for row in db.execute(stmt)}
+
+    @staticmethod
+    def delete_pairs(db: Session, pairs: list[tuple[int, int]]) -> set[tuple[int, int]]:
+        """Delete ``(task_id, user_id)`` assignments in one statement; returns
+        the pairs that existed. The caller commits."""
+        if not pairs:
+            return set()
+        result = db.execute(
+            delete(Assignment)
+            .where(tuple_(Assignment.task_id, Assignment.user_id).in_(pairs))
+            .returning(Assignment.task_id, Assignment.user_id)
+        )
+        return {tuple(row) for row in result}
+
+    @staticmethod
+    def apply_pairs(
+        db: Session,
+        project_id: int,
+        assign: list[tuple[int, int]],
+        unassign: list[tuple[int, int]],
+        assigned_by: int,
+    ) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """Delete ``unassign`` and upsert ``assign`` in one transaction;
+        returns the ``(inserted, removed)`` pairs."""
+        removed = AssignmentRepository.delete_pairs(db, unassign)
+        inserted = AssignmentRepository.upsert_pairs(db, assign, assigned_by)
+        if inserted or removed:
+            ChangeLogRepository.assignments_deleted(db, project_id, removed)
+            ChangeLogRepository.tasks_changed(
+                db, sorted({task_id for task_id, _ in inserted | removed})
+            )
+            ProjectRepository.bump_version(db, project_id)
+        db.commit()
+        return inserted, removed
+
+    @staticmethod
+    def delete_many(db: Session, task_id: int, user_ids: list[int]) -> None:
+        """Delete the task's assignments for ``user_ids`` in one statement; the
+        caller commits."""
+        if not user_ids:
+            return
+        db.execute(
+            delete(Assignment).where(
+                Assignment.task_id == task_id, Assignment.user_id.in_(user_ids)
+            )
+        )
+
+    @staticmethod
+    def delete(db: Session, project_id: int, assignment: Assignment) -> None:
         db.delete(assignment)
+        ChangeLogRepository.assignments_deleted(
+            db, project_id, [(assignment.task_id, assignment.user_id)]
+        )
+        ChangeLogRepository.tasks_changed(db, [assignment.task_id])
+        ProjectRepository.bump_version(db, project_id)
         db.commit()
 
     @staticmethod
@@ -43,3 +157,6 @@ class AssignmentRepository:
             .options(selectinload(Assignment.assignee))
         )
         return list(db.execute(stmt).scalars().all())
+
+
+AsyncAssignmentRepository = AsyncFacade(AssignmentRepository)
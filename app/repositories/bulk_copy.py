@@ -0,0 +1,77 @@
+import enum
+import io
+from typing import Iterable, Sequence
+
+from sqlalchemy import Table, func, insert, select
+from sqlalchemy.orm import Session
+
+
+def supports_copy(db: Session) -> bool:
+    """``COPY ... FROM STDIN`` needs PostgreSQL behind a driver exposing
+    ``copy_expert`` (psycopg2); asyncpg and other databases use executemany."""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy's Enum type stores member names.
+        return value.name
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+COPY_NULL = r"\N"
+
+
+def _copy_field(value) -> str:
+    value = _copy_value(value)
+    if value is None:
+        return COPY_NULL
+    # Quoted fields never match the NULL marker, so "" stays an empty string
+    # as it does through executemany.
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_buffer(rows: Iterable[Sequence]) -> io.StringIO:
+    """``rows`` as COPY ``FORMAT csv`` text with ``NULL '\\N'``: ``None`` is
+    the unquoted marker and every other value is quoted."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(value) for value in row) + "\n")
+    buffer.seek(0)
+    return buffer
+
+
+def reserve_ids(db: Session, table: Table, count: int) -> list[int]:
+    """Draw ``count`` ids from ``table``'s serial sequence in one round trip,
+    so rows written with COPY (which returns nothing) have known ids."""
+    sequence = func.pg_get_serial_sequence(table.name, "id")
+    stmt = select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+    return list(db.execute(stmt).scalars())
+
+
+def copy_rows(
+    db: Session, table: Table, columns: Sequence[str], rows: list[Sequence]
+) -> None:
+    """Write ``rows`` (tuples in ``columns`` order) with ``COPY`` where the
+    driver supports it and a single executemany ``INSERT`` otherwise. Column
+    defaults are not applied by COPY, so ``rows`` must be complete. The caller
+    commits."""
+    if not rows:
+        return
+    if not supports_copy(db):
+        db.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+        return
+    sql = (
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(sql, copy_buffer(rows))
+    finally:
+        cursor.close()
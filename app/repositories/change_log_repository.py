@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, literal, null, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database import AsyncFacade
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.tombstone import Tombstone
+from app.repositories.pagination import SortKey, keyset_after
+
+DELETED_AT = SortKey(Tombstone.deleted_at, lambda t: t.deleted_at)
+
+
+class ChangeLogRepository:
+    """What ``/projects/{id}/changes`` reports beyond ``tasks.updated_at``.
+
+    Task and assignment writes call these next to
+    ``ProjectRepository.bump_version``; the caller commits.
+    """
+
+    @staticmethod
+    def tasks_changed(db: Session, task_ids: Iterable[int]) -> None:
+        """Move ``updated_at`` on for tasks whose assignees changed, so the
+        task is reported with its new assignee list."""
+        task_ids = list(task_ids)
+        if task_ids:
+            db.execute(
+                update(Task)
+                .where(Task.id.in_(task_ids))
+                .values(updated_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def tasks_deleted(db: Session, project_id: int, task_ids: Iterable[int]) -> None:
+        ChangeLogRepository._insert(
+            db, [{"project_id": project_id, "task_id": tid} for tid in task_ids]
+        )
+
+    @staticmethod
+    def assignments_deleted(
+        db: Session, project_id: int, pairs: Iterable[tuple[int, int]]
+    ) -> None:
+        ChangeLogRepository._insert(
+            db,
+            [
+                {"project_id": project_id, "task_id": task_id, "user_id": user_id}
+                for task_id, user_id in pairs
+            ],
+        )
+
+    @staticmethod
+    def user_deleted(db: Session, user_id: int) -> None:
+        """Record what deleting ``user_id`` takes out of other users' projects
+        through ON DELETE CASCADE: the tasks they created and the assignments
+        they hold or made. Projects they own go whole, tombstones included."""
+        now = literal(datetime.now(timezone.utc), Tombstone.deleted_at.type)
+        kept = Task.project_id.not_in(
+            select(Project.id).where(Project.owner_id == user_id)
+        )
+        columns = ["project_id", "task_id", "user_id", "deleted_at"]
+        tasks = select(Task.project_id, Task.id, null(), now).where(
+            Task.created_by == user_id, kept
+        )
+        assignments = (
+            select(Task.project_id, Task.id, Assignment.user_id, now)
+            .join(Assignment, Assignment.task_id == Task.id)
+            .where(
+                or_(Assignment.user_id == user_id, Assignment.assigned_by == user_id),
+                Task.created_by != user_id,
+                kept,
+            )
+        )
+        for rows in (tasks, assignments):
+            db.execute(insert(Tombstone).from_select(columns, rows))
+
+    @staticmethod
+    def _insert(db: Session, rows: list[dict]) -> None:
+        if rows:
+            now = datetime.now(timezone.utc)
+            db.execute(insert(Tombstone), [{**row, "deleted_at": now} for row in rows])
+
+    @staticmethod
+    def tombstones_after(
+        db: Session,
+        project_id: int,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int,
+    ) -> list[Tombstone]:
+        """The project's tombstones after ``after`` and up to ``until``, in
+        ``(deleted_at, id)`` order."""
+        stmt = select(Tombstone).where(
+            Tombstone.project_id == project_id, Tombstone.deleted_at <= until
+        )
+        if after is not None:
+            stmt = stmt.where(keyset_after(DELETED_AT, Tombstone.id, "asc", *after))
+        stmt = stmt.order_by(Tombstone.deleted_at, Tombstone.id).limit(limit)
+        return list(db.execute(stmt).scalars())
+
+    @staticmethod
+    def prune(db: Session, before: datetime, batch_size: int) -> int:
+        """Delete tombstones older than ``before``, ``batch_size`` rows per
+        transaction; returns how many were deleted."""
+        deleted = 0
+        while True:
+            batch = (
+                select(Tombstone.id)
+                .where(Tombstone.deleted_at < before)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = db.execute(delete(Tombstone).where(Tombstone.id.in_(batch)))
+            db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+AsyncChangeLogRepository = AsyncFacade(ChangeLogRepository)
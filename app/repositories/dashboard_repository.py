@@ -0,0 +1,80 @@
+from datetime import date
+
+from sqlalchemy import (
+    Row,
+    and_,
+    case,
+    false,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from app.database import AsyncFacade
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.task import Task, TaskStatus
+from app.repositories.project_repository import ProjectRepository
+
+
+class DashboardRepository:
+    @staticmethod
+    def summary_rows(
+        db: Session, user_id: int, today: date, all_projects: bool
+    ) -> list[Row]:
+        """Every count the dashboard shows, as one ``UNION ALL`` round trip of
+        ``(kind, project_id, status, count, overdue)`` rows:
+
+        * ``tasks``: the user's assigned tasks grouped by project and status,
+          with how many of them are overdue;
+        * ``project``: each project the user owns or belongs to, with a count
+          of 1 unless it is archived;
+        * ``all_projects`` (admins only): the number of unarchived projects.
+        """
+        overdue = case(
+            (and_(Task.due_date < today, Task.status != TaskStatus.done), 1), else_=0
+        )
+        tasks = (
+            select(
+                literal("tasks").label("kind"),
+                Task.project_id.label("project_id"),
+                Task.status.label("status"),
+                func.count().label("count"),
+                func.sum(overdue).label("overdue"),
+            )
+            .join(Assignment, Assignment.task_id == Task.id)
+            .where(
+                Assignment.user_id == user_id,
+                Task.project_id.not_in(ProjectRepository.deleted_ids()),
+            )
+            .group_by(Task.project_id, Task.status)
+        )
+        member_of = select(ProjectMember.project_id).where(
+            ProjectMember.user_id == user_id
+        )
+        projects = select(
+            literal("project"),
+            Project.id,
+            null(),
+            case((Project.is_archived == false(), 1), else_=0),
+            literal(0),
+        ).where(
+            or_(Project.owner_id == user_id, Project.id.in_(member_of)),
+            Project.deleted_at.is_(None),
+        )
+        parts = [tasks, projects]
+        if all_projects:
+            parts.append(
+                select(
+                    literal("all_projects"), null(), null(), func.count(), literal(0)
+                ).where(Project.is_archived == false(), Project.deleted_at.is_(None))
+            )
+        return list(db.execute(union_all(*parts)).all())
+
+
+AsyncDashboardRepository = AsyncFacade(DashboardRepository)
@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Generic, Literal, Optional, TypeVar
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.cache import TTLCache
+from app.config import settings
+from app.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+IncludeTotal = Literal["exact", "estimate", "none"]
+
+count_cache = TTLCache(settings.COUNT_CACHE_MAX_SIZE, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
+
+    def __iter__(self):
+        # Unpacks as ``items, total`` like the tuples list methods used to return.
+        return iter((self.items, self.total))
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """How a listing is ordered and how to read that key back off a row.
+
+    ``value`` must return, for a loaded row, exactly what ``expr`` evaluates
+    to in SQL, so the last row of a page can seed the next page's cursor.
+    Keys without a ``value`` can only be paged by offset.
+    """
+
+    expr: ColumnElement
+    value: Optional[Callable[[Any], Any]]
+    nullable: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(sort_by: str, sort_dir: str, value: Any, last_id: int) -> str:
+    payload = {"s": sort_by, "d": sort_dir, "k": _encode_value(value), "i": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_dir: str) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value, last_id = _decode_value(payload["k"]), int(payload["i"])
+        cursor_sort = (payload["s"], payload["d"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise BadRequestException("Invalid cursor")
+    if cursor_sort != (sort_by, sort_dir):
+        raise BadRequestException("Cursor does not match sort_by/sort_dir")
+    return value, last_id
+
+
+def keyset_order(key: SortKey, id_col: ColumnElement, sort_dir: str) -> list:
+    """ORDER BY for ``key`` with ``id_col`` as tie-breaker; NULL keys sort last."""
+    if sort_dir == "asc":
+        order = [key.expr.asc(), id_col.asc()]
+    else:
+        order = [key.expr.desc(), id_col.desc()]
+    if key.nullable:
+        order[0] = order[0].nulls_last()
+    return order
+
+
+def keyset_after(
+    key: SortKey, id_col: ColumnElement, sort_dir: str, value: Any, last_id: int
+) -> ColumnElement:
+    """Rows strictly after (value, last_id) in :func:`keyset_order` order."""
+    after = (lambda a, b: a > b) if sort_dir == "asc" else (lambda a, b: a < b)
+    if value is None:
+        # Only other NULL-keyed rows can follow a NULL key.
+        return and_(key.expr.is_(None), after(id_col, last_id))
+    clause = or_(
+        after(key.expr, value), and_(key.expr == value, after(id_col, last_id))
+    )
+    if key.nullable:
+        clause = or_(clause, key.expr.is_(None))
+    return clause
+
+
+def _planner_estimate(db: Session, stmt: Select) -> int:
+    """Row count the Postgres planner expects ``stmt`` to return."""
+    bind = db.get_bind()
+    sql = stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(db: Session, count_stmt: Select) -> int:
+    compiled = count_stmt.compile(dialect=db.get_bind().dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    total = count_cache.get(key)
+    if total is None:
+        total = db.execute(count_stmt).scalar_one()
+        count_cache.set(key, total)
+    return total
+
+
+def count_total(
+    db: Session, stmt: Select, count_stmt: Select, include_total: IncludeTotal
+) -> tuple[Optional[int], bool]:
+    """Total for a listing as ``(total, is_estimate)``.
+
+    ``estimate`` asks the Postgres planner about ``stmt``; on other databases
+    it serves the exact count from a short-lived per-filter cache instead.
+    """
+    if include_total == "none":
+        return None, False
+    if include_total == "estimate":
+        if db.get_bind().dialect.name == "postgresql":
+            return _planner_estimate(db, stmt), True
+        return _cached_count(db, count_stmt), True
+    return db.execute(count_stmt).scalar_one(), False
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    *,
+    id_col: ColumnElement,
+    sort_key: Optional[SortKey] = None,
+    sort_by: str = "id",
+    sort_dir: str = "asc",
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    count_stmt: Optional[Select] = None,
+    include_total: IncludeTotal = "exact",
+) -> Page:
+    """Run ``stmt`` as one page, in offset mode or, given ``cursor``, keyset mode.
+
+    Both modes share the same deterministic ordering, so the ``next_cursor`` of
+    an offset page can be used to continue in keyset mode. One extra row is
+    fetched to tell whether another page exists, so ``has_more`` never depends
+    on the total.
+    """
+    total, total_is_estimate = None, False
+    if count_stmt is not None:
+        total, total_is_estimate = count_total(db, stmt, count_stmt, include_total)
+    if sort_key is None:
+        sort_key = SortKey(id_col, lambda row: row.id)
+    if cursor is not None:
+        if sort_key.value is None:
+            raise BadRequestException(f"sort_by={sort_by} does not support cursors")
+        if offset:
+            raise BadRequestException("cursor and offset cannot be combined")
+        value, last_id = decode_cursor(cursor, sort_by, sort_dir)
+        stmt = stmt.where(keyset_after(sort_key, id_col, sort_dir, value, last_id))
+    else:
+        stmt = stmt.offset(offset)
+    stmt = stmt.order_by(*keyset_order(sort_key, id_col, sort_dir)).limit(limit + 1)
+
+    rows = list(db.execute(stmt).scalars().all())
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = None
+    if has_more and sort_key.value is not None:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_by, sort_dir, sort_key.value(last), last.id)
+    return Page(
+        items=items,
+        total=total,
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total_is_estimate=total_is_estimate,
+    )
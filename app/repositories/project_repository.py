@@ -1,41 +1,183 @@
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, func, or_
+from sqlalchemy import Row, column, exists, select, func, or_, table, update
 from typing import Optional
+from app.models.assignment import Assignment
 from app.models.project import Project
 from app.models.project_member import ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from app.commit_hooks import on_commit
+from app.dashboard_cache import dashboard_cache
+from app.database import AsyncFacade
+from app.repositories.pagination import IncludeTotal, Page, paginate
+from app.repositories.returning import update_returning
 
 
 class ProjectRepository:
     @staticmethod
     def get_by_id(db: Session, project_id: int) -> Optional[Project]:
+        stmt = select(Project).where(Project.id == project_id)
+        return db.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def get_with_membership(
+        db: Session, project_id: int, user_id: int
+    ) -> Optional[Row]:
+        """``(Project, is_member)`` in one query; membership is an EXISTS probe
+        on the (project_id, user_id) unique index, not a member list load."""
+        is_member = (
+            exists()
+            .where(
+                ProjectMember.project_id == Project.id,
+                ProjectMember.user_id == user_id,
+            )
+            .label("is_member")
+        )
         stmt = (
-            select(Project)
+            select(Project, is_member)
+            .where(Project.id == project_id, Project.deleted_at.is_(None))
+            .execution_options(populate_existing=True)
+        )
+        return db.execute(stmt).one_or_none()
+
+    @staticmethod
+    def bump_version(db: Session, project_id: int) -> None:
+        """Advance the project's change counter; the caller commits.
+
+        Every write that changes what a project-scoped GET returns calls this
+        in its own transaction, so ETags built from the counter never go
+        stale. ``updated_at`` is left alone: it describes the project row.
+        """
+        db.execute(
+            update(Project)
             .where(Project.id == project_id)
-            .options(selectinload(Project.members))
+            .values(version=Project.version + 1, updated_at=Project.updated_at)
+        )
+        on_commit(db, lambda: dashboard_cache.projects_changed([project_id]))
+
+    @staticmethod
+    def bump_versions_for_member(db: Session, user_id: int) -> None:
+        """Advance the change counter of every project ``user_id`` belongs to,
+        whose member and assignee listings embed the user; the caller commits."""
+        projects = select(ProjectMember.project_id).where(
+            ProjectMember.user_id == user_id
+        )
+        db.execute(
+            update(Project)
+            .where(Project.id.in_(projects))
+            .values(version=Project.version + 1, updated_at=Project.updated_at)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    @staticmethod
+    def bump_versions(db: Session, project_ids: list[int]) -> None:
+        """Advance the change counter of each of ``project_ids``; the caller
+        commits."""
+        if not project_ids:
+            return
+        db.execute(
+            update(Project)
+            .where(Project.id.in_(project_ids))
+            .values(version=Project.version + 1, updated_at=Project.updated_at)
+            .execution_options(synchronize_session="fetch")
         )
-        return db.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def involving_user_ids(db: Session, user_id: int) -> list[int]:
+        """Projects ``user_id`` does not own but shows up in: as a member, as
+        the creator of a task, or on either side of an assignment."""
+        projects = (
+            select(ProjectMember.project_id)
+            .where(ProjectMember.user_id == user_id)
+            .union(
+                select(Task.project_id).where(Task.created_by == user_id),
+                select(Task.project_id)
+                .join(Assignment, Assignment.task_id == Task.id)
+                .where(
+                    or_(
+                        Assignment.user_id == user_id,
+                        Assignment.assigned_by == user_id,
+                    )
+                ),
+            )
+            .subquery()
+        )
+        stmt = (
+            select(Project.id)
+            .where(Project.id.in_(select(projects)), Project.owner_id != user_id)
+            .order_by(Project.id)
+        )
+        return list(db.execute(stmt).scalars().all())
 
     @staticmethod
     def create(db: Session, **kwargs) -> Project:
         project = Project(**kwargs)
         db.add(project)
+        on_commit(db, dashboard_cache.project_set_changed)
         db.commit()
-        db.refresh(project)
         return project
 
     @staticmethod
     def update(db: Session, project: Project, **kwargs) -> Project:
-        for key, value in kwargs.items():
-            setattr(project, key, value)
+        project = update_returning(db, project, version=Project.version + 1, **kwargs)
+        ProjectRepository._on_project_changed(db, project.id)
         db.commit()
-        db.refresh(project)
         return project
 
     @staticmethod
     def delete(db: Session, project: Project) -> None:
+        # One DELETE: members, tasks, assignments, counters and tombstones go
+        # through ON DELETE CASCADE rather than being loaded and deleted here.
         db.delete(project)
+        ProjectRepository._on_project_changed(db, project.id)
         db.commit()
 
+    @staticmethod
+    def mark_deleted(db: Session, project: Project) -> Project:
+        """Hide the project ahead of a batched purge; lookups and listings
+        skip projects with ``deleted_at`` set."""
+        project = update_returning(
+            db,
+            project,
+            version=Project.version + 1,
+            deleted_at=datetime.now(timezone.utc),
+        )
+        ProjectRepository._on_project_changed(db, project.id)
+        db.commit()
+        return project
+
+    @staticmethod
+    def deleted_ids():
+        """Ids of projects marked deleted but not purged yet, for queries
+        that reach tasks without going through their project."""
+        return select(Project.id).where(Project.deleted_at.is_not(None))
+
+    @staticmethod
+    def pending_purge_ids(db: Session) -> list[int]:
+        stmt = ProjectRepository.deleted_ids().order_by(Project.id)
+        return list(db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def _on_project_changed(db: Session, project_id: int) -> None:
+        # Renames, archiving and deletion change project counts for members
+        # (through the project) and for admins (through the project set).
+        def changed():
+            dashboard_cache.projects_changed([project_id])
+            dashboard_cache.project_set_changed()
+
+        on_commit(db, changed)
+
+    @staticmethod
+    def _name_matches(db: Session, search: str):
+        pattern = f"%{search}%"
+        if db.get_bind().dialect.name == "sqlite":
+            # The trigram FTS table answers case-insensitive LIKE from its index.
+            fts = table("projects_name_fts", column("rowid"), column("name"))
+            return Project.id.in_(select(fts.c.rowid).where(fts.c.name.like(pattern)))
+        # On Postgres ix_projects_name_trgm serves ILIKE directly.
+        return Project.name.ilike(pattern)
+
     @staticmethod
     def list_for_user(
         db: Session,
@@ -44,7 +186,9 @@ class ProjectRepository:
         search: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[Project], int]:
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ) -> Page[Project]:
         accessible = (
             select(Project.id)
             .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
@@ -55,25 +199,28 @@ class ProjectRepository:
                 )
             )
         )
-        stmt = select(Project).where(Project.id.in_(accessible))
-        count_stmt = (
-            select(func.count()).select_from(Project).where(Project.id.in_(accessible))
-        )
+        visible = (Project.id.in_(accessible), Project.deleted_at.is_(None))
+        stmt = select(Project).where(*visible)
+        count_stmt = select(func.count()).select_from(Project).where(*visible)
 
         if is_archived is not None:
             stmt = stmt.where(Project.is_archived == is_archived)
             count_stmt = count_stmt.where(Project.is_archived == is_archived)
         if search:
-            stmt = stmt.where(Project.name.ilike(f"%{search}%"))
-            count_stmt = count_stmt.where(Project.name.ilike(f"%{search}%"))
+            match = ProjectRepository._name_matches(db, search)
+            stmt = stmt.where(match)
+            count_stmt = count_stmt.where(match)
 
-        total = db.execute(count_stmt).scalar_one()
-        projects = (
-            db.execute(stmt.limit(limit).offset(offset).order_by(Project.id))
-            .scalars()
-            .all()
+        return paginate(
+            db,
+            stmt,
+            id_col=Project.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_stmt=count_stmt,
+            include_total=include_total,
         )
-        return list(projects), total
 
     @staticmethod
     def list_all(
@@ -82,24 +229,34 @@ class ProjectRepository:
         search: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[Project], int]:
-        stmt = select(Project)
-        count_stmt = select(func.count()).select_from(Project)
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ) -> Page[Project]:
+        stmt = select(Project).where(Project.deleted_at.is_(None))
+        count_stmt = (
+            select(func.count())
+            .select_from(Project)
+            .where(Project.deleted_at.is_(None))
+        )
 
         if is_archived is not None:
             stmt = stmt.where(Project.is_archived == is_archived)
             count_stmt = count_stmt.where(Project.is_archived == is_archived)
         if search:
-            stmt = stmt.where(Project.name.ilike(f"%{search}%"))
-            count_stmt = count_stmt.where(Project.name.ilike(f"%{search}%"))
+            match = ProjectRepository._name_matches(db, search)
+            stmt = stmt.where(match)
+            count_stmt = count_stmt.where(match)
 
-        total = db.execute(count_stmt).scalar_one()
-        projects = (
-            db.execute(stmt.limit(limit).offset(offset).order_by(Project.id))
-            .scalars()
-            .all()
+        return paginate(
+            db,
+            stmt,
+            id_col=Project.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_stmt=count_stmt,
+            include_total=include_total,
         )
-        return list(projects), total
 
     @staticmethod
     def get_member(
@@ -111,24 +268,80 @@ class ProjectRepository:
         )
         return db.execute(stmt).scalar_one_or_none()
 
+    @staticmethod
+    def member_users(db: Session, project_id: int) -> list[User]:
+        """Every member of the project, in joining order, in one query."""
+        stmt = (
+            select(User)
+            .join(ProjectMember, ProjectMember.user_id == User.id)
+            .where(ProjectMember.project_id == project_id)
+            .order_by(ProjectMember.id)
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def member_project_ids(db: Session, user_id: int) -> list[int]:
+        stmt = select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
+        return list(db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def member_user_ids(db: Session, project_id: int, user_ids: list[int]) -> set[int]:
+        """Which of ``user_ids`` are members of the project, in one query."""
+        stmt = select(ProjectMember.user_id).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id.in_(user_ids),
+        )
+        return set(db.execute(stmt).scalars().all())
+
     @staticmethod
     def add_member(db: Session, project_id: int, user_id: int) -> ProjectMember:
         member = ProjectMember(project_id=project_id, user_id=user_id)
         db.add(member)
+        ProjectRepository.bump_version(db, project_id)
+        on_commit(db, lambda: dashboard_cache.user_changed(user_id))
         db.commit()
-        db.refresh(member)
-        return member
+        return db.execute(
+            select(ProjectMember)
+            .where(ProjectMember.id == member.id)
+            .options(selectinload(ProjectMember.user))
+            .execution_options(populate_existing=True)
+        ).scalar_one()
 
     @staticmethod
     def remove_member(db: Session, member: ProjectMember) -> None:
         db.delete(member)
+        ProjectRepository.bump_version(db, member.project_id)
+        user_id = member.user_id
+        on_commit(db, lambda: dashboard_cache.user_changed(user_id))
         db.commit()
 
     @staticmethod
-    def list_members(db: Session, project_id: int) -> list[ProjectMember]:
+    def list_members(
+        db: Session,
+        project_id: int,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[ProjectMember]:
         stmt = (
             select(ProjectMember)
             .where(ProjectMember.project_id == project_id)
             .options(selectinload(ProjectMember.user))
         )
-        return list(db.execute(stmt).scalars().all())
+        count_stmt = (
+            select(func.count())
+            .select_from(ProjectMember)
+            .where(ProjectMember.project_id == project_id)
+        )
+        return paginate(
+            db,
+            stmt,
+            id_col=ProjectMember.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_stmt=count_stmt,
+        )
+
+
+AsyncProjectRepository = AsyncFacade(ProjectRepository)
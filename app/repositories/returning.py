@@ -0,0 +1,24 @@
+from typing import TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+def update_returning(db: Session, obj: T, **values) -> T:
+    """UPDATE the row behind ``obj`` and re-hydrate it from ``RETURNING``.
+
+    One statement replaces the flush, ``refresh()`` and re-select round trips;
+    column ``onupdate`` defaults such as ``updated_at`` come back with it. The
+    caller commits.
+    """
+    model = type(obj)
+    stmt = (
+        update(model)
+        .where(model.id == obj.id)
+        .values(**values)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    return db.execute(stmt).scalar_one()
@@ -1,59 +1,387 @@
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, func, case, or_
-from typing import Optional
-from datetime import date
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Select, case, delete, func, insert, or_, select, update
+from collections import Counter
+from typing import Iterator, Optional
+from datetime import date, datetime, timezone
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.user import User
+from app.database import AsyncFacade
+from app.repositories.assignment_repository import AssignmentRepository
+from app.repositories.bulk_copy import copy_rows, reserve_ids, supports_copy
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.pagination import (
+    IncludeTotal,
+    Page,
+    SortKey,
+    encode_cursor,
+    keyset_after,
+    keyset_order,
+    paginate,
+)
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.returning import update_returning
+from app.repositories.task_stats_repository import (
+    TaskStatsRepository,
+    key_of,
+    task_key,
+)
+from app.repositories.task_search import apply_search
+
+# Task fields the per-project counters depend on.
+STATS_FIELDS = {"status", "priority", "due_date"}
+
+PRIORITY_RANK = {TaskPriority.high: 1, TaskPriority.medium: 2, TaskPriority.low: 3}
 
 PRIORITY_ORDER = case(
-    (Task.priority == TaskPriority.high, 1),
-    (Task.priority == TaskPriority.medium, 2),
-    (Task.priority == TaskPriority.low, 3),
+    *((Task.priority == priority, rank) for priority, rank in PRIORITY_RANK.items()),
     else_=4,
 )
 
+SORT_KEYS = {
+    "created_at": SortKey(Task.created_at, lambda t: t.created_at),
+    "updated_at": SortKey(Task.updated_at, lambda t: t.updated_at),
+    "due_date": SortKey(Task.due_date, lambda t: t.due_date, nullable=True),
+    "priority": SortKey(PRIORITY_ORDER, lambda t: PRIORITY_RANK.get(t.priority, 4)),
+}
+
+# TaskResponse's scalar fields, in schema order.
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.due_date,
+    Task.project_id,
+    Task.created_by,
+    Task.created_at,
+    Task.updated_at,
+)
+
+# Columns written by task imports; ids come from the database.
+IMPORT_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "project_id",
+    "created_by",
+    "created_at",
+    "updated_at",
+)
+
 
 class TaskRepository:
     @staticmethod
     def get_by_id(db: Session, task_id: int) -> Optional[Task]:
+        # One row with its few assignments: a single joined SELECT beats three
+        # selectin round trips.
         stmt = (
             select(Task)
             .where(Task.id == task_id)
-            .options(selectinload(Task.assignments).selectinload(Assignment.assignee))
+            .options(joinedload(Task.assignments).joinedload(Assignment.assignee))
+            .execution_options(populate_existing=True)
         )
-        return db.execute(stmt).scalar_one_or_none()
+        return db.execute(stmt).unique().scalar_one_or_none()
 
     @staticmethod
-    def create(db: Session, **kwargs) -> Task:
-        task = Task(**kwargs)
+    def create(
+        db: Session,
+        assignee_ids: list[int] = (),
+        assigned_by: Optional[int] = None,
+        **kwargs,
+    ) -> Task:
+        """Insert the task and its assignments in a single transaction.
+
+        The INSERT returns the id and the other columns are already set in
+        Python, so the task is only reloaded to attach new assignments.
+        """
+        task = Task(**kwargs, assignments=[])
         db.add(task)
+        db.flush()
+        AssignmentRepository.insert_many(db, task.id, list(assignee_ids), assigned_by)
+        ProjectRepository.bump_version(db, task.project_id)
+        TaskStatsRepository.apply_changes(db, new=[key_of(task)])
         db.commit()
-        db.refresh(task)
-        return db.execute(
+        if assignee_ids:
+            return TaskRepository.get_by_id(db, task.id)
+        return task
+
+    @staticmethod
+    def update(
+        db: Session,
+        task: Task,
+        assign: list[int] = (),
+        unassign: list[int] = (),
+        assigned_by: Optional[int] = None,
+        **kwargs,
+    ) -> Task:
+        """Apply field changes and assignment changes in a single transaction.
+
+        Field changes are one ``UPDATE ... RETURNING``; the assignments are
+        reloaded only when they changed.
+        """
+        old_key = key_of(task)
+        if kwargs:
+            task = update_returning(db, task, **kwargs)
+        elif assign or unassign:
+            ChangeLogRepository.tasks_changed(db, [task.id])
+        AssignmentRepository.delete_many(db, task.id, list(unassign))
+        AssignmentRepository.insert_many(db, task.id, list(assign), assigned_by)
+        ChangeLogRepository.assignments_deleted(
+            db, task.project_id, [(task.id, user_id) for user_id in unassign]
+        )
+        ProjectRepository.bump_version(db, task.project_id)
+        if key_of(task) != old_key:
+            TaskStatsRepository.apply_changes(db, old=[old_key], new=[key_of(task)])
+        db.commit()
+        if assign or unassign:
+            return TaskRepository.get_by_id(db, task.id)
+        return task
+
+    @staticmethod
+    def get_many(db: Session, project_id: int, task_ids: list[int]) -> list[Task]:
+        """The project's tasks among ``task_ids``, in ``task_ids`` order."""
+        stmt = (
             select(Task)
-            .where(Task.id == task.id)
+            .where(Task.project_id == project_id, Task.id.in_(task_ids))
             .options(selectinload(Task.assignments).selectinload(Assignment.assignee))
-        ).scalar_one()
+            .execution_options(populate_existing=True)
+        )
+        by_id = {task.id: task for task in db.execute(stmt).scalars().all()}
+        return [by_id[task_id] for task_id in task_ids if task_id in by_id]
+
+    @staticmethod
+    def ids_in_project(db: Session, project_id: int, task_ids: list[int]) -> set[int]:
+        """Which of ``task_ids`` belong to the project, in one query."""
+        stmt = select(Task.id).where(
+            Task.project_id == project_id, Task.id.in_(task_ids)
+        )
+        return set(db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def _insert_returning_ids(db: Session, rows: list[dict]) -> list[int]:
+        """Insert ``rows`` into tasks and return their ids in ``rows`` order.
+
+        Postgres does not promise RETURNING order, so it sorts by a sentinel
+        within the same statement. On SQLite that would insert row by row;
+        there one statement assigns rowids in VALUES order, so sorting the
+        ids restores the input order.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            return sorted(db.execute(insert(Task).returning(Task.id), rows).scalars())
+        stmt = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+        return list(db.execute(stmt, rows).scalars())
+
+    @staticmethod
+    def create_many(
+        db: Session,
+        project_id: int,
+        items: list[tuple[dict, list[int]]],
+        created_by: int,
+    ) -> list[Task]:
+        """Insert ``(fields, assignee_ids)`` items with one executemany per
+        table and a single commit; returns the tasks in input order."""
+        rows = [
+            {**fields, "project_id": project_id, "created_by": created_by}
+            for fields, _ in items
+        ]
+        task_ids = TaskRepository._insert_returning_ids(db, rows)
+        AssignmentRepository.insert_pairs(
+            db,
+            [
+                (task_id, user_id)
+                for task_id, (_, assignee_ids) in zip(task_ids, items)
+                for user_id in assignee_ids
+            ],
+            created_by,
+        )
+        ProjectRepository.bump_version(db, project_id)
+        TaskStatsRepository.apply_changes(
+            db, new=[task_key(project_id, fields) for fields, _ in items]
+        )
+        db.commit()
+        return TaskRepository.get_many(db, project_id, task_ids)
+
+    @staticmethod
+    def import_many(
+        db: Session,
+        project_id: int,
+        items: list[tuple[dict, list[int]]],
+        created_by: int,
+    ) -> int:
+        """Insert imported ``(fields, assignee_ids)`` items with a single
+        commit and nothing reloaded; returns how many tasks were written.
+
+        PostgreSQL reserves the task ids up front and COPYs both tables;
+        elsewhere each table takes one executemany.
+        """
+        if not items:
+            return 0
+        now = datetime.now(timezone.utc)
+        rows = [
+            tuple(
+                {
+                    **fields,
+                    "project_id": project_id,
+                    "created_by": created_by,
+                    "created_at": now,
+                    "updated_at": now,
+                }[column]
+                for column in IMPORT_COLUMNS
+            )
+            for fields, _ in items
+        ]
+        if supports_copy(db):
+            task_ids = reserve_ids(db, Task.__table__, len(rows))
+            copy_rows(
+                db,
+                Task.__table__,
+                ("id", *IMPORT_COLUMNS),
+                [(task_id, *row) for task_id, row in zip(task_ids, rows)],
+            )
+        else:
+            params = [dict(zip(IMPORT_COLUMNS, row)) for row in rows]
+            task_ids = TaskRepository._insert_returning_ids(db, params)
+        copy_rows(
+            db,
+            Assignment.__table__,
+            ("task_id", "user_id", "assigned_by", "assigned_at"),
+            [
+                (task_id, user_id, created_by, now)
+                for task_id, (_, assignee_ids) in zip(task_ids, items)
+                for user_id in assignee_ids
+            ],
+        )
+        ProjectRepository.bump_version(db, project_id)
+        TaskStatsRepository.apply_changes(
+            db, new=[task_key(project_id, fields) for fields, _ in items]
+        )
+        db.commit()
+        return len(task_ids)
+
+    @staticmethod
+    def update_many(
+        db: Session,
+        project_id: int,
+        changes: list[tuple[Task, dict, list[int], list[int]]],
+        assigned_by: int,
+    ) -> list[Task]:
+        """Apply ``(task, fields, assign, unassign)`` changes in one transaction.
+
+        Field updates are flushed together; assignment changes across all
+        tasks take one DELETE and one INSERT.
+        """
+        task_ids = [task.id for task, *_ in changes]
+        old_keys = [key_of(task) for task, *_ in changes]
+        for task, fields, _, _ in changes:
+            for key, value in fields.items():
+                setattr(task, key, value)
+        removed = AssignmentRepository.delete_pairs(
+            db,
+            [(task.id, uid) for task, _, _, unassign in changes for uid in unassign],
+        )
+        AssignmentRepository.insert_pairs(
+            db,
+            [(task.id, uid) for task, _, assign, _ in changes for uid in assign],
+            assigned_by,
+        )
+        ChangeLogRepository.assignments_deleted(db, project_id, removed)
+        ChangeLogRepository.tasks_changed(
+            db, [task.id for task, _, assign, unassign in changes if assign or unassign]
+        )
+        ProjectRepository.bump_version(db, project_id)
+        TaskStatsRepository.apply_changes(
+            db, old=old_keys, new=[key_of(task) for task, *_ in changes]
+        )
+        db.commit()
+        return TaskRepository.get_many(db, project_id, task_ids)
 
     @staticmethod
-    def update(db: Session, task: Task, **kwargs) -> Task:
-        for key, value in kwargs.items():
-            setattr(task, key, value)
+    def delete_many(db: Session, project_id: int, task_ids: list[int]) -> None:
+        if not task_ids:
+            return
+        # Assignments go with the tasks through ON DELETE CASCADE.
+        deleted = db.execute(
+            delete(Task)
+            .where(Task.project_id == project_id, Task.id.in_(task_ids))
+            .returning(
+                Task.id, Task.project_id, Task.status, Task.priority, Task.due_date
+            )
+        ).all()
+        old_keys = [tuple(row[1:]) for row in deleted]
+        ChangeLogRepository.tasks_deleted(db, project_id, [row[0] for row in deleted])
+        ProjectRepository.bump_version(db, project_id)
+        TaskStatsRepository.apply_changes(db, old=old_keys)
         db.commit()
+
+    @staticmethod
+    def purge_batch(db: Session, project_id: int, batch_size: int) -> int:
+        """Delete up to ``batch_size`` tasks of a project marked deleted, with
+        their assignments; returns how many went. The project goes afterwards
+        along with its counters and tombstones, so neither is kept up to date
+        here. The caller commits."""
+        batch = (
+            select(Task.id)
+            .where(Task.project_id == project_id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
         return db.execute(
-            select(Task)
-            .where(Task.id == task.id)
-            .options(selectinload(Task.assignments).selectinload(Assignment.assignee))
-        ).scalar_one()
+            delete(Task)
+            .where(Task.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        ).rowcount
 
     @staticmethod
     def delete(db: Session, task: Task) -> None:
         db.delete(task)
+        ChangeLogRepository.tasks_deleted(db, task.project_id, [task.id])
+        ProjectRepository.bump_version(db, task.project_id)
+        TaskStatsRepository.apply_changes(db, old=[key_of(task)])
         db.commit()
 
     @staticmethod
-    def list_for_project(
+    def _paginate(
         db: Session,
+        stmt,
+        count_stmt,
+        sort_by: str,
+        sort_dir: str,
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        include_total: IncludeTotal,
+        relevance=None,
+    ) -> Page[Task]:
+        if sort_by == "relevance" and relevance is not None:
+            # Ranks are not stable enough to seek on, so relevance pages by offset.
+            sort_key = SortKey(relevance, value=None)
+        else:
+            if sort_by not in SORT_KEYS:
+                sort_by = "created_at"
+            sort_key = SORT_KEYS[sort_by]
+        return paginate(
+            db,
+            stmt.options(
+                selectinload(Task.assignments).selectinload(Assignment.assignee)
+            ),
+            id_col=Task.id,
+            sort_key=sort_key,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_stmt=count_stmt,
+            include_total=include_total,
+        )
+
+    @staticmethod
+    def _filter_conditions(
         project_id: int,
         status: Optional[TaskStatus] = None,
         priority: Optional[TaskPriority] = None,
@@ -62,78 +390,273 @@ class TaskRepository:
         due_date_to: Optional[date] = None,
         is_overdue: Optional[bool] = None,
         created_by: Optional[int] = None,
-        q: Optional[str] = None,
-        sort_by: str = "created_at",
-        sort_dir: str = "desc",
-        limit: int = 20,
-        offset: int = 0,
-    ) -> tuple[list[Task], int]:
-        stmt = select(Task).where(Task.project_id == project_id)
-        count_stmt = (
-            select(func.count()).select_from(Task).where(Task.project_id == project_id)
-        )
-
+    ) -> list:
+        """WHERE clauses for the task filters shared by listing and bulk updates."""
+        conditions = [Task.project_id == project_id]
         if status:
-            stmt = stmt.where(Task.status == status)
-            count_stmt = count_stmt.where(Task.status == status)
+            conditions.append(Task.status == status)
         if priority:
-            stmt = stmt.where(Task.priority == priority)
-            count_stmt = count_stmt.where(Task.priority == priority)
+            conditions.append(Task.priority == priority)
         if assignee_id:
             sub = select(Assignment.task_id).where(Assignment.user_id == assignee_id)
-            stmt = stmt.where(Task.id.in_(sub))
-            count_stmt = count_stmt.where(Task.id.in_(sub))
+            conditions.append(Task.id.in_(sub))
         if due_date_from:
-            stmt = stmt.where(Task.due_date >= due_date_from)
-            count_stmt = count_stmt.where(Task.due_date >= due_date_from)
+            conditions.append(Task.due_date >= due_date_from)
         if due_date_to:
-            stmt = stmt.where(Task.due_date <= due_date_to)
-            count_stmt = count_stmt.where(Task.due_date <= due_date_to)
+            conditions.append(Task.due_date <= due_date_to)
         if is_overdue is True:
-            today = date.today()
-            stmt = stmt.where(Task.due_date < today, Task.status != TaskStatus.done)
-            count_stmt = count_stmt.where(
-                Task.due_date < today, Task.status != TaskStatus.done
-            )
+            conditions.append(Task.due_date < date.today())
+            conditions.append(Task.status != TaskStatus.done)
         if created_by:
-            stmt = stmt.where(Task.created_by == created_by)
-            count_stmt = count_stmt.where(Task.created_by == created_by)
+            conditions.append(Task.created_by == created_by)
+        return conditions
+
+    @staticmethod
+    def update_where(
+        db: Session,
+        project_id: int,
+        values: dict,
+        q: Optional[str] = None,
+        dry_run: bool = False,
+        **filters,
+    ) -> int:
+        """Set ``values`` on every matching task with one ``UPDATE ... WHERE``.
+
+        Tasks that already hold ``values`` are not touched, so the returned
+        count is the number of tasks that actually change. ``dry_run`` only
+        counts them.
+        """
+        conditions = TaskRepository._filter_conditions(project_id, **filters)
+        conditions.append(or_(*(getattr(Task, k) != v for k, v in values.items())))
         if q:
-            pattern = f"%{q}%"
+            # Uncorrelated, so the subquery keeps its own FROM tasks.
+            matches = select(Task.id).correlate(None)
+            matches, _, _ = apply_search(db, matches, matches, q)
+            conditions.append(Task.id.in_(matches))
+        if dry_run:
+            return db.execute(
+                select(func.count()).select_from(Task).where(*conditions)
+            ).scalar_one()
+        before = {}
+        if STATS_FIELDS.intersection(values):
+            # Counted first, as the UPDATE cannot return the old values.
+            before = TaskStatsRepository.grouped_keys(db, *conditions)
+        result = db.execute(
+            update(Task)
+            .where(*conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            ProjectRepository.bump_version(db, project_id)
+        if before:
+            deltas = Counter()
+            for key, n in before.items():
+                pid, status, priority, due_date = key
+                deltas[key] -= n
+                new_key = (
+                    pid,
+                    values.get("status", status),
+                    values.get("priority", priority),
+                    values.get("due_date", due_date),
+                )
+                deltas[new_key] += n
+            TaskStatsRepository.apply(db, deltas)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def changed_since(
+        db: Session,
+        project_id: int,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int,
+    ) -> list[Task]:
+        """The project's tasks written after ``after`` and up to ``until``, in
+        ``(updated_at, id)`` order with their assignees: one range scan of
+        ``ix_tasks_project_updated`` however large the project is."""
+        stmt = select(Task).where(
+            Task.project_id == project_id, Task.updated_at <= until
+        )
+        if after is not None:
             stmt = stmt.where(
-                or_(Task.title.ilike(pattern), Task.description.ilike(pattern))
-            )
-            count_stmt = count_stmt.where(
-                or_(Task.title.ilike(pattern), Task.description.ilike(pattern))
+                keyset_after(SORT_KEYS["updated_at"], Task.id, "asc", *after)
             )
+        stmt = (
+            stmt.order_by(Task.updated_at, Task.id)
+            .limit(limit)
+            .options(selectinload(Task.assignments).selectinload(Assignment.assignee))
+            .execution_options(populate_existing=True)
+        )
+        return list(db.execute(stmt).scalars())
 
-        # Sort
-        sort_col_map = {
-            "created_at": Task.created_at,
-            "updated_at": Task.updated_at,
-            "due_date": Task.due_date,
-            "priority": PRIORITY_ORDER,
-        }
-        sort_col = sort_col_map.get(sort_by, Task.created_at)
-        if sort_by == "priority":
-            order_expr = sort_col if sort_dir == "asc" else sort_col.desc()
-        else:
-            order_expr = sort_col.asc() if sort_dir == "asc" else sort_col.desc()
+    @staticmethod
+    def list_for_project(
+        db: Session,
+        project_id: int,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        assignee_id: Optional[int] = None,
+        due_date_from: Optional[date] = None,
+        due_date_to: Optional[date] = None,
+        is_overdue: Optional[bool] = None,
+        created_by: Optional[int] = None,
+        q: Optional[str] = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ) -> Page[Task]:
+        conditions = TaskRepository._filter_conditions(
+            project_id,
+            status=status,
+            priority=priority,
+            assignee_id=assignee_id,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            is_overdue=is_overdue,
+            created_by=created_by,
+        )
+        stmt = select(Task).where(*conditions)
+        count_stmt = select(func.count()).select_from(Task).where(*conditions)
+        relevance = None
+        if q:
+            stmt, count_stmt, relevance = apply_search(db, stmt, count_stmt, q)
 
-        total = db.execute(count_stmt).scalar_one()
-        tasks = (
-            db.execute(
-                stmt.options(
-                    selectinload(Task.assignments).selectinload(Assignment.assignee)
+        return TaskRepository._paginate(
+            db,
+            stmt,
+            count_stmt,
+            sort_by,
+            sort_dir,
+            limit,
+            offset,
+            cursor,
+            include_total,
+            relevance,
+        )
+
+    @staticmethod
+    def board_columns(
+        db: Session,
+        project_id: int,
+        limit: int = 20,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+        q: Optional[str] = None,
+        **filters,
+    ) -> dict[TaskStatus, Page[Task]]:
+        """The first ``limit`` tasks of every status column, in one query.
+
+        ``ROW_NUMBER()`` and ``COUNT(*)`` windows partitioned by status rank
+        and count each column inside the database, so only the rows shown are
+        transferred, assignees included, however large the board is. Each
+        column's ``next_cursor`` continues in the task listing filtered by
+        that status with the same ``sort_by``/``sort_dir``.
+        """
+        sort_key = SORT_KEYS.get(sort_by)
+        if sort_key is None:
+            sort_by, sort_key = "created_at", SORT_KEYS["created_at"]
+        ranked = select(
+            Task.id.label("task_id"),
+            func.row_number()
+            .over(
+                partition_by=Task.status,
+                order_by=keyset_order(sort_key, Task.id, sort_dir),
+            )
+            .label("position"),
+            func.count().over(partition_by=Task.status).label("column_total"),
+        ).where(*TaskRepository._filter_conditions(project_id, **filters))
+        if q:
+            ranked, _, _ = apply_search(db, ranked, ranked, q)
+        ranked = ranked.subquery("ranked")
+        stmt = (
+            select(Task, ranked.c.column_total)
+            .join(ranked, ranked.c.task_id == Task.id)
+            .where(ranked.c.position <= limit)
+            .order_by(ranked.c.position)
+            .options(joinedload(Task.assignments).joinedload(Assignment.assignee))
+        )
+
+        columns = {status: Page(items=[], total=0) for status in TaskStatus}
+        for task, column_total in db.execute(stmt).unique():
+            column = columns[task.status]
+            column.items.append(task)
+            column.total = column_total
+        for column in columns.values():
+            column.has_more = column.total > len(column.items)
+            if column.has_more:
+                last = column.items[-1]
+                column.next_cursor = encode_cursor(
+                    sort_by, sort_dir, sort_key.value(last), last.id
                 )
-                .order_by(order_expr)
-                .limit(limit)
-                .offset(offset)
+        return columns
+
+    @staticmethod
+    def export_statement(
+        db: Session, project_id: int, q: Optional[str] = None, **filters
+    ) -> Select:
+        """Plain column rows for the tasks ``list_for_project`` would match, in
+        id order. No ORM entities are built, so nothing piles up in the
+        session's identity map while an export streams."""
+        stmt = select(*EXPORT_COLUMNS).where(
+            *TaskRepository._filter_conditions(project_id, **filters)
+        )
+        if q:
+            stmt, _, _ = apply_search(db, stmt, stmt, q)
+        return stmt.order_by(Task.id)
+
+    @staticmethod
+    def export_assignees_statement(task_ids: list[int]) -> Select:
+        return (
+            select(Assignment.task_id, User.id, User.username, User.email)
+            .join(User, User.id == Assignment.user_id)
+            .where(Assignment.task_id.in_(task_ids))
+            .order_by(Assignment.task_id, Assignment.id)
+        )
+
+    @staticmethod
+    def export_chunk(rows, assignee_rows) -> list[dict]:
+        """Task rows as ``TaskResponse``-shaped dicts, with one chunk's worth
+        of assignee rows grouped onto them."""
+        assignees: dict[int, list[dict]] = {}
+        for task_id, user_id, username, email in assignee_rows:
+            assignees.setdefault(task_id, []).append(
+                {"id": user_id, "username": username, "email": email}
             )
-            .scalars()
-            .all()
+        return [
+            {**row._mapping, "assignees": assignees.get(row.id, [])} for row in rows
+        ]
+
+    @staticmethod
+    def iter_export(db: Session, stmt: Select, chunk_size: int) -> Iterator[list[dict]]:
+        """Stream ``stmt`` through a server-side cursor ``chunk_size`` rows at
+        a time, loading each chunk's assignees with a single query."""
+        result = db.execute(stmt.execution_options(yield_per=chunk_size))
+        for rows in result.partitions():
+            assignee_rows = db.execute(
+                TaskRepository.export_assignees_statement([row.id for row in rows])
+            )
+            yield TaskRepository.export_chunk(rows, assignee_rows)
+
+    @staticmethod
+    def assigned_project_versions(db: Session, user_id: int) -> list[tuple[int, int]]:
+        """``(project_id, version)`` of every project where ``user_id`` has an
+        assignment. Any change to the user's assigned tasks changes this list."""
+        projects = (
+            select(Task.project_id)
+            .join(Assignment, Assignment.task_id == Task.id)
+            .where(Assignment.user_id == user_id)
         )
-        return list(tasks), total
+        stmt = (
+            select(Project.id, Project.version)
+            .where(Project.id.in_(projects))
+            .order_by(Project.id)
+        )
+        return [tuple(row) for row in db.execute(stmt)]
 
     @staticmethod
     def list_assigned_to_user(
@@ -145,10 +668,16 @@ class TaskRepository:
         sort_dir: str = "desc",
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[Task], int]:
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ) -> Page[Task]:
         sub = select(Assignment.task_id).where(Assignment.user_id == user_id)
-        stmt = select(Task).where(Task.id.in_(sub))
-        count_stmt = select(func.count()).select_from(Task).where(Task.id.in_(sub))
+        visible = (
+            Task.id.in_(sub),
+            Task.project_id.not_in(ProjectRepository.deleted_ids()),
+        )
+        stmt = select(Task).where(*visible)
+        count_stmt = select(func.count()).select_from(Task).where(*visible)
 
         if status:
             stmt = stmt.where(Task.status == status)
@@ -157,29 +686,17 @@ class TaskRepository:
             stmt = stmt.where(Task.priority == priority)
             count_stmt = count_stmt.where(Task.priority == priority)
 
-        sort_col_map = {
-            "created_at": Task.created_at,
-            "updated_at": Task.updated_at,
-            "due_date": Task.due_date,
-            "priority": PRIORITY_ORDER,
-        }
-        sort_col = sort_col_map.get(sort_by, Task.created_at)
-        if sort_by == "priority":
-            order_expr = sort_col if sort_dir == "asc" else sort_col.desc()
-        else:
-            order_expr = sort_col.asc() if sort_dir == "asc" else sort_col.desc()
-
-        total = db.execute(count_stmt).scalar_one()
-        tasks = (
-            db.execute(
-                stmt.options(
-                    selectinload(Task.assignments).selectinload(Assignment.assignee)
-                )
-                .order_by(order_expr)
-                .limit(limit)
-                .offset(offset)
-            )
-            .scalars()
-            .all()
+        return TaskRepository._paginate(
+            db,
+            stmt,
+            count_stmt,
+            sort_by,
+            sort_dir,
+            limit,
+            offset,
+            cursor,
+            include_total,
         )
-        return list(tasks), total
+
+
+AsyncTaskRepository = AsyncFacade(TaskRepository)
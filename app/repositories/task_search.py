@@ -0,0 +1,64 @@
+import re
+
+from sqlalchemy import Select, column, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.task import Task
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+_tasks_fts = table("tasks_fts", column("rowid"))
+
+# bm25 column weights for (title, description); title hits count ten-fold,
+# mirroring the A/B weights of the Postgres search vector.
+_FTS5_WEIGHTS = (10.0, 1.0)
+
+
+def search_terms(q: str) -> list[str]:
+    return _TOKEN.findall(q.lower())
+
+
+def _postgres(stmt: Select, count_stmt: Select, terms: list[str]):
+    # Every term is a prefix match, so results narrow as the user types.
+    query = func.to_tsquery(
+        literal_column("'simple'::regconfig"), " & ".join(f"{t}:*" for t in terms)
+    )
+    vector = literal_column("tasks.search_vector")
+    match = vector.op("@@")(query)
+    return stmt.where(match), count_stmt.where(match), func.ts_rank_cd(vector, query)
+
+
+def _sqlite(stmt: Select, count_stmt: Select, terms: list[str]):
+    query = " ".join(f'"{t}"*' for t in terms)
+    fts = (
+        select(
+            _tasks_fts.c.rowid.label("task_id"),
+            # bm25 is lower-is-better; negate it so relevance sorts like ts_rank.
+            (-func.bm25(literal_column("tasks_fts"), *_FTS5_WEIGHTS)).label("rank"),
+        )
+        .where(literal_column("tasks_fts").op("MATCH")(query))
+        .subquery("tasks_fts_match")
+    )
+    on = fts.c.task_id == Task.id
+    return stmt.join(fts, on), count_stmt.join(fts, on), fts.c.rank
+
+
+def apply_search(
+    db: Session, stmt: Select, count_stmt: Select, q: str
+) -> tuple[Select, Select, ColumnElement]:
+    """Filter ``stmt``/``count_stmt`` to tasks matching ``q``.
+
+    Returns both statements plus a relevance expression where higher means a
+    better match. Databases without a search index fall back to ILIKE, where
+    every match is equally relevant.
+    """
+    terms = search_terms(q)
+    dialect = db.get_bind().dialect.name
+    if terms and dialect == "postgresql":
+        return _postgres(stmt, count_stmt, terms)
+    if terms and dialect == "sqlite":
+        return _sqlite(stmt, count_stmt, terms)
+    pattern = f"%{q}%"
+    match = or_(Task.title.ilike(pattern), Task.description.ilike(pattern))
+    return stmt.where(match), count_stmt.where(match), literal_column("0")
@@ -0,0 +1,256 @@
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import AsyncFacade
+from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskDueCount, ProjectTaskStats
+from app.models.task import Task, TaskPriority, TaskStatus
+
+# Everything the counters depend on: (project_id, status, priority, due_date).
+TaskKey = tuple[int, TaskStatus, TaskPriority, Optional[date]]
+
+STATUS_COLUMNS = {status: status.value for status in TaskStatus}
+PRIORITY_COLUMNS = {priority: f"{priority.value}_priority" for priority in TaskPriority}
+COUNTER_COLUMNS = ("total", *STATUS_COLUMNS.values(), *PRIORITY_COLUMNS.values())
+
+STATS = ProjectTaskStats.__table__
+DUE_COUNTS = ProjectTaskDueCount.__table__
+
+# Per-project counter rows and open tasks per (project_id, due_date).
+Counters = tuple[dict[int, dict[str, int]], dict[tuple[int, date], int]]
+
+
+def task_key(project_id: int, fields: dict) -> TaskKey:
+    """The key of a task about to be written with ``fields``, column
+    defaults filled in."""
+    return (
+        project_id,
+        TaskStatus(fields.get("status") or TaskStatus.todo),
+        TaskPriority(fields.get("priority") or TaskPriority.medium),
+        fields.get("due_date"),
+    )
+
+
+def key_of(task: Task) -> TaskKey:
+    return (task.project_id, task.status, task.priority, task.due_date)
+
+
+def fold(counts: dict[TaskKey, int]) -> Counters:
+    """Turn task counts (or deltas) per key into counter rows, dropping
+    zeros."""
+    rows: dict[int, dict[str, int]] = {}
+    due: Counter = Counter()
+    for (project_id, status, priority, due_date), n in counts.items():
+        if not n:
+            continue
+        row = rows.setdefault(project_id, dict.fromkeys(COUNTER_COLUMNS, 0))
+        row["total"] += n
+        row[STATUS_COLUMNS[status]] += n
+        row[PRIORITY_COLUMNS[priority]] += n
+        if due_date is not None and status != TaskStatus.done:
+            due[(project_id, due_date)] += n
+    rows = {pid: row for pid, row in rows.items() if any(row.values())}
+    return rows, {key: n for key, n in due.items() if n}
+
+
+def _upsert(db: Session):
+    # Both supported backends spell ON CONFLICT the same way.
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+class TaskStatsRepository:
+    @staticmethod
+    def apply(db: Session, deltas: dict[TaskKey, int]) -> None:
+        """Add ``deltas`` (tasks added per key, negative for removed ones) to
+        the counters with one upsert per table; the caller commits.
+
+        Task writes call this next to ``ProjectRepository.bump_version``, so
+        the counters change in the same transaction as the tasks do.
+        """
+        rows, due = fold(deltas)
+        upsert = _upsert(db)
+        if rows:
+            stmt = upsert(STATS)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[STATS.c.project_id],
+                set_={c: STATS.c[c] + stmt.excluded[c] for c in COUNTER_COLUMNS},
+            )
+            db.execute(stmt, [{"project_id": pid, **row} for pid, row in rows.items()])
+        if due:
+            stmt = upsert(DUE_COUNTS)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DUE_COUNTS.c.project_id, DUE_COUNTS.c.due_date],
+                set_={"open_tasks": DUE_COUNTS.c.open_tasks + stmt.excluded.open_tasks},
+            )
+            db.execute(
+                stmt,
+                [
+                    {"project_id": pid, "due_date": due_date, "open_tasks": n}
+                    for (pid, due_date), n in due.items()
+                ],
+            )
+            if any(n < 0 for n in due.values()):
+                db.execute(
+                    delete(DUE_COUNTS).where(
+                        DUE_COUNTS.c.project_id.in_({pid for pid, _ in due}),
+                        DUE_COUNTS.c.open_tasks <= 0,
+                    )
+                )
+
+    @staticmethod
+    def apply_changes(
+        db: Session, old: Iterable[TaskKey] = (), new: Iterable[TaskKey] = ()
+    ) -> None:
+        """:meth:`apply` for tasks leaving ``old`` keys and entering ``new``."""
+        deltas = Counter(new)
+        deltas.subtract(old)
+        TaskStatsRepository.apply(db, deltas)
+
+    @staticmethod
+    def grouped_keys(db: Session, *conditions) -> Counter:
+        """Tasks per key among those matching ``conditions``, in one query."""
+        stmt = (
+            select(
+                Task.project_id, Task.status, Task.priority, Task.due_date, func.count()
+            )
+            .where(*conditions)
+            .group_by(Task.project_id, Task.status, Task.priority, Task.due_date)
+        )
+        return Counter(
+            {
+                (pid, status, priority, due): n
+                for pid, status, priority, due, n in db.execute(stmt)
+            }
+        )
+
+    @staticmethod
+    def drop(db: Session, project_ids: list[int]) -> None:
+        """Delete the projects' counters; the caller commits."""
+        db.execute(delete(DUE_COUNTS).where(DUE_COUNTS.c.project_id.in_(project_ids)))
+        db.execute(delete(STATS).where(STATS.c.project_id.in_(project_ids)))
+
+    @staticmethod
+    def counts_for(db: Session, project_ids: list[int], today: date) -> dict[int, dict]:
+        """``ProjectTaskCounts``-shaped dicts for every id in ``project_ids``,
+        read from the counters in one query."""
+        overdue = (
+            select(func.coalesce(func.sum(DUE_COUNTS.c.open_tasks), 0))
+            .where(
+                DUE_COUNTS.c.project_id == STATS.c.project_id,
+                DUE_COUNTS.c.due_date < today,
+            )
+            .correlate(STATS)
+            .scalar_subquery()
+        )
+        stmt = select(STATS, overdue.label("overdue")).where(
+            STATS.c.project_id.in_(project_ids)
+        )
+        rows = {row.project_id: row._mapping for row in db.execute(stmt)}
+        counts = {}
+        for project_id in project_ids:
+            row = rows.get(project_id, {})
+            counts[project_id] = {
+                "total": row.get("total", 0),
+                "by_status": {
+                    status.value: row.get(column, 0)
+                    for status, column in STATUS_COLUMNS.items()
+                },
+                "by_priority": {
+                    priority.value: row.get(column, 0)
+                    for priority, column in PRIORITY_COLUMNS.items()
+                },
+                "overdue": row.get("overdue", 0),
+            }
+        return counts
+
+    @staticmethod
+    def project_ids_after(
+        db: Session, after_id: int, limit: int, lock: bool = False
+    ) -> list[int]:
+        """The next ``limit`` project ids in id order. ``lock`` takes the
+        project rows, which every task write updates before its counters,
+        so no write can land between a recount and its result being stored."""
+        stmt = (
+            select(Project.id)
+            .where(Project.id > after_id)
+            .order_by(Project.id)
+            .limit(limit)
+        )
+        if lock:
+            stmt = stmt.with_for_update()
+        return list(db.execute(stmt).scalars())
+
+    @staticmethod
+    def stored(db: Session, project_ids: list[int]) -> Counters:
+        rows = {
+            row.project_id: {c: row._mapping[c] for c in COUNTER_COLUMNS}
+            for row in db.execute(
+                select(STATS).where(STATS.c.project_id.in_(project_ids))
+            )
+        }
+        due = db.execute(
+            select(DUE_COUNTS).where(DUE_COUNTS.c.project_id.in_(project_ids))
+        )
+        return (
+            {pid: row for pid, row in rows.items() if any(row.values())},
+            {
+                (row.project_id, row.due_date): row.open_tasks
+                for row in due
+                if row.open_tasks
+            },
+        )
+
+    @staticmethod
+    def recount(db: Session, project_ids: list[int]) -> Counters:
+        """The counters recomputed from ``tasks``."""
+        return fold(
+            TaskStatsRepository.grouped_keys(db, Task.project_id.in_(project_ids))
+        )
+
+    @staticmethod
+    def replace(db: Session, project_ids: list[int], counters: Counters) -> None:
+        """Overwrite the projects' counters with ``counters``; the caller
+        commits."""
+        rows, due = counters
+        TaskStatsRepository.drop(db, project_ids)
+        if rows:
+            db.execute(
+                insert(STATS), [{"project_id": pid, **row} for pid, row in rows.items()]
+            )
+        if due:
+            db.execute(
+                insert(DUE_COUNTS),
+                [
+                    {"project_id": pid, "due_date": due_date, "open_tasks": n}
+                    for (pid, due_date), n in due.items()
+                ],
+            )
+
+    @staticmethod
+    def delete_orphans(db: Session) -> int:
+        """Delete counters of projects that no longer exist; the caller
+        commits. Returns how many projects had some."""
+        orphaned = select(STATS.c.project_id).where(
+            STATS.c.project_id.not_in(select(Project.id))
+        )
+        project_ids = set(db.execute(orphaned).scalars())
+        project_ids.update(
+            db.execute(
+                select(DUE_COUNTS.c.project_id)
+                .where(DUE_COUNTS.c.project_id.not_in(select(Project.id)))
+                .distinct()
+            ).scalars()
+        )
+        if project_ids:
+            TaskStatsRepository.drop(db, list(project_ids))
+        return len(project_ids)
+
+
+AsyncTaskStatsRepository = AsyncFacade(TaskStatsRepository)
@@ -1,7 +1,21 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, Row
 from typing import Optional
+from app.models.project import Project
+from app.models.task import Task
 from app.models.user import User
+from app.commit_hooks import on_commit
+from app.dashboard_cache import dashboard_cache
+from app.database import AsyncFacade
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.pagination import IncludeTotal, Page, paginate
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.returning import update_returning
+from app.repositories.task_stats_repository import TaskStatsRepository
+
+# User fields that member and assignee listings embed. Other writes (token
+# version, password) leave every project-scoped response as it was.
+LISTED_FIELDS = frozenset({"username", "email", "role", "is_active"})
 
 
 class UserRepository:
@@ -14,40 +28,103 @@ class UserRepository:
         stmt = select(User).where(func.lower(User.email) == email.lower())
         return db.execute(stmt).scalar_one_or_none()
 
+    @staticmethod
+    def get_credentials_by_email(db: Session, email: str) -> Optional[Row]:
+        """Fetch only what login needs, as a plain row detached from the session."""
+        stmt = select(
+            User.id,
+            User.hashed_password,
+            User.is_active,
+            User.role,
+            User.token_version,
+        ).where(func.lower(User.email) == email.lower())
+        return db.execute(stmt).one_or_none()
+
     @staticmethod
     def get_by_username(db: Session, username: str) -> Optional[User]:
         stmt = select(User).where(func.lower(User.username) == username.lower())
         return db.execute(stmt).scalar_one_or_none()
 
+    @staticmethod
+    def ids_by_login(db: Session, logins: list[str]) -> dict[str, int]:
+        """Map each of ``logins`` (a username or an email, case-insensitive) to
+        a user id in one query; unknown logins are left out."""
+        lowered = {login.lower() for login in logins}
+        if not lowered:
+            return {}
+        stmt = select(User.id, User.username, User.email).where(
+            func.lower(User.username).in_(lowered) | func.lower(User.email).in_(lowered)
+        )
+        ids = {}
+        for user_id, username, email in db.execute(stmt):
+            ids[username.lower()] = user_id
+            ids[email.lower()] = user_id
+        return {login: ids[login.lower()] for login in logins if login.lower() in ids}
+
     @staticmethod
     def create(db: Session, **kwargs) -> User:
         user = User(**kwargs)
         db.add(user)
+        # The INSERT returns the id; with expire_on_commit=False nothing else
+        # needs reloading.
         db.commit()
-        db.refresh(user)
         return user
 
     @staticmethod
     def update(db: Session, user: User, **kwargs) -> User:
-        for key, value in kwargs.items():
-            setattr(user, key, value)
+        user = update_returning(db, user, **kwargs)
+        if LISTED_FIELDS.intersection(kwargs):
+            ProjectRepository.bump_versions_for_member(db, user.id)
+        # A role change turns the user's project count into a global one.
+        user_id = user.id
+        on_commit(db, lambda: dashboard_cache.user_changed(user_id))
         db.commit()
-        db.refresh(user)
         return user
 
     @staticmethod
     def delete(db: Session, user: User) -> None:
+        # Memberships, assignments, created tasks and owned projects go with
+        # the user through ON DELETE CASCADE. Only the tasks in projects the
+        # user does not own need their tombstones and counters kept here, and
+        # every such project it appeared in needs a new version.
+        project_ids = ProjectRepository.involving_user_ids(db, user.id)
+        created = TaskStatsRepository.grouped_keys(
+            db,
+            Task.created_by == user.id,
+            Task.project_id.not_in(
+                select(Project.id).where(Project.owner_id == user.id)
+            ),
+        )
+        ChangeLogRepository.user_deleted(db, user.id)
+        TaskStatsRepository.apply(db, {key: -n for key, n in created.items()})
+        ProjectRepository.bump_versions(db, project_ids)
+
+        def changed():
+            dashboard_cache.projects_changed(project_ids)
+            dashboard_cache.project_set_changed()
+
         db.delete(user)
+        on_commit(db, changed)
         db.commit()
 
     @staticmethod
     def list_all(
-        db: Session, limit: int = 20, offset: int = 0
-    ) -> tuple[list[User], int]:
-        total = db.execute(select(func.count()).select_from(User)).scalar_one()
-        stmt = select(User).limit(limit).offset(offset).order_by(User.id)
-        users = db.execute(stmt).scalars().all()
-        return list(users), total
+        db: Session,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ) -> Page[User]:
+        return paginate(
+            db,
+            select(User),
+            id_col=User.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_stmt=select(func.count()).select_from(User),
+            include_total=include_total,
+        )
 
     @staticmethod
     def find_by_query(db: Session, q: str, limit: int = 10) -> list[User]:
@@ -63,3 +140,6 @@ class UserRepository:
             .limit(limit)
         )
         return list(db.execute(stmt).scalars().all())
+
+
+AsyncUserRepository = AsyncFacade(UserRepository)
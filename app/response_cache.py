@@ -0,0 +1,219 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Protocol
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.etag import etag_headers, etag_matches, make_etag
+
+
+class ResponseCacheBackend(Protocol):
+    """Awaited from request handlers: shared backends do network IO."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, body: bytes) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def counter_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryResponseBackend(_Counters):
+    """Per-process LRU of response bodies bounded by total bytes.
+
+    Keys embed the project version, so entries are never invalidated; a write
+    makes them unreachable and the LRU ages them out. A ``max_bytes`` of zero
+    disables the cache.
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._data.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return body
+
+    async def set(self, key: str, body: bytes) -> None:
+        if len(body) > min(self.max_bytes, self.max_entry_bytes):
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self._data[key] = body
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                **self.counter_stats(),
+            }
+
+
+class SharedResponseBackend(_Counters):
+    """Response bodies in a key-value server shared by every worker.
+
+    ``client`` needs the ``redis.asyncio`` ``get(key)`` / ``set(key, value,
+    ex=ttl)`` coroutines, so lookups never block the event loop. Stale
+    versions are left to expire after ``ttl`` seconds. Backend errors count
+    as misses: the cache must never take reads down with it.
+    """
+
+    def __init__(self, client, ttl: int, prefix: str = "resp:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.errors = 0
+        self.bytes_written = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            body = await self.client.get(self.prefix + key)
+        except Exception:
+            self.errors += 1
+            body = None
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: str, body: bytes) -> None:
+        try:
+            await self.client.set(self.prefix + key, body, ex=self.ttl)
+        except Exception:
+            self.errors += 1
+            return
+        self.bytes_written += len(body)
+
+    def clear(self) -> None:
+        # Only the counters: the store is shared with other workers.
+        self.hits = self.misses = self.errors = self.bytes_written = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "shared",
+            "ttl_seconds": self.ttl,
+            "errors": self.errors,
+            "bytes_written": self.bytes_written,
+            **self.counter_stats(),
+        }
+
+
+class LocalKeyValueStore:
+    """In-process stand-in for an asyncio Redis client, implementing only what
+    :class:`SharedResponseBackend` uses. For tests and single-worker setups."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    async def set(self, key: str, value: bytes, ex: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ex, value)
+
+    def flushdb(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def build_backend(backend: str) -> ResponseCacheBackend:
+    if backend == "memory":
+        return MemoryResponseBackend(
+            settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_MAX_ENTRY_BYTES
+        )
+    if backend == "none":
+        return MemoryResponseBackend(0, 0)
+    if backend == "local":
+        client = LocalKeyValueStore()
+    elif backend == "redis":
+        try:
+            import redis.asyncio
+        except ImportError as exc:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis needs the redis package"
+            ) from exc
+        client = redis.asyncio.Redis.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+    else:
+        raise ValueError(f"Unknown response cache backend: {backend}")
+    return SharedResponseBackend(client, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = build_backend(settings.RESPONSE_CACHE_BACKEND)
+
+
+async def cached_response(
+    request: Request, parts: tuple, build: Callable[[], Awaitable[bytes]]
+) -> Response:
+    """Serve the JSON body identified by ``parts``.
+
+    ``parts`` must pin down the body exactly (project version, access class,
+    query). The client's copy is revalidated by ETag first, then the body
+    comes from the response cache, and only on a miss is ``build`` awaited
+    for the serialized body, which is then stored.
+    """
+    etag = make_etag(*parts)
+    headers = etag_headers(etag)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    body = await response_cache.get(etag)
+    if body is None:
+        body = await build()
+        await response_cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,45 +1,79 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, AnySession
 from app.dependencies import get_current_user
 from app.models.user import User
-from app.schemas.assignment import AssignRequest, AssignmentResponse
-from app.services.assignment_service import AssignmentService
+from app.schemas.assignment import (
+    AssignmentPair,
+    AssignRequest,
+    AssignmentResponse,
+    BulkAssignmentRequest,
+    BulkAssignmentResponse,
+)
+from app.serialization import assignment_payload, json_response
+from app.services.assignment_service import AsyncAssignmentService
 
 router = APIRouter(
     prefix="/projects/{project_id}/tasks/{task_id}/assignments", tags=["assignments"]
 )
+bulk_router = APIRouter(prefix="/projects/{project_id}", tags=["assignments"])
 
 
 @router.get("", response_model=list[AssignmentResponse])
-def list_assignments(
+async def list_assignments(
     project_id: int,
     task_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return AssignmentService.list_assignments(db, project_id, task_id, current_user)
+    assignments = await AsyncAssignmentService.list_assignments(
+        db, project_id, task_id, current_user
+    )
+    return json_response([assignment_payload(a) for a in assignments])
 
 
 @router.post("", response_model=AssignmentResponse, status_code=201)
-def assign_user(
+async def assign_user(
     project_id: int,
     task_id: int,
     data: AssignRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return AssignmentService.assign_user(
+    return await AsyncAssignmentService.assign_user(
         db, project_id, task_id, current_user, data.user_id
     )
 
 
 @router.delete("/{user_id}", status_code=204)
-def unassign_user(
+async def unassign_user(
     project_id: int,
     task_id: int,
     user_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
+):
+    await AsyncAssignmentService.unassign_user(
+        db, project_id, task_id, current_user, user_id
+    )
+
+
+@bulk_router.post("/assignments:bulk", response_model=BulkAssignmentResponse)
+async def bulk_update_assignments(
+    project_id: int,
+    data: BulkAssignmentRequest,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
 ):
-    AssignmentService.unassign_user(db, project_id, task_id, current_user, user_id)
+    result = await AsyncAssignmentService.bulk_update(
+        db,
+        project_id,
+        current_user,
+        [(p.task_id, p.user_id) for p in data.assign],
+        [(p.task_id, p.user_id) for p in data.unassign],
+    )
+    return BulkAssignmentResponse(
+        **{
+            outcome: [AssignmentPair(task_id=t, user_id=u) for t, u in pairs]
+            for outcome, pairs in vars(result).items()
+        }
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, AnySession, run_db
 from app.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.auth import (
@@ -12,25 +12,30 @@ from app.schemas.auth import (
 )
 from app.schemas.user import UserResponse
 from app.services.auth_service import AuthService
-from app.services.user_service import UserService
-from app.repositories.user_repository import UserRepository
+from app.services.user_service import UserService, AsyncUserService
+from app.repositories.user_repository import AsyncUserRepository
 from app.exceptions import UnauthorizedException
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=201)
-def register(data: RegisterRequest, db: Session = Depends(get_db)):
-    user = UserService.create_user(
+async def register(data: RegisterRequest, db: AnySession = Depends(get_db)):
+    user = await UserService.create_user(
         db, username=data.username, email=data.email, password=data.password
     )
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = UserRepository.get_by_email(db, data.email)
-    if not user or not AuthService.verify_password(data.password, user.hashed_password):
+async def login(data: LoginRequest, db: AnySession = Depends(get_db)):
+    user = await AsyncUserRepository.get_credentials_by_email(db, data.email)
+    # End the read transaction so the pooled connection is returned while
+    # bcrypt runs; ``user`` is a plain row and stays usable.
+    await run_db(db, Session.commit)
+    if not user or not await AuthService.verify_password_async(
+        data.password, user.hashed_password
+    ):
         raise UnauthorizedException("invalid_credentials", "Invalid credentials")
     if not user.is_active:
         from app.exceptions import ForbiddenException
@@ -44,11 +49,11 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=AccessTokenResponse)
-def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
+async def refresh_token(data: RefreshRequest, db: AnySession = Depends(get_db)):
     payload = AuthService.decode_refresh_token(data.refresh_token)
     user_id = int(payload["sub"])
     token_version = payload.get("token_version", 0)
-    user = UserRepository.get_by_id(db, user_id)
+    user = await AsyncUserRepository.get_by_id(db, user_id)
     if not user:
         raise UnauthorizedException("invalid_token", "User not found")
     if user.token_version != token_version:
@@ -64,15 +69,18 @@ def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/logout", status_code=204)
-def logout(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+async def logout(
+    current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)
 ):
     # Increment token_version to invalidate all existing tokens
-    UserRepository.update(
+    await AsyncUserRepository.update(
         db, current_user, token_version=current_user.token_version + 1
     )
+    AuthService.invalidate_principal(current_user.id)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_me(
+    current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)
+):
+    return await AsyncUserService.get_profile(db, current_user)
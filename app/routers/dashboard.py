@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from app.database import get_db, AnySession
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.dashboard import DashboardSummary
+from app.services.dashboard_service import AsyncDashboardService
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_summary(
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    return await AsyncDashboardService.get_summary(db, current_user)
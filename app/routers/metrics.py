@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from app.dashboard_cache import dashboard_cache
+from app.dependencies import require_admin
+from app.events import event_broker
+from app.models.user import User
+from app.repositories.pagination import count_cache
+from app.response_cache import response_cache
+from app.services.auth_service import principal_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/caches")
+def cache_stats(_admin: User = Depends(require_admin)):
+    return {
+        "principal": principal_cache.stats(),
+        "count": count_cache.stats(),
+        "response": response_cache.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "events": event_broker.stats(),
+    }
@@ -1,115 +1,311 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.database import get_db
+from typing import Literal, Optional
+from datetime import date
+from app.config import settings
+from app.database import get_db, get_session_factory, run_db, AnySession
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.etag import check_etag, etag_headers, make_etag, query_key
+from app.events import Event, event_broker, event_stream
+from app.response_cache import cached_response
+from app.serialization import (
+    board_payload,
+    dumps,
+    json_response,
+    page_payload,
+    project_payload,
+    project_with_counts_payload,
+    user_payload,
+)
+from app.models.task import TaskPriority
+from app.models.user import User, UserRole
 from app.schemas.project import (
+    BoardResponse,
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
+    ProjectWithCountsResponse,
     AddMemberRequest,
     ProjectMemberResponse,
 )
 from app.schemas.user import UserResponse
 from app.schemas.common import PaginatedResponse
-from app.services.project_service import ProjectService
+from app.repositories.pagination import IncludeTotal
+from app.services.project_purge import purge_in_background
+from app.services.project_service import AsyncProjectService
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
-@router.get("", response_model=PaginatedResponse[ProjectResponse])
-def list_projects(
+@router.get("", response_model=PaginatedResponse[ProjectWithCountsResponse])
+async def list_projects(
     is_archived: Optional[bool] = Query(False),
     search: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: IncludeTotal = "exact",
+    include_task_counts: bool = Query(False),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    projects, total = ProjectService.list_projects(
+    page = await AsyncProjectService.list_projects(
         db,
         current_user,
         is_archived=is_archived,
         search=search,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return PaginatedResponse(total=total, limit=limit, offset=offset, items=projects)
+    items = map(project_payload, page.items)
+    if include_task_counts:
+        # One query for the whole page, read from the maintained counters.
+        counts = await AsyncProjectService.get_task_counts(
+            db, [project.id for project in page.items]
+        )
+        items = (project_with_counts_payload(p, counts[p.id]) for p in page.items)
+    return json_response(page_payload(page, limit, offset, items))
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
-def create_project(
+async def create_project(
     data: ProjectCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
+):
+    return await AsyncProjectService.create_project(db, current_user, data)
+
+
+@router.get("/{project_id}", response_model=ProjectWithCountsResponse)
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    include_task_counts: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    version, access_class = await AsyncProjectService.get_read_scope(
+        db, project_id, current_user
+    )
+    parts = ("project", project_id, version, access_class)
+    if include_task_counts:
+        # Every task write bumps the version; overdue also moves with the date.
+        parts += ("task_counts", date.today().isoformat())
+    etag = make_etag(*parts)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+    project = await AsyncProjectService.get_project(db, project_id, current_user)
+    if not include_task_counts:
+        return project
+    counts = await AsyncProjectService.get_task_counts(db, [project.id])
+    return json_response(
+        project_with_counts_payload(project, counts[project.id]),
+        headers=etag_headers(etag),
+    )
+
+
+@router.get("/{project_id}/board", response_model=BoardResponse)
+async def get_board(
+    project_id: int,
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    sort_by: Literal["created_at", "due_date", "priority", "updated_at"] = "created_at",
+    sort_dir: Literal["asc", "desc"] = "desc",
+    priority: Optional[TaskPriority] = None,
+    assignee_id: Optional[int] = None,
+    due_date_from: Optional[date] = None,
+    due_date_to: Optional[date] = None,
+    is_overdue: Optional[bool] = None,
+    created_by: Optional[int] = None,
+    q: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.create_project(db, current_user, data)
+    """Project, members and the first ``limit`` tasks of every status column.
+
+    Load more of a column from ``/projects/{id}/tasks`` with its ``status``,
+    ``next_cursor`` and the same ``sort_by``/``sort_dir`` and filters.
+    """
+    version, access_class = await AsyncProjectService.get_read_scope(
+        db, project_id, current_user
+    )
+
+    async def build():
+        board = await AsyncProjectService.get_board(
+            db,
+            project_id,
+            current_user,
+            limit=limit,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            priority=priority,
+            assignee_id=assignee_id,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            is_overdue=is_overdue,
+            created_by=created_by,
+            q=q,
+        )
+        return dumps(board_payload(board))
+
+    # is_overdue depends on the date, so the key rolls over at midnight.
+    parts = (
+        "board",
+        project_id,
+        version,
+        access_class,
+        query_key(request),
+        date.today().isoformat(),
+    )
+    return await cached_response(request, parts, build)
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(
+@router.get(
+    "/{project_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Server-Sent Events: task, assignment, member and "
+            "project changes.",
+            "content": {"text/event-stream": {}},
+        }
+    },
+)
+async def project_events(
     project_id: int,
+    last_event_id: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.get_project(db, project_id, current_user)
+    """Changes to the project as they happen. Reconnect with the id of the
+    last event received in ``Last-Event-ID`` to get what was missed; a
+    ``reset`` event means it is gone and the client should reload.
+
+    The stream ends after ``EVENTS_MAX_STREAM_SECONDS``, when the client
+    falls too far behind, and when the project is deleted or the user
+    removed from it, so access is checked again on every reconnect.
+    """
+    await AsyncProjectService.get_read_scope(db, project_id, current_user)
+    # The stream outlives the request's need for a connection.
+    await run_db(db, Session.close)
+    subscription = await event_broker.subscribe(project_id, last_event_id)
+    is_admin = current_user.role == UserRole.admin
+
+    def ends_stream(event: Event) -> bool:
+        if event.type == "project.deleted":
+            return True
+        return (
+            event.type == "member.removed"
+            and event.data["user_id"] == current_user.id
+            and not is_admin
+        )
+
+    return StreamingResponse(
+        event_stream(
+            subscription,
+            settings.EVENTS_HEARTBEAT_SECONDS,
+            settings.EVENTS_MAX_STREAM_SECONDS,
+            ends_stream,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: int,
     data: ProjectUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.update_project(db, project_id, current_user, data)
+    return await AsyncProjectService.update_project(db, project_id, current_user, data)
 
 
-@router.delete("/{project_id}", status_code=204)
-def delete_project(
+@router.delete(
+    "/{project_id}",
+    status_code=204,
+    responses={202: {"description": "Deleted; tasks are being purged in batches"}},
+)
+async def delete_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
 ):
-    ProjectService.delete_project(db, project_id, current_user)
+    """Delete a project. One with too many tasks to delete in the request
+    disappears at once but is purged in the background: 202 instead of 204."""
+    if await AsyncProjectService.delete_project(db, project_id, current_user):
+        background_tasks.add_task(purge_in_background, session_factory, project_id)
+        return Response(status_code=202)
 
 
 @router.patch("/{project_id}/archive", response_model=ProjectResponse)
-def archive_project(
+async def archive_project(
     project_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.archive_project(db, project_id, current_user)
+    return await AsyncProjectService.archive_project(db, project_id, current_user)
 
 
-@router.get("/{project_id}/members", response_model=list[UserResponse])
-def list_members(
+@router.get("/{project_id}/members", response_model=PaginatedResponse[UserResponse])
+async def list_members(
     project_id: int,
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.list_members(db, project_id, current_user)
+    version, access_class = await AsyncProjectService.get_read_scope(
+        db, project_id, current_user
+    )
+
+    async def build():
+        page = await AsyncProjectService.list_members(
+            db, project_id, current_user, limit=limit, offset=offset, cursor=cursor
+        )
+        return dumps(page_payload(page, limit, offset, map(user_payload, page.items)))
+
+    parts = ("members", project_id, version, access_class, query_key(request))
+    return await cached_response(request, parts, build)
 
 
 @router.post(
     "/{project_id}/members", response_model=ProjectMemberResponse, status_code=201
 )
-def add_member(
+async def add_member(
     project_id: int,
     data: AddMemberRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return ProjectService.add_member(db, project_id, current_user, data.user_id)
+    return await AsyncProjectService.add_member(
+        db, project_id, current_user, data.user_id
+    )
 
 
 @router.delete("/{project_id}/members/{user_id}", status_code=204)
-def remove_member(
+async def remove_member(
     project_id: int,
     user_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    ProjectService.remove_member(db, project_id, current_user, user_id)
+    await AsyncProjectService.remove_member(db, project_id, current_user, user_id)
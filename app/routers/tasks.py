@@ -1,49 +1,97 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+import logging
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional, Literal
 from datetime import date
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, AnySession
 from app.dependencies import get_current_user
+from app.etag import check_etag, make_etag, query_key
+from app.response_cache import cached_response
+from app.serialization import (
+    changes_payload,
+    dumps,
+    json_response,
+    page_payload,
+    task_payload,
+)
 from app.models.user import User
 from app.models.task import TaskStatus, TaskPriority
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.schemas.common import PaginatedResponse
-from app.services.task_service import TaskService
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchItemResult,
+    TaskBatchResponse,
+    TaskBatchUpdate,
+    TaskBulkUpdate,
+    TaskBulkUpdateResponse,
+    TaskChangesResponse,
+    TaskCreate,
+    TaskImportResponse,
+    TaskUpdate,
+    TaskResponse,
+)
+from app.schemas.common import ErrorDetail, PaginatedResponse
+from app.repositories.pagination import IncludeTotal
+from app.services.project_service import AsyncProjectService
+from app.services.task_export import MEDIA_TYPES, ExportFormat, stream_export
+from app.services.task_import import (
+    AsyncTaskImportService,
+    ImportFormat,
+    ImportProgress,
+    open_text,
+    run_import,
+    spool_upload,
+)
+from app.services.task_service import AsyncTaskService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["tasks"])
 
 
 @router.get("/tasks/mine", response_model=PaginatedResponse[TaskResponse])
-def list_my_tasks(
+async def list_my_tasks(
+    request: Request,
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
     sort_by: Literal["created_at", "due_date", "priority", "updated_at"] = "created_at",
     sort_dir: Literal["asc", "desc"] = "desc",
     limit: int = Query(20, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: IncludeTotal = "exact",
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    tasks, total = TaskService.list_my_tasks(
-        db,
-        current_user,
-        status=status,
-        priority=priority,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-        limit=limit,
-        offset=offset,
-    )
-    return PaginatedResponse(
-        total=total, limit=limit, offset=offset, items=_build_task_responses(tasks)
-    )
+    versions = await AsyncTaskService.my_tasks_version(db, current_user)
+
+    async def build():
+        page = await AsyncTaskService.list_my_tasks(
+            db,
+            current_user,
+            status=status,
+            priority=priority,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        return dumps(page_payload(page, limit, offset, map(task_payload, page.items)))
+
+    parts = ("my_tasks", current_user.id, versions, query_key(request))
+    return await cached_response(request, parts, build)
 
 
 @router.get(
     "/projects/{project_id}/tasks", response_model=PaginatedResponse[TaskResponse]
 )
-def list_tasks(
+async def list_tasks(
     project_id: int,
+    request: Request,
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
     assignee_id: Optional[int] = None,
@@ -52,14 +100,101 @@ def list_tasks(
     is_overdue: Optional[bool] = None,
     created_by: Optional[int] = None,
     q: Optional[str] = None,
-    sort_by: Literal["created_at", "due_date", "priority", "updated_at"] = "created_at",
+    sort_by: Literal[
+        "created_at", "due_date", "priority", "updated_at", "relevance"
+    ] = "created_at",
     sort_dir: Literal["asc", "desc"] = "desc",
     limit: int = Query(20, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: IncludeTotal = "exact",
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    version, access_class = await AsyncProjectService.get_read_scope(
+        db, project_id, current_user
+    )
+
+    async def build():
+        page = await AsyncTaskService.list_tasks(
+            db,
+            project_id,
+            current_user,
+            status=status,
+            priority=priority,
+            assignee_id=assignee_id,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            is_overdue=is_overdue,
+            created_by=created_by,
+            q=q,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        return dumps(page_payload(page, limit, offset, map(task_payload, page.items)))
+
+    # is_overdue depends on the date, so the key rolls over at midnight.
+    parts = (
+        "tasks",
+        project_id,
+        version,
+        access_class,
+        query_key(request),
+        date.today().isoformat(),
+    )
+    return await cached_response(request, parts, build)
+
+
+@router.get("/projects/{project_id}/changes", response_model=TaskChangesResponse)
+async def list_changes(
+    project_id: int,
+    since: Optional[str] = Query(None, description="next_cursor of the last poll"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    """What changed in the project's tasks since the last poll.
+
+    Start without ``since`` to receive every task, then keep passing the
+    returned ``next_cursor``. Work done per call follows the number of
+    changes, not the size of the project. A 410 ``cursor_expired`` means the
+    deletions since the cursor are no longer kept: start over without it.
+    """
+    changes = await AsyncTaskService.list_changes(
+        db, project_id, current_user, since, limit
+    )
+    return json_response(changes_payload(changes))
+
+
+@router.get(
+    "/projects/{project_id}/tasks:export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One task per line (NDJSON) or per row (CSV).",
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        }
+    },
+)
+async def export_tasks(
+    project_id: int,
+    format: ExportFormat = "ndjson",
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    assignee_id: Optional[int] = None,
+    due_date_from: Optional[date] = None,
+    due_date_to: Optional[date] = None,
+    is_overdue: Optional[bool] = None,
+    created_by: Optional[int] = None,
+    q: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    tasks, total = TaskService.list_tasks(
+    stmt = await AsyncTaskService.export_statement(
         db,
         project_id,
         current_user,
@@ -71,60 +206,204 @@ def list_tasks(
         is_overdue=is_overdue,
         created_by=created_by,
         q=q,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-        limit=limit,
-        offset=offset,
     )
-    return PaginatedResponse(
-        total=total, limit=limit, offset=offset, items=_build_task_responses(tasks)
+    filename = f"project-{project_id}-tasks.{format}"
+    return StreamingResponse(
+        stream_export(db, stmt, format, settings.TASK_EXPORT_CHUNK_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/projects/{project_id}/tasks:import",
+    response_model=TaskImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        }
+    },
+)
+async def import_tasks(
+    project_id: int,
+    request: Request,
+    format: ImportFormat = "ndjson",
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    """Import tasks from the raw request body, in the task export formats.
+
+    Rows are committed a chunk at a time and invalid rows are skipped; the
+    response counts both and lists the first row errors.
+    """
+    await AsyncTaskImportService.check_access(db, project_id, current_user)
+    errors: list[dict] = []
+
+    def on_error(error: dict) -> None:
+        if len(errors) < settings.TASK_IMPORT_MAX_REPORTED_ERRORS:
+            errors.append(error)
+
+    def on_progress(progress: ImportProgress) -> None:
+        logger.info(
+            "Task import into project %s: %s rows processed, %s imported, %s failed",
+            project_id,
+            progress.processed,
+            progress.imported,
+            progress.failed,
+        )
+
+    with await spool_upload(request.stream()) as upload:
+        progress = await run_import(
+            db,
+            project_id,
+            current_user,
+            open_text(upload),
+            format,
+            settings.TASK_IMPORT_CHUNK_SIZE,
+            on_error,
+            on_progress,
+        )
+    return TaskImportResponse(
+        **asdict(progress),
+        errors=errors,
+        errors_truncated=progress.failed > len(errors),
     )
 
 
 @router.post(
     "/projects/{project_id}/tasks", response_model=TaskResponse, status_code=201
 )
-def create_task(
+async def create_task(
     project_id: int,
     data: TaskCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    task = TaskService.create_task(db, project_id, current_user, data)
+    task = await AsyncTaskService.create_task(db, project_id, current_user, data)
     return _build_task_response(task)
 
 
 @router.get("/projects/{project_id}/tasks/{task_id}", response_model=TaskResponse)
-def get_task(
+async def get_task(
     project_id: int,
     task_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    task = TaskService.get_task(db, project_id, task_id, current_user)
+    version, access_class = await AsyncProjectService.get_read_scope(
+        db, project_id, current_user
+    )
+    etag = make_etag("task", project_id, task_id, version, access_class)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+    task = await AsyncTaskService.get_task(db, project_id, task_id, current_user)
     return _build_task_response(task)
 
 
 @router.patch("/projects/{project_id}/tasks/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     project_id: int,
     task_id: int,
     data: TaskUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    task = TaskService.update_task(db, project_id, task_id, current_user, data)
+    task = await AsyncTaskService.update_task(
+        db, project_id, task_id, current_user, data
+    )
     return _build_task_response(task)
 
 
 @router.delete("/projects/{project_id}/tasks/{task_id}", status_code=204)
-def delete_task(
+async def delete_task(
     project_id: int,
     task_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
+):
+    await AsyncTaskService.delete_task(db, project_id, task_id, current_user)
+
+
+@router.post("/projects/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def batch_create_tasks(
+    project_id: int,
+    data: TaskBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    results = await AsyncTaskService.batch_create(
+        db, project_id, current_user, data.items, data.mode
+    )
+    return _build_batch_response(results, success_status=201)
+
+
+@router.patch("/projects/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def batch_update_tasks(
+    project_id: int,
+    data: TaskBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    results = await AsyncTaskService.batch_update(
+        db, project_id, current_user, data.items, data.mode
+    )
+    return _build_batch_response(results, success_status=200)
+
+
+@router.delete("/projects/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def batch_delete_tasks(
+    project_id: int,
+    data: TaskBatchDelete,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
+):
+    results = await AsyncTaskService.batch_delete(
+        db, project_id, current_user, data.ids, data.mode
+    )
+    return _build_batch_response(results, success_status=204)
+
+
+@router.post(
+    "/projects/{project_id}/tasks:bulk-update", response_model=TaskBulkUpdateResponse
+)
+async def bulk_update_tasks(
+    project_id: int,
+    data: TaskBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db),
 ):
-    TaskService.delete_task(db, project_id, task_id, current_user)
+    affected = await AsyncTaskService.bulk_update(db, project_id, current_user, data)
+    return TaskBulkUpdateResponse(affected=affected, dry_run=data.dry_run)
+
+
+def _build_batch_response(results, success_status: int) -> TaskBatchResponse:
+    items = []
+    for r in results:
+        if r.error is None:
+            items.append(
+                TaskBatchItemResult(
+                    index=r.index,
+                    id=r.task_id,
+                    status_code=success_status,
+                    task=_build_task_response(r.task) if r.task else None,
+                )
+            )
+        else:
+            items.append(
+                TaskBatchItemResult(
+                    index=r.index,
+                    status_code=r.error.status_code,
+                    error=ErrorDetail(code=r.error.code, message=r.error.message),
+                )
+            )
+    failed = sum(1 for r in results if r.error is not None)
+    return TaskBatchResponse(
+        succeeded=len(results) - failed, failed=failed, results=items
+    )
 
 
 def _build_task_response(task) -> TaskResponse:
@@ -150,7 +429,3 @@ def _build_task_response(task) -> TaskResponse:
         updated_at=task.updated_at,
         assignees=assignees,
     )
-
-
-def _build_task_responses(tasks) -> list[TaskResponse]:
-    return [_build_task_response(t) for t in tasks]
@@ -1,80 +1,91 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
+from typing import Optional
+from app.database import get_db, AnySession
 from app.dependencies import get_current_user, require_admin
 from app.models.user import User
 from app.schemas.user import UserResponse, UpdateProfileRequest
 from app.schemas.common import PaginatedResponse
-from app.services.user_service import UserService
+from app.serialization import json_response, page_payload, user_payload
+from app.repositories.pagination import IncludeTotal
+from app.services.user_service import UserService, AsyncUserService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("", response_model=PaginatedResponse[UserResponse])
-def list_users(
+async def list_users(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: IncludeTotal = "exact",
     _admin: User = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    users, total = UserService.list_users(db, limit=limit, offset=offset)
-    return PaginatedResponse(total=total, limit=limit, offset=offset, items=users)
+    page = await AsyncUserService.list_users(
+        db, limit=limit, offset=offset, cursor=cursor, include_total=include_total
+    )
+    return json_response(
+        page_payload(page, limit, offset, map(user_payload, page.items))
+    )
 
 
 @router.get("/me", response_model=UserResponse)
-def get_own_profile(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_own_profile(
+    current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)
+):
+    return await AsyncUserService.get_profile(db, current_user)
 
 
 @router.get("/search", response_model=list[UserResponse])
-def search_users(
+async def search_users(
     q: str = Query(..., min_length=1),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return UserService.search_users(db, q)
+    users = await AsyncUserService.search_users(db, q)
+    return json_response([user_payload(u) for u in users])
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
     _admin: User = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return UserService.get_user_by_id(db, user_id)
+    return await AsyncUserService.get_user_by_id(db, user_id)
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_profile(
+async def update_profile(
     data: UpdateProfileRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return UserService.update_profile(db, current_user, data)
+    return await UserService.update_profile(db, current_user, data)
 
 
 @router.patch("/{user_id}/deactivate", response_model=UserResponse)
-def deactivate_user(
+async def deactivate_user(
     user_id: int,
     _admin: User = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return UserService.deactivate_user(db, user_id)
+    return await AsyncUserService.deactivate_user(db, user_id)
 
 
 @router.patch("/{user_id}/activate", response_model=UserResponse)
-def activate_user(
+async def activate_user(
     user_id: int,
     _admin: User = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    return UserService.activate_user(db, user_id)
+    return await AsyncUserService.activate_user(db, user_id)
 
 
 @router.delete("/{user_id}", status_code=204)
-def delete_user(
+async def delete_user(
     user_id: int,
     _admin: User = Depends(require_admin),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
 ):
-    UserService.delete_user(db, user_id)
+    await AsyncUserService.delete_user(db, user_id)
@@ -17,3 +17,20 @@ class AssignmentResponse(BaseModel):
     assignee: Optional[UserResponse] = None
 
     model_config = {"from_attributes": True}
+
+
+class AssignmentPair(BaseModel):
+    task_id: int
+    user_id: int
+
+
+class BulkAssignmentRequest(BaseModel):
+    assign: list[AssignmentPair] = []
+    unassign: list[AssignmentPair] = []
+
+
+class BulkAssignmentResponse(BaseModel):
+    assigned: list[AssignmentPair]
+    already_assigned: list[AssignmentPair]
+    unassigned: list[AssignmentPair]
+    not_assigned: list[AssignmentPair]
@@ -1,14 +1,30 @@
 from pydantic import BaseModel
-from typing import TypeVar, Generic, Any
+from typing import TypeVar, Generic, Any, Optional
 
 T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    total: int
+    # None when the caller asked for include_total=none.
+    total: Optional[int]
     limit: int
     offset: int
     items: list[T]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
+
+    @classmethod
+    def from_page(cls, page, limit: int, offset: int, items=None):
+        return cls(
+            total=page.total,
+            limit=limit,
+            offset=offset,
+            items=page.items if items is None else items,
+            next_cursor=page.next_cursor,
+            has_more=page.has_more,
+            total_is_estimate=page.total_is_estimate,
+        )
 
 
 class ErrorDetail(BaseModel):
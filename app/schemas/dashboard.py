@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class DashboardTaskCounts(BaseModel):
+    total: int
+    # Every task status, including those with no tasks.
+    by_status: dict[str, int]
+    overdue: int
+
+
+class DashboardSummary(BaseModel):
+    # Unarchived projects the user can open (every project, for admins).
+    projects: int
+    # Tasks assigned to the user.
+    my_tasks: DashboardTaskCounts
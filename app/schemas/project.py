@@ -1,6 +1,8 @@
 from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import Optional
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.task import TaskResponse
 from app.schemas.user import UserResponse
 
 
@@ -60,6 +62,20 @@ class ProjectResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ProjectTaskCounts(BaseModel):
+    total: int
+    # Every status and priority, including those with no tasks.
+    by_status: dict[TaskStatus, int]
+    by_priority: dict[TaskPriority, int]
+    # Tasks not done whose due date has passed.
+    overdue: int
+
+
+class ProjectWithCountsResponse(ProjectResponse):
+    # Only with include_task_counts=true.
+    task_counts: Optional[ProjectTaskCounts] = None
+
+
 class AddMemberRequest(BaseModel):
     user_id: int
 
@@ -72,3 +88,19 @@ class ProjectMemberResponse(BaseModel):
     user: Optional[UserResponse] = None
 
     model_config = {"from_attributes": True}
+
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    # Tasks in the column, of which ``tasks`` are the first.
+    total: int
+    tasks: list[TaskResponse]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class BoardResponse(BaseModel):
+    project: ProjectResponse
+    members: list[UserResponse]
+    # One column per task status, in status order, empty ones included.
+    columns: list[BoardColumn]
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, field_validator
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Literal, Optional
 from app.models.task import TaskStatus, TaskPriority
 from app.schemas.user import UserResponse
+from app.schemas.common import ErrorDetail
 
 
 class AssigneeInfo(BaseModel):
@@ -79,3 +80,105 @@ class TaskResponse(BaseModel):
     assignees: list[AssigneeInfo] = []
 
     model_config = {"from_attributes": True}
+
+
+BatchMode = Literal["atomic", "best_effort"]
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchCreate(BaseModel):
+    mode: BatchMode = "atomic"
+    items: list[TaskCreate]
+
+
+class TaskBatchUpdate(BaseModel):
+    mode: BatchMode = "atomic"
+    items: list[TaskBatchUpdateItem]
+
+
+class TaskBatchDelete(BaseModel):
+    mode: BatchMode = "atomic"
+    ids: list[int]
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    task: Optional[TaskResponse] = None
+    error: Optional[ErrorDetail] = None
+
+
+class TaskBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[TaskBatchItemResult]
+
+
+class TaskFilter(BaseModel):
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assignee_id: Optional[int] = None
+    due_date_from: Optional[date] = None
+    due_date_to: Optional[date] = None
+    is_overdue: Optional[bool] = None
+    created_by: Optional[int] = None
+    q: Optional[str] = None
+
+
+class TaskBulkChanges(BaseModel):
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+
+
+class TaskBulkUpdate(BaseModel):
+    filter: TaskFilter = TaskFilter()
+    changes: TaskBulkChanges
+    dry_run: bool = False
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    affected: int
+    dry_run: bool
+
+
+class TaskImportRowError(BaseModel):
+    row: int
+    code: str
+    message: str
+    details: Any = None
+    record: Optional[dict] = None
+
+
+class TaskImportResponse(BaseModel):
+    processed: int
+    imported: int
+    failed: int
+    errors: list[TaskImportRowError]
+    # True when more rows failed than are listed in ``errors``.
+    errors_truncated: bool = False
+
+
+class TaskTombstone(BaseModel):
+    id: int
+    deleted_at: datetime
+
+
+class AssignmentTombstone(BaseModel):
+    task_id: int
+    user_id: int
+    deleted_at: datetime
+
+
+class TaskChangesResponse(BaseModel):
+    # Created or updated since the cursor, with their current assignees.
+    tasks: list[TaskResponse]
+    deleted_tasks: list[TaskTombstone]
+    # An assignment deleted before its task's updated_at may have been
+    # made again since; the task's assignees are authoritative.
+    deleted_assignments: list[AssignmentTombstone]
+    next_cursor: str
+    has_more: bool
@@ -0,0 +1,152 @@
+"""Single-pass JSON for list endpoints.
+
+Returning pydantic models makes FastAPI validate every item a second time
+against ``response_model`` and encode it through ``jsonable_encoder`` and the
+stdlib ``json`` module. For rows loaded from our own database that work buys
+nothing, so list endpoints build plain dicts shaped like their response
+schemas and encode them straight to bytes. The schemas remain the documented
+contract; the tests check that both paths produce the same document.
+"""
+
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import pydantic_core
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic-core emits the same bytes, slower
+    orjson = None
+
+from app.schemas.project import ProjectResponse
+from app.schemas.user import UserResponse
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        # OPT_UTC_Z writes UTC offsets as "Z", like pydantic does.
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_UTC_Z,
+            default=pydantic_core.to_jsonable_python,
+        )
+    return pydantic_core.to_json(content)
+
+
+def json_response(
+    content, status_code: int = 200, headers: Optional[dict] = None
+) -> Response:
+    return Response(
+        content=dumps(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+@lru_cache
+def _field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def attributes(schema: type[BaseModel], obj) -> dict:
+    """``obj``'s attributes under ``schema``'s field names, unvalidated."""
+    return {name: getattr(obj, name) for name in _field_names(schema)}
+
+
+def user_payload(user) -> dict:
+    return attributes(UserResponse, user)
+
+
+def project_payload(project) -> dict:
+    return attributes(ProjectResponse, project)
+
+
+def project_with_counts_payload(project, task_counts: dict) -> dict:
+    return {**project_payload(project), "task_counts": task_counts}
+
+
+def task_payload(task) -> dict:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "due_date": task.due_date,
+        "project_id": task.project_id,
+        "created_by": task.created_by,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "assignees": [
+            {
+                "id": a.assignee.id,
+                "username": a.assignee.username,
+                "email": a.assignee.email,
+            }
+            for a in task.assignments
+            if a.assignee
+        ],
+    }
+
+
+def assignment_payload(assignment) -> dict:
+    assignee = assignment.assignee
+    return {
+        "id": assignment.id,
+        "task_id": assignment.task_id,
+        "user_id": assignment.user_id,
+        "assigned_by": assignment.assigned_by,
+        "assigned_at": assignment.assigned_at,
+        "assignee": user_payload(assignee) if assignee is not None else None,
+    }
+
+
+def page_payload(page, limit: int, offset: int, items: Iterable[dict]) -> dict:
+    """The :class:`~app.schemas.common.PaginatedResponse` document for ``page``."""
+    return {
+        "total": page.total,
+        "limit": limit,
+        "offset": offset,
+        "items": list(items),
+        "next_cursor": page.next_cursor,
+        "has_more": page.has_more,
+        "total_is_estimate": page.total_is_estimate,
+    }
+
+
+def board_payload(board) -> dict:
+    """The :class:`~app.schemas.project.BoardResponse` document for ``board``."""
+    return {
+        "project": project_payload(board.project),
+        "members": [user_payload(member) for member in board.members],
+        "columns": [
+            {
+                "status": status,
+                "total": column.total,
+                "tasks": [task_payload(task) for task in column.items],
+                "next_cursor": column.next_cursor,
+                "has_more": column.has_more,
+            }
+            for status, column in board.columns.items()
+        ],
+    }
+
+
+def changes_payload(changes) -> dict:
+    """The :class:`~app.schemas.task.TaskChangesResponse` document for
+    ``changes``."""
+    return {
+        "tasks": [task_payload(task) for task in changes.tasks],
+        "deleted_tasks": [
+            {"id": t.task_id, "deleted_at": t.deleted_at} for t in changes.deleted_tasks
+        ],
+        "deleted_assignments": [
+            {"task_id": t.task_id, "user_id": t.user_id, "deleted_at": t.deleted_at}
+            for t in changes.deleted_assignments
+        ],
+        "next_cursor": changes.next_cursor,
+        "has_more": changes.has_more,
+    }
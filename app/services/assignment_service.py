@@ -1,15 +1,37 @@
+from dataclasses import dataclass, field
 from sqlalchemy.orm import Session
-from app.models.user import User, UserRole
+from app.models.user import User
 from app.repositories.assignment_repository import AssignmentRepository
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.task_repository import TaskRepository
-from app.exceptions import NotFoundException, ForbiddenException, ConflictException
+from app.config import settings
+from app.exceptions import (
+    BadRequestException,
+    BatchFailedException,
+    NotFoundException,
+    ForbiddenException,
+    ConflictException,
+)
+from app.services.project_access import ProjectAccess, get_project_access
+from app.database import AsyncFacade
+from app.events import publish_event
+from app.serialization import user_payload
+
+Pair = tuple[int, int]
+
+
+@dataclass
+class BulkAssignmentResult:
+    assigned: list[Pair] = field(default_factory=list)
+    already_assigned: list[Pair] = field(default_factory=list)
+    unassigned: list[Pair] = field(default_factory=list)
+    not_assigned: list[Pair] = field(default_factory=list)
 
 
 class AssignmentService:
     @staticmethod
-    def _check_owner_or_admin(project, user: User):
-        if user.role != UserRole.admin and project.owner_id != user.id:
+    def _check_owner_or_admin(access: ProjectAccess):
+        if not access.can_manage:
             raise ForbiddenException(
                 "permission_denied", "Only project owners can manage assignments"
             )
@@ -18,10 +40,8 @@ class AssignmentService:
     def assign_user(
         db: Session, project_id: int, task_id: int, user: User, assignee_id: int
     ):
-        from app.services.project_service import ProjectService
-
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        AssignmentService._check_owner_or_admin(project, user)
+        access = get_project_access(db, project_id, user)
+        AssignmentService._check_owner_or_admin(access)
 
         task = TaskRepository.get_by_id(db, task_id)
         if not task or task.project_id != project_id:
@@ -40,18 +60,26 @@ class AssignmentService:
                 "duplicate_assignment", "User already assigned to this task"
             )
 
-        return AssignmentRepository.create(
-            db, task_id=task_id, user_id=assignee_id, assigned_by=user.id
+        assignment = AssignmentRepository.create(
+            db,
+            project_id=project_id,
+            task_id=task_id,
+            user_id=assignee_id,
+            assigned_by=user.id,
+        )
+        publish_event(
+            project_id,
+            "assignment.created",
+            {"task_id": task_id, "assignee": user_payload(assignment.assignee)},
         )
+        return assignment
 
     @staticmethod
     def unassign_user(
         db: Session, project_id: int, task_id: int, user: User, assignee_id: int
     ) -> None:
-        from app.services.project_service import ProjectService
-
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        AssignmentService._check_owner_or_admin(project, user)
+        access = get_project_access(db, project_id, user)
+        AssignmentService._check_owner_or_admin(access)
 
         task = TaskRepository.get_by_id(db, task_id)
         if not task or task.project_id != project_id:
@@ -60,14 +88,89 @@ class AssignmentService:
         assignment = AssignmentRepository.get_by_task_and_user(db, task_id, assignee_id)
         if not assignment:
             raise NotFoundException("Assignment not found")
-        AssignmentRepository.delete(db, assignment)
+        AssignmentRepository.delete(db, project_id, assignment)
+        publish_event(
+            project_id,
+            "assignment.deleted",
+            {"task_id": task_id, "user_id": assignee_id},
+        )
 
     @staticmethod
-    def list_assignments(db: Session, project_id: int, task_id: int, user: User):
-        from app.services.project_service import ProjectService
+    def bulk_update(
+        db: Session,
+        project_id: int,
+        user: User,
+        assign: list[Pair],
+        unassign: list[Pair],
+    ) -> BulkAssignmentResult:
+        """Assign and unassign ``(task_id, user_id)`` pairs in one transaction.
 
-        ProjectService._get_accessible_project(db, project_id, user)
+        Every task must belong to the project and every new assignee must be
+        a member, or nothing is applied. Existing assignments and missing
+        ones are reported rather than rejected, so the call is idempotent.
+        """
+        access = get_project_access(db, project_id, user)
+        AssignmentService._check_owner_or_admin(access)
+        if len(assign) + len(unassign) > settings.TASK_BATCH_MAX_ITEMS:
+            raise BadRequestException(
+                f"At most {settings.TASK_BATCH_MAX_ITEMS} pairs per request"
+            )
+        assign, unassign = list(dict.fromkeys(assign)), list(dict.fromkeys(unassign))
+        if set(assign) & set(unassign):
+            raise BadRequestException("A pair cannot be both assigned and unassigned")
+
+        task_ids = TaskRepository.ids_in_project(
+            db, project_id, sorted({t for t, _ in assign + unassign})
+        )
+        members = ProjectRepository.member_user_ids(
+            db, project_id, sorted({u for _, u in assign})
+        )
+        errors = []
+        for op, pairs in (("assign", assign), ("unassign", unassign)):
+            for index, (task_id, user_id) in enumerate(pairs):
+                if task_id not in task_ids:
+                    error = NotFoundException("Task not found")
+                elif op == "assign" and user_id not in members:
+                    error = ForbiddenException(
+                        "not_a_member", "User must be a project member to be assigned"
+                    )
+                else:
+                    continue
+                errors.append(
+                    {
+                        "op": op,
+                        "index": index,
+                        "code": error.code,
+                        "message": error.message,
+                    }
+                )
+        if errors:
+            raise BatchFailedException(errors)
+
+        inserted, removed = AssignmentRepository.apply_pairs(
+            db, project_id, assign, unassign, user.id
+        )
+        result = BulkAssignmentResult(
+            assigned=[p for p in assign if p in inserted],
+            already_assigned=[p for p in assign if p not in inserted],
+            unassigned=[p for p in unassign if p in removed],
+            not_assigned=[p for p in unassign if p not in removed],
+        )
+        if inserted or removed:
+            publish_event(
+                project_id,
+                "assignments.changed",
+                {"assigned": result.assigned, "unassigned": result.unassigned},
+            )
+        return result
+
+    @staticmethod
+    def list_assignments(db: Session, project_id: int, task_id: int, user: User):
+        get_project_access(db, project_id, user)
         task = TaskRepository.get_by_id(db, task_id)
         if not task or task.project_id != project_id:
             raise NotFoundException("Task not found")
         return AssignmentRepository.list_for_task(db, task_id)
+
+
+AsyncAssignmentService = AsyncFacade(AssignmentService)
@@ -1,17 +1,41 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import jwt, JWTError, ExpiredSignatureError
-from passlib.context import CryptContext
+from app.cache import TTLCache
 from app.config import settings
-from app.exceptions import UnauthorizedException
+from app.exceptions import UnauthorizedException, ServiceUnavailableException
+from app.hashing import PasswordHashExecutor, HashingOverloaded, crypt_context
+from app.models.user import User, UserRole
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+pwd_context = crypt_context(settings.BCRYPT_ROUNDS)
+
+password_hasher = PasswordHashExecutor(
+    mode=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
 )
 
 ALGORITHM = "HS256"
 
 
+@dataclass(frozen=True)
+class Principal:
+    """The slice of a user row that authentication decisions depend on."""
+
+    user_id: int
+    token_version: int
+    is_active: bool
+    role: UserRole
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
 class AuthService:
     @staticmethod
     def hash_password(password: str) -> str:
@@ -21,6 +45,43 @@ class AuthService:
     def verify_password(plain: str, hashed: str) -> bool:
         return pwd_context.verify(plain, hashed)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        try:
+            return await password_hasher.hash(password)
+        except HashingOverloaded:
+            raise ServiceUnavailableException(
+                "server_busy", "Too many concurrent authentication requests"
+            )
+
+    @staticmethod
+    async def verify_password_async(plain: str, hashed: str) -> bool:
+        try:
+            return await password_hasher.verify(plain, hashed)
+        except HashingOverloaded:
+            raise ServiceUnavailableException(
+                "server_busy", "Too many concurrent authentication requests"
+            )
+
+    @staticmethod
+    def get_cached_principal(user_id: int) -> Optional[Principal]:
+        return principal_cache.get(user_id)
+
+    @staticmethod
+    def cache_principal(user: User) -> Principal:
+        principal = Principal(
+            user_id=user.id,
+            token_version=user.token_version,
+            is_active=user.is_active,
+            role=user.role,
+        )
+        principal_cache.set(user.id, principal)
+        return principal
+
+    @staticmethod
+    def invalidate_principal(user_id: int) -> None:
+        principal_cache.invalidate(user_id)
+
     @staticmethod
     def create_access_token(user_id: int, role: str, token_version: int) -> str:
         expire = datetime.now(timezone.utc) + timedelta(
@@ -0,0 +1,57 @@
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.dashboard_cache import dashboard_cache
+from app.database import AsyncFacade
+from app.models.task import TaskStatus
+from app.models.user import User, UserRole
+from app.repositories.dashboard_repository import DashboardRepository
+
+
+class DashboardService:
+    @staticmethod
+    def get_summary(db: Session, user: User) -> dict:
+        """Project and assigned-task counts for ``user``'s dashboard, served
+        from :data:`dashboard_cache` until one of the projects behind them
+        changes."""
+        today = date.today()
+        summary = dashboard_cache.get(user.id, today)
+        if summary is not None:
+            return summary
+
+        built_at = dashboard_cache.now()
+        is_admin = user.role == UserRole.admin
+        by_status = {status.value: 0 for status in TaskStatus}
+        projects = overdue = 0
+        project_ids = set()
+        for (
+            kind,
+            project_id,
+            status,
+            count,
+            overdue_count,
+        ) in DashboardRepository.summary_rows(db, user.id, today, is_admin):
+            if kind == "tasks":
+                by_status[TaskStatus(status).value] += count
+                overdue += overdue_count
+            elif kind == "project" and not is_admin:
+                projects += count
+            elif kind == "all_projects":
+                projects = count
+            if project_id is not None:
+                project_ids.add(project_id)
+
+        summary = {
+            "projects": projects,
+            "my_tasks": {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "overdue": overdue,
+            },
+        }
+        dashboard_cache.set(user.id, built_at, project_ids, is_admin, today, summary)
+        return summary
+
+
+AsyncDashboardService = AsyncFacade(DashboardService)
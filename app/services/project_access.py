@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.exceptions import NotFoundException
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.repositories.project_repository import ProjectRepository
+
+_MEMO_KEY = "project_access"
+
+
+@dataclass(frozen=True)
+class ProjectAccess:
+    """What one user may do in one project, resolved by a single query."""
+
+    project: Project
+    user_id: int
+    is_admin: bool
+    is_owner: bool
+    is_member: bool
+
+    @property
+    def can_manage(self) -> bool:
+        return self.is_admin or self.is_owner
+
+    @property
+    def access_class(self) -> str:
+        """Coarsest grouping of viewers who are served identical responses."""
+        if self.is_admin:
+            return "admin"
+        return "owner" if self.is_owner else "member"
+
+
+def get_project_access(db: Session, project_id: int, user: User) -> ProjectAccess:
+    """Resolve ``user``'s access to ``project_id``, memoized on the session.
+
+    Sessions are request-scoped, so services called repeatedly while serving
+    one request share the lookup. The memo is dropped whenever the session
+    commits or rolls back, so a membership change is never served stale.
+    Raises ``NotFoundException`` when the project is missing or not visible.
+    """
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    key = (project_id, user.id)
+    access = memo.get(key)
+    if access is None:
+        row = ProjectRepository.get_with_membership(db, project_id, user.id)
+        if row is None:
+            raise NotFoundException("Project not found")
+        project, is_member = row
+        access = ProjectAccess(
+            project=project,
+            user_id=user.id,
+            is_admin=user.role == UserRole.admin,
+            is_owner=project.owner_id == user.id,
+            is_member=bool(is_member),
+        )
+        memo[key] = access
+    if not (access.is_admin or access.is_owner or access.is_member):
+        raise NotFoundException("Project not found")
+    return access
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_project_access(session: Session, *args) -> None:
+    session.info.pop(_MEMO_KEY, None)
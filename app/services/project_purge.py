@@ -0,0 +1,94 @@
+"""Batched deletion of projects too large to delete within a request.
+
+Deleting a project is one DELETE that the database cascades to its members,
+tasks, assignments and counters. Past ``PROJECT_PURGE_MIN_TASKS`` tasks that
+statement holds its locks for as long as the cascade takes, so the request
+only marks the project deleted, which hides it everywhere, and the purge then
+deletes its tasks a batch per transaction before deleting the project itself.
+A purge that stops partway, with the process restarting, say, is resumed by
+``python -m app.cli purge-projects``.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_stats_repository import TaskStatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeProgress:
+    project_id: int
+    # Tasks the project held when the purge started, from its counters.
+    total: int = 0
+    deleted: int = 0
+
+
+def purge_project(
+    db: Session,
+    project_id: int,
+    batch_size: int,
+    on_progress: Optional[Callable[[PurgeProgress], None]] = None,
+) -> PurgeProgress:
+    """Delete ``project_id``, already marked deleted, ``batch_size`` tasks
+    per transaction, reporting the running totals to ``on_progress``."""
+    counts = TaskStatsRepository.counts_for(db, [project_id], date.today())
+    progress = PurgeProgress(project_id, total=counts[project_id]["total"])
+    while True:
+        deleted = TaskRepository.purge_batch(db, project_id, batch_size)
+        db.commit()
+        if not deleted:
+            break
+        progress.deleted += deleted
+        if on_progress is not None:
+            on_progress(progress)
+        if deleted < batch_size:
+            break
+    project = ProjectRepository.get_by_id(db, project_id)
+    if project is not None:
+        ProjectRepository.delete(db, project)
+    return progress
+
+
+def purge_pending(
+    db: Session,
+    batch_size: int,
+    on_progress: Optional[Callable[[PurgeProgress], None]] = None,
+) -> list[PurgeProgress]:
+    """Purge every project marked deleted, oldest id first."""
+    return [
+        purge_project(db, project_id, batch_size, on_progress)
+        for project_id in ProjectRepository.pending_purge_ids(db)
+    ]
+
+
+def purge_in_background(session_factory: Callable[[], Session], project_id: int):
+    """Background task purging ``project_id`` with a session of its own and
+    logging its progress. On failure the project stays marked deleted for
+    ``purge-projects`` to finish."""
+
+    def on_progress(progress: PurgeProgress) -> None:
+        logger.info(
+            "Purge of project %s: %s of %s tasks deleted",
+            project_id,
+            progress.deleted,
+            progress.total,
+        )
+
+    try:
+        with session_factory() as db:
+            purge_project(
+                db, project_id, settings.PROJECT_PURGE_BATCH_SIZE, on_progress
+            )
+    except Exception:
+        logger.exception(
+            "Purge of project %s failed; run purge-projects to resume it", project_id
+        )
@@ -1,30 +1,55 @@
 from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from datetime import date
 from typing import Optional
+from app.config import settings
 from app.models.user import User, UserRole
 from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_stats_repository import TaskStatsRepository
 from app.repositories.user_repository import UserRepository
-from app.exceptions import NotFoundException, ForbiddenException, ConflictException
+from app.repositories.pagination import IncludeTotal, Page
+from app.exceptions import (
+    BadRequestException,
+    ConflictException,
+    ForbiddenException,
+    NotFoundException,
+)
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.project_access import ProjectAccess, get_project_access
+from app.database import AsyncFacade
+from app.events import publish_event
+from app.serialization import project_payload, user_payload
+
+
+@dataclass
+class Board:
+    project: Project
+    members: list[User]
+    columns: dict[TaskStatus, Page[Task]]
 
 
 class ProjectService:
+    @staticmethod
+    def _get_access(db: Session, project_id: int, user: User) -> ProjectAccess:
+        return get_project_access(db, project_id, user)
+
     @staticmethod
     def _get_accessible_project(db: Session, project_id: int, user: User) -> Project:
-        project = ProjectRepository.get_by_id(db, project_id)
-        if not project:
-            raise NotFoundException("Project not found")
-        if user.role == UserRole.admin:
-            return project
-        is_owner = project.owner_id == user.id
-        is_member = ProjectRepository.get_member(db, project_id, user.id) is not None
-        if not is_owner and not is_member:
-            raise NotFoundException("Project not found")
-        return project
+        return get_project_access(db, project_id, user).project
+
+    @staticmethod
+    def get_read_scope(db: Session, project_id: int, user: User) -> tuple[int, str]:
+        """``(version, access_class)`` identifying what ``user`` is served from
+        the project right now; raises like any other read if it is not visible."""
+        access = ProjectService._get_access(db, project_id, user)
+        return access.project.version, access.access_class
 
     @staticmethod
-    def _require_owner_or_admin(project: Project, user: User):
-        if user.role != UserRole.admin and project.owner_id != user.id:
+    def _require_owner_or_admin(access: ProjectAccess):
+        if not access.can_manage:
             raise ForbiddenException(
                 "permission_denied", "Only the project owner can perform this action"
             )
@@ -46,10 +71,18 @@ class ProjectService:
         search: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
     ):
         if user.role == UserRole.admin:
             return ProjectRepository.list_all(
-                db, is_archived=is_archived, search=search, limit=limit, offset=offset
+                db,
+                is_archived=is_archived,
+                search=search,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
             )
         return ProjectRepository.list_for_user(
             db,
@@ -58,66 +91,141 @@ class ProjectService:
             search=search,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            include_total=include_total,
         )
 
     @staticmethod
     def get_project(db: Session, project_id: int, user: User) -> Project:
         return ProjectService._get_accessible_project(db, project_id, user)
 
+    @staticmethod
+    def get_task_counts(db: Session, project_ids: list[int]) -> dict[int, dict]:
+        """Task counts per project from the maintained counters, without
+        touching ``tasks``. Callers have checked access to the projects."""
+        return TaskStatsRepository.counts_for(db, project_ids, date.today())
+
     @staticmethod
     def update_project(
         db: Session, project_id: int, user: User, data: ProjectUpdate
     ) -> Project:
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        ProjectService._require_owner_or_admin(project, user)
+        access = ProjectService._get_access(db, project_id, user)
+        ProjectService._require_owner_or_admin(access)
+        project = access.project
         updates = {
             k: v
             for k, v in data.model_dump(exclude_unset=True).items()
             if v is not None
         }
         if updates:
-            return ProjectRepository.update(db, project, **updates)
+            project = ProjectRepository.update(db, project, **updates)
+            publish_event(project_id, "project.updated", project_payload(project))
         return project
 
     @staticmethod
     def archive_project(db: Session, project_id: int, user: User) -> Project:
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        ProjectService._require_owner_or_admin(project, user)
-        return ProjectRepository.update(
+        access = ProjectService._get_access(db, project_id, user)
+        ProjectService._require_owner_or_admin(access)
+        project = access.project
+        project = ProjectRepository.update(
             db, project, is_archived=not project.is_archived
         )
+        publish_event(project_id, "project.updated", project_payload(project))
+        return project
 
     @staticmethod
-    def delete_project(db: Session, project_id: int, user: User) -> None:
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        ProjectService._require_owner_or_admin(project, user)
-        ProjectRepository.delete(db, project)
+    def delete_project(db: Session, project_id: int, user: User) -> bool:
+        """Delete the project, or, past ``PROJECT_PURGE_MIN_TASKS`` tasks, mark
+        it deleted and return True: the caller then runs
+        :func:`~app.services.project_purge.purge_project` outside the request."""
+        access = ProjectService._get_access(db, project_id, user)
+        ProjectService._require_owner_or_admin(access)
+        total = ProjectService.get_task_counts(db, [project_id])[project_id]["total"]
+        purge = total > settings.PROJECT_PURGE_MIN_TASKS
+        if purge:
+            ProjectRepository.mark_deleted(db, access.project)
+        else:
+            ProjectRepository.delete(db, access.project)
+        publish_event(project_id, "project.deleted", {"id": project_id})
+        return purge
 
     @staticmethod
     def add_member(db: Session, project_id: int, user: User, member_user_id: int):
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        ProjectService._require_owner_or_admin(project, user)
+        access = ProjectService._get_access(db, project_id, user)
+        ProjectService._require_owner_or_admin(access)
         target = UserRepository.get_by_id(db, member_user_id)
         if not target:
             raise NotFoundException("User not found")
         existing = ProjectRepository.get_member(db, project_id, member_user_id)
         if existing:
             raise ConflictException("conflict", "User is already a member")
-        return ProjectRepository.add_member(db, project_id, member_user_id)
+        member = ProjectRepository.add_member(db, project_id, member_user_id)
+        publish_event(project_id, "member.added", {"user": user_payload(member.user)})
+        return member
 
     @staticmethod
     def remove_member(
         db: Session, project_id: int, user: User, member_user_id: int
     ) -> None:
-        project = ProjectService._get_accessible_project(db, project_id, user)
-        ProjectService._require_owner_or_admin(project, user)
+        access = ProjectService._get_access(db, project_id, user)
+        ProjectService._require_owner_or_admin(access)
         member = ProjectRepository.get_member(db, project_id, member_user_id)
         if not member:
             raise NotFoundException("Member not found")
         ProjectRepository.remove_member(db, member)
+        publish_event(project_id, "member.removed", {"user_id": member_user_id})
 
     @staticmethod
-    def list_members(db: Session, project_id: int, user: User):
+    def list_members(
+        db: Session,
+        project_id: int,
+        user: User,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ):
+        ProjectService._get_accessible_project(db, project_id, user)
+        page = ProjectRepository.list_members(
+            db, project_id, limit=limit, offset=offset, cursor=cursor
+        )
+        page.items = [m.user for m in page.items]
+        return page
+
+    @staticmethod
+    def get_board(
+        db: Session,
+        project_id: int,
+        user: User,
+        limit: int = 20,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+        priority: Optional[TaskPriority] = None,
+        assignee_id: Optional[int] = None,
+        due_date_from: Optional[date] = None,
+        due_date_to: Optional[date] = None,
+        is_overdue: Optional[bool] = None,
+        created_by: Optional[int] = None,
+        q: Optional[str] = None,
+    ) -> Board:
         project = ProjectService._get_accessible_project(db, project_id, user)
-        members = ProjectRepository.list_members(db, project_id)
-        return [m.user for m in members]
+        if due_date_from and due_date_to and due_date_from > due_date_to:
+            raise BadRequestException("due_date_from must not be after due_date_to")
+        columns = TaskRepository.board_columns(
+            db,
+            project_id,
+            limit=limit,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            priority=priority,
+            assignee_id=assignee_id,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            is_overdue=is_overdue,
+            created_by=created_by,
+            q=q,
+        )
+        members = ProjectRepository.member_users(db, project_id)
+        return Board(project=project, members=members, columns=columns)
+
+
+AsyncProjectService = AsyncFacade(ProjectService)
@@ -0,0 +1,111 @@
+"""Streaming task exports.
+
+An export can cover a whole project, so rows are read through a server-side
+cursor (``yield_per``) and written out chunk by chunk as they arrive: memory
+use is bounded by the chunk size, not the project size. Each chunk loads its
+assignees with one query.
+
+The request's session is closed once the endpoint returns, before the body is
+streamed, so the stream runs on a session of its own bound to the same
+engine (or, in tests, the same connection).
+"""
+
+import csv
+import io
+from typing import AsyncIterator, Iterator, Literal
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool
+
+from app.database import AnySession
+from app.repositories.task_repository import TaskRepository
+from app.serialization import dumps
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "project_id",
+    "created_by",
+    "created_at",
+    "updated_at",
+    "assignees",
+)
+
+
+def _sync_chunks(bind, stmt: Select, chunk_size: int) -> Iterator[list[dict]]:
+    with Session(bind=bind) as session:
+        yield from TaskRepository.iter_export(session, stmt, chunk_size)
+
+
+async def _async_chunks(
+    bind, stmt: Select, chunk_size: int
+) -> AsyncIterator[list[dict]]:
+    async with AsyncSession(bind=bind) as session:
+        result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            assignee_rows = await session.execute(
+                TaskRepository.export_assignees_statement([row.id for row in rows])
+            )
+            yield TaskRepository.export_chunk(rows, assignee_rows)
+
+
+def export_chunks(
+    db: AnySession, stmt: Select, chunk_size: int
+) -> AsyncIterator[list[dict]]:
+    """Chunks of ``TaskResponse``-shaped dicts for ``stmt``, read on a new
+    session bound like ``db``. Sync sessions are driven from the threadpool."""
+    if isinstance(db, AsyncSession):
+        return _async_chunks(db.bind, stmt, chunk_size)
+    return iterate_in_threadpool(_sync_chunks(db.get_bind(), stmt, chunk_size))
+
+
+def ndjson_chunk(tasks: list[dict]) -> bytes:
+    return b"".join(dumps(task) + b"\n" for task in tasks)
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def csv_chunk(tasks: list[dict]) -> bytes:
+    # Assignees are written as usernames joined by ";", which is what the
+    # task import accepts back.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for task in tasks:
+        row = [_csv_value(task[column]) for column in CSV_COLUMNS[:-1]]
+        row.append(";".join(a["username"] for a in task["assignees"]))
+        writer.writerow(row)
+    return buffer.getvalue().encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+async def stream_export(
+    db: AnySession, stmt: Select, fmt: ExportFormat, chunk_size: int
+) -> AsyncIterator[bytes]:
+    """The export body, one encoded chunk at a time."""
+    encode = ndjson_chunk
+    if fmt == "csv":
+        encode = csv_chunk
+        yield csv_header()
+    async for tasks in export_chunks(db, stmt, chunk_size):
+        yield encode(tasks)
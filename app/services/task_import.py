@@ -0,0 +1,251 @@
+"""Bulk task import from CSV or NDJSON.
+
+Records are read lazily and handled ``TASK_IMPORT_CHUNK_SIZE`` at a time: each
+chunk is validated with the ``TaskCreate`` rules, resolves all of its
+assignees (by username or email) with one query, checks their membership with
+another, and is written in one transaction. Imports are therefore not atomic:
+every chunk that has been reported as processed is committed, and invalid rows
+are skipped and reported, not fatal.
+
+Accepted fields are ``title``, ``description``, ``status``, ``priority``,
+``due_date`` and ``assignees``; anything else (such as the ids and timestamps
+in an export) is ignored. In CSV, ``assignees`` is a ``;``-separated list and
+empty cells mean "not set". In NDJSON it is a list of usernames/emails or of
+objects carrying a ``username``, so both export formats import unchanged.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, Literal, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import AnySession, AsyncFacade
+from app.events import publish_event
+from app.exceptions import AppException, BadRequestException
+from app.models.user import User
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskCreate
+from app.services.project_access import get_project_access
+from app.services.task_service import TaskService
+
+ImportFormat = Literal["ndjson", "csv"]
+
+TASK_FIELDS = ("title", "description", "status", "priority", "due_date")
+
+# Uploads larger than this are spooled to disk while they arrive.
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+@dataclass
+class ImportRecord:
+    row: int
+    data: Optional[dict] = None
+    parse_error: Optional[str] = None
+
+
+@dataclass
+class ImportProgress:
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+
+
+@dataclass
+class ChunkResult:
+    imported: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+def _ndjson_records(stream: TextIO) -> Iterator[ImportRecord]:
+    row = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield ImportRecord(row, parse_error=f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRecord(row, parse_error="Each line must be a JSON object")
+            continue
+        yield ImportRecord(row, data)
+
+
+def _csv_records(stream: TextIO) -> Iterator[ImportRecord]:
+    for row, data in enumerate(csv.DictReader(stream), start=1):
+        # Empty cells fall back to the TaskCreate defaults.
+        yield ImportRecord(row, {k: v for k, v in data.items() if k and v != ""})
+
+
+def read_records(stream: TextIO, fmt: ImportFormat) -> Iterator[ImportRecord]:
+    """Parse ``stream`` lazily; ``row`` counts data records from 1, skipping
+    the CSV header and blank NDJSON lines."""
+    if fmt == "csv":
+        return _csv_records(stream)
+    return _ndjson_records(stream)
+
+
+def _assignee_logins(value) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [login.strip() for login in value.split(";") if login.strip()]
+    if not isinstance(value, list):
+        raise BadRequestException("assignees must be a list")
+    logins = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get("username") or item.get("email")
+        if not isinstance(item, str) or not item:
+            raise BadRequestException("assignees must be usernames or emails")
+        logins.append(item)
+    return logins
+
+
+def _validation_error(exc: ValidationError) -> AppException:
+    details = [
+        {"field": ".".join(map(str, error["loc"])), "message": error["msg"]}
+        for error in exc.errors()
+    ]
+    message = "; ".join(f"{d['field']}: {d['message']}" for d in details)
+    return AppException(400, "validation_error", message, details)
+
+
+def _row_error(record: ImportRecord, exc: AppException) -> dict:
+    return {
+        "row": record.row,
+        "code": exc.code,
+        "message": exc.message,
+        "details": exc.details,
+        "record": record.data,
+    }
+
+
+class TaskImportService:
+    @staticmethod
+    def check_access(db: Session, project_id: int, user: User) -> None:
+        # Importing is creating tasks in bulk: the same members may do it.
+        get_project_access(db, project_id, user)
+
+    @staticmethod
+    def _validate(record: ImportRecord) -> tuple[TaskCreate, list[str]]:
+        if record.parse_error:
+            raise BadRequestException(record.parse_error)
+        fields = {k: record.data[k] for k in TASK_FIELDS if k in record.data}
+        try:
+            task = TaskCreate(**fields)
+        except ValidationError as exc:
+            raise _validation_error(exc)
+        TaskService._check_due_date(task.due_date)
+        return task, list(dict.fromkeys(_assignee_logins(record.data.get("assignees"))))
+
+    @staticmethod
+    def import_chunk(
+        db: Session, project_id: int, user_id: int, records: list[ImportRecord]
+    ) -> ChunkResult:
+        """Validate and write one chunk of records; invalid rows are returned
+        as errors and the rest are inserted together."""
+        result = ChunkResult()
+        valid: list[tuple[ImportRecord, TaskCreate, list[str]]] = []
+        for record in records:
+            try:
+                valid.append((record, *TaskImportService._validate(record)))
+            except AppException as exc:
+                result.errors.append(_row_error(record, exc))
+
+        logins = list({login for _, _, task_logins in valid for login in task_logins})
+        user_ids = UserRepository.ids_by_login(db, logins)
+        members = ProjectRepository.member_user_ids(
+            db, project_id, list(set(user_ids.values()))
+        )
+
+        items = []
+        for record, task, task_logins in valid:
+            unknown = [login for login in task_logins if login not in user_ids]
+            try:
+                if unknown:
+                    raise BadRequestException(
+                        f"Unknown assignees: {', '.join(unknown)}"
+                    )
+                assignee_ids = list(
+                    dict.fromkeys(user_ids[name] for name in task_logins)
+                )
+                TaskService._require_members(members, assignee_ids)
+            except AppException as exc:
+                result.errors.append(_row_error(record, exc))
+                continue
+            items.append((task.model_dump(exclude={"assignee_ids"}), assignee_ids))
+
+        result.imported = TaskRepository.import_many(db, project_id, items, user_id)
+        if result.imported:
+            publish_event(project_id, "tasks.imported", {"count": result.imported})
+        return result
+
+
+AsyncTaskImportService = AsyncFacade(TaskImportService)
+
+
+async def spool_upload(chunks: AsyncIterator[bytes]) -> tempfile.SpooledTemporaryFile:
+    """Copy an upload into a temporary file as it arrives, so memory stays
+    bounded by ``SPOOL_MAX_BYTES`` whatever its size. Rewound on return."""
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    async for data in chunks:
+        await run_in_threadpool(upload.write, data)
+    upload.seek(0)
+    return upload
+
+
+def open_text(upload) -> TextIO:
+    # newline="" lets the csv module handle line breaks inside quoted fields.
+    return io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+
+
+async def run_import(
+    db: AnySession,
+    project_id: int,
+    user: User,
+    stream: TextIO,
+    fmt: ImportFormat,
+    chunk_size: int,
+    on_error: Callable[[dict], None],
+    on_progress: Optional[Callable[[ImportProgress], None]] = None,
+) -> ImportProgress:
+    """Import every record in ``stream`` chunk by chunk, reporting each row
+    error to ``on_error`` and the running totals to ``on_progress``. The
+    caller checks access first, with :meth:`TaskImportService.check_access`."""
+    records = read_records(stream, fmt)
+    progress = ImportProgress()
+    while True:
+        # Reading and parsing may touch disk, so it stays off the event loop.
+        try:
+            chunk = await run_in_threadpool(lambda: list(islice(records, chunk_size)))
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise AppException(
+                400,
+                "invalid_upload",
+                f"Could not read the upload after row {progress.processed}: {exc}",
+                details=asdict(progress),
+            )
+        if not chunk:
+            return progress
+        result = await AsyncTaskImportService.import_chunk(
+            db, project_id, user.id, chunk
+        )
+        for error in result.errors:
+            on_error(error)
+        progress.processed += len(chunk)
+        progress.imported += result.imported
+        progress.failed += len(result.errors)
+        if on_progress is not None:
+            on_progress(progress)
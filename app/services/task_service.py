@@ -1,30 +1,151 @@
+from sqlalchemy import Select
 from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import date
-from app.models.user import User, UserRole
+from dataclasses import dataclass
+from typing import Callable, Optional
+from datetime import date, datetime, timedelta, timezone
+from app.models.user import User
 from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.tombstone import Tombstone
+from app.repositories.change_log_repository import ChangeLogRepository
 from app.repositories.task_repository import TaskRepository
+from app.repositories.pagination import IncludeTotal, decode_cursor, encode_cursor
 from app.repositories.project_repository import ProjectRepository
-from app.repositories.assignment_repository import AssignmentRepository
-from app.exceptions import NotFoundException, ForbiddenException, BadRequestException
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.config import settings
+from app.exceptions import (
+    AppException,
+    BatchFailedException,
+    NotFoundException,
+    ForbiddenException,
+    BadRequestException,
+    GoneException,
+)
+from app.schemas.task import (
+    TaskBatchUpdateItem,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskUpdate,
+)
+from app.services.project_access import ProjectAccess, get_project_access
+from app.database import AsyncFacade
+from app.events import publish_event
+from app.serialization import task_payload
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    task_id: Optional[int] = None
+    task: Optional[Task] = None
+    error: Optional[AppException] = None
+
+
+@dataclass
+class TaskChanges:
+    tasks: list[Task]
+    deleted_tasks: list[Tombstone]
+    deleted_assignments: list[Tombstone]
+    next_cursor: str
+    has_more: bool
+
+
+Position = tuple[datetime, int]
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC datetimes.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def encode_changes_cursor(tasks: Position, tombstones: Position) -> str:
+    return ".".join(
+        (
+            encode_cursor("updated_at", "asc", *tasks),
+            encode_cursor("deleted_at", "asc", *tombstones),
+        )
+    )
+
+
+def decode_changes_cursor(cursor: str) -> tuple[Position, Position]:
+    parts = cursor.split(".")
+    if len(parts) != 2:
+        raise BadRequestException("Invalid cursor")
+    tasks = decode_cursor(parts[0], "updated_at", "asc")
+    tombstones = decode_cursor(parts[1], "deleted_at", "asc")
+    for value, _ in (tasks, tombstones):
+        if not isinstance(value, datetime):
+            raise BadRequestException("Invalid cursor")
+    return (_utc(tasks[0]), tasks[1]), (_utc(tombstones[0]), tombstones[1])
 
 
 class TaskService:
     @staticmethod
     def _get_project_and_check_membership(db: Session, project_id: int, user: User):
-        from app.services.project_service import ProjectService
+        return get_project_access(db, project_id, user)
 
-        return ProjectService._get_accessible_project(db, project_id, user)
+    @staticmethod
+    def _check_assignees_are_members(
+        db: Session, project_id: int, assignee_ids: list[int]
+    ) -> None:
+        if not assignee_ids:
+            return
+        members = ProjectRepository.member_user_ids(db, project_id, assignee_ids)
+        TaskService._require_members(members, assignee_ids)
+
+    @staticmethod
+    def _require_members(members: set[int], assignee_ids: list[int]) -> None:
+        if not members.issuperset(assignee_ids):
+            raise ForbiddenException(
+                "not_a_member", "User must be a project member to be assigned"
+            )
+
+    @staticmethod
+    def _check_due_date(due_date: Optional[date]) -> None:
+        if due_date and due_date < date.today():
+            raise BadRequestException("due_date must not be in the past")
+
+    @staticmethod
+    def _check_can_update(access: ProjectAccess, task: Task, user: User) -> None:
+        is_creator = task.created_by == user.id
+        # Assignments are already loaded with the task.
+        is_assignee = any(a.user_id == user.id for a in task.assignments)
+        if not (access.can_manage or is_creator or is_assignee):
+            raise ForbiddenException(
+                "permission_denied", "You don't have permission to update this task"
+            )
+
+    @staticmethod
+    def _check_can_delete(access: ProjectAccess, task: Task, user: User) -> None:
+        if not (access.can_manage or task.created_by == user.id):
+            raise ForbiddenException(
+                "permission_denied",
+                "Only project owners or task creators can delete tasks",
+            )
+
+    @staticmethod
+    def _assignee_diff(
+        task: Task, assignee_ids: Optional[list[int]]
+    ) -> tuple[list[int], list[int]]:
+        """``(assign, unassign)`` turning the task's assignees into
+        ``assignee_ids``; unchanged assignees keep their row and cost no writes."""
+        if assignee_ids is None:
+            return [], []
+        current = {a.user_id for a in task.assignments}
+        wanted = list(dict.fromkeys(assignee_ids))
+        assign = [uid for uid in wanted if uid not in current]
+        return assign, sorted(current.difference(wanted))
 
     @staticmethod
     def create_task(db: Session, project_id: int, user: User, data: TaskCreate) -> Task:
         TaskService._get_project_and_check_membership(db, project_id, user)
-        if data.due_date and data.due_date < date.today():
-            raise BadRequestException("due_date must not be in the past")
+        TaskService._check_due_date(data.due_date)
+
+        assignee_ids = list(dict.fromkeys(data.assignee_ids or []))
+        TaskService._check_assignees_are_members(db, project_id, assignee_ids)
 
         task = TaskRepository.create(
             db,
+            assignee_ids=assignee_ids,
+            assigned_by=user.id,
             title=data.title,
             description=data.description,
             status=data.status,
@@ -33,14 +154,7 @@ class TaskService:
             project_id=project_id,
             created_by=user.id,
         )
-
-        # Create assignments if provided
-        if data.assignee_ids:
-            for assignee_id in data.assignee_ids:
-                AssignmentRepository.create(db, task.id, assignee_id, user.id)
-            # Refresh task to include assignments
-            task = TaskRepository.get_by_id(db, task.id)
-
+        publish_event(project_id, "task.created", task_payload(task))
         return task
 
     @staticmethod
@@ -68,10 +182,14 @@ class TaskService:
         sort_dir: str = "desc",
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
     ):
         TaskService._get_project_and_check_membership(db, project_id, user)
         if due_date_from and due_date_to and due_date_from > due_date_to:
             raise BadRequestException("due_date_from must not be after due_date_to")
+        if sort_by == "relevance" and not q:
+            raise BadRequestException("sort_by=relevance requires q")
         return TaskRepository.list_for_project(
             db,
             project_id,
@@ -87,66 +205,288 @@ class TaskService:
             sort_dir=sort_dir,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
+
+    @staticmethod
+    def export_statement(
+        db: Session,
+        project_id: int,
+        user: User,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        assignee_id: Optional[int] = None,
+        due_date_from: Optional[date] = None,
+        due_date_to: Optional[date] = None,
+        is_overdue: Optional[bool] = None,
+        created_by: Optional[int] = None,
+        q: Optional[str] = None,
+    ) -> Select:
+        """Check access and build the export query up front, so a forbidden or
+        invalid export fails before any of the response has been sent."""
+        TaskService._get_project_and_check_membership(db, project_id, user)
+        if due_date_from and due_date_to and due_date_from > due_date_to:
+            raise BadRequestException("due_date_from must not be after due_date_to")
+        return TaskRepository.export_statement(
+            db,
+            project_id,
+            q=q,
+            status=status,
+            priority=priority,
+            assignee_id=assignee_id,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            is_overdue=is_overdue,
+            created_by=created_by,
         )
 
     @staticmethod
     def update_task(
         db: Session, project_id: int, task_id: int, user: User, data: TaskUpdate
     ) -> Task:
-        project = TaskService._get_project_and_check_membership(db, project_id, user)
+        access = TaskService._get_project_and_check_membership(db, project_id, user)
         task = TaskRepository.get_by_id(db, task_id)
         if not task or task.project_id != project_id:
             raise NotFoundException("Task not found")
 
-        is_owner = project.owner_id == user.id
-        is_creator = task.created_by == user.id
-        is_admin = user.role == UserRole.admin
-        is_assignee = AssignmentRepository.get_by_task_and_user(db, task_id, user.id) is not None
-
-        if is_admin or is_owner or is_creator or is_assignee:
-            # Full update allowed
-            updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
-        else:
-            raise ForbiddenException(
-                "permission_denied", "You don't have permission to update this task"
-            )
-
-        # Handle assignee_ids separately
-        assignee_ids = updates.pop("assignee_ids", None)
-
-        if updates:
-            task = TaskRepository.update(db, task, **updates)
+        TaskService._check_can_update(access, task, user)
+        updates = data.model_dump(exclude_unset=True)
 
-        # Update assignments if assignee_ids was provided
-        if assignee_ids is not None:
-            # Delete existing assignments
-            existing_assignments = AssignmentRepository.list_for_task(db, task_id)
-            for assignment in existing_assignments:
-                AssignmentRepository.delete(db, assignment)
-
-            # Create new assignments
-            for user_id in assignee_ids:
-                AssignmentRepository.create(db, task_id, user_id, user.id)
+        assign, unassign = TaskService._assignee_diff(
+            task, updates.pop("assignee_ids", None)
+        )
+        TaskService._check_assignees_are_members(db, project_id, assign)
 
+        if not (updates or assign or unassign):
+            return task
+        task = TaskRepository.update(
+            db, task, assign=assign, unassign=unassign, assigned_by=user.id, **updates
+        )
+        publish_event(project_id, "task.updated", task_payload(task))
         return task
 
     @staticmethod
     def delete_task(db: Session, project_id: int, task_id: int, user: User) -> None:
-        project = TaskService._get_project_and_check_membership(db, project_id, user)
+        access = TaskService._get_project_and_check_membership(db, project_id, user)
         task = TaskRepository.get_by_id(db, task_id)
         if not task or task.project_id != project_id:
             raise NotFoundException("Task not found")
 
-        is_owner = project.owner_id == user.id
-        is_creator = task.created_by == user.id
-        is_admin = user.role == UserRole.admin
+        TaskService._check_can_delete(access, task, user)
+        TaskRepository.delete(db, task)
+        publish_event(project_id, "task.deleted", {"id": task_id})
 
-        if not (is_admin or is_owner or is_creator):
-            raise ForbiddenException(
-                "permission_denied",
-                "Only project owners or task creators can delete tasks",
+    @staticmethod
+    def _run_batch(
+        items: list, mode: str, check: Callable[[int, object], None]
+    ) -> tuple[list[BatchItemResult], list[BatchItemResult]]:
+        """Validate every item with ``check``; return ``(results, accepted)``.
+
+        In atomic mode any failure aborts the batch before anything is written.
+        """
+        if len(items) > settings.TASK_BATCH_MAX_ITEMS:
+            raise BadRequestException(
+                f"At most {settings.TASK_BATCH_MAX_ITEMS} operations per batch"
             )
-        TaskRepository.delete(db, task)
+        results, accepted = [], []
+        for index, item in enumerate(items):
+            result = BatchItemResult(index=index)
+            results.append(result)
+            try:
+                check(index, item)
+            except AppException as exc:
+                result.error = exc
+            else:
+                accepted.append(result)
+        if mode == "atomic" and len(accepted) != len(results):
+            raise BatchFailedException(
+                [
+                    {"index": r.index, "code": r.error.code, "message": r.error.message}
+                    for r in results
+                    if r.error is not None
+                ]
+            )
+        return results, accepted
+
+    @staticmethod
+    def batch_create(
+        db: Session,
+        project_id: int,
+        user: User,
+        items: list[TaskCreate],
+        mode: str = "atomic",
+    ) -> list[BatchItemResult]:
+        TaskService._get_project_and_check_membership(db, project_id, user)
+        assignees = [list(dict.fromkeys(item.assignee_ids or [])) for item in items]
+        members = ProjectRepository.member_user_ids(
+            db, project_id, sorted({uid for ids in assignees for uid in ids})
+        )
+
+        def check(index: int, item: TaskCreate) -> None:
+            TaskService._check_due_date(item.due_date)
+            TaskService._require_members(members, assignees[index])
+
+        results, accepted = TaskService._run_batch(items, mode, check)
+        if accepted:
+            tasks = TaskRepository.create_many(
+                db,
+                project_id,
+                [
+                    (
+                        items[r.index].model_dump(exclude={"assignee_ids"}),
+                        assignees[r.index],
+                    )
+                    for r in accepted
+                ],
+                created_by=user.id,
+            )
+            for result, task in zip(accepted, tasks):
+                result.task, result.task_id = task, task.id
+                publish_event(project_id, "task.created", task_payload(task))
+        return results
+
+    @staticmethod
+    def batch_update(
+        db: Session,
+        project_id: int,
+        user: User,
+        items: list[TaskBatchUpdateItem],
+        mode: str = "atomic",
+    ) -> list[BatchItemResult]:
+        access = TaskService._get_project_and_check_membership(db, project_id, user)
+        tasks = {
+            task.id: task
+            for task in TaskRepository.get_many(
+                db, project_id, [item.id for item in items]
+            )
+        }
+        changes = {}
+        for index, item in enumerate(items):
+            task = tasks.get(item.id)
+            if task is not None:
+                fields = item.model_dump(exclude_unset=True, exclude={"id"})
+                diff = TaskService._assignee_diff(
+                    task, fields.pop("assignee_ids", None)
+                )
+                changes[index] = (task, fields, *diff)
+        members = ProjectRepository.member_user_ids(
+            db,
+            project_id,
+            sorted({uid for _, _, assign, _ in changes.values() for uid in assign}),
+        )
+        seen = set()
+
+        def check(index: int, item: TaskBatchUpdateItem) -> None:
+            if item.id not in tasks:
+                raise NotFoundException("Task not found")
+            if item.id in seen:
+                raise BadRequestException("Task appears more than once in the batch")
+            seen.add(item.id)
+            task, _, assign, _ = changes[index]
+            TaskService._check_can_update(access, task, user)
+            TaskService._require_members(members, assign)
+
+        results, accepted = TaskService._run_batch(items, mode, check)
+        for result in accepted:
+            result.task_id = items[result.index].id
+        if accepted:
+            updated = TaskRepository.update_many(
+                db, project_id, [changes[r.index] for r in accepted], user.id
+            )
+            for result, task in zip(accepted, updated):
+                result.task = task
+                publish_event(project_id, "task.updated", task_payload(task))
+        return results
+
+    @staticmethod
+    def batch_delete(
+        db: Session,
+        project_id: int,
+        user: User,
+        task_ids: list[int],
+        mode: str = "atomic",
+    ) -> list[BatchItemResult]:
+        access = TaskService._get_project_and_check_membership(db, project_id, user)
+        tasks = {
+            task.id: task for task in TaskRepository.get_many(db, project_id, task_ids)
+        }
+        seen = set()
+
+        def check(index: int, task_id: int) -> None:
+            if task_id not in tasks or task_id in seen:
+                raise NotFoundException("Task not found")
+            seen.add(task_id)
+            TaskService._check_can_delete(access, tasks[task_id], user)
+
+        results, accepted = TaskService._run_batch(task_ids, mode, check)
+        for result in accepted:
+            result.task_id = task_ids[result.index]
+        TaskRepository.delete_many(db, project_id, [r.task_id for r in accepted])
+        for result in accepted:
+            publish_event(project_id, "task.deleted", {"id": result.task_id})
+        return results
+
+    @staticmethod
+    def list_changes(
+        db: Session, project_id: int, user: User, since: Optional[str], limit: int
+    ) -> TaskChanges:
+        """Tasks created or updated and tasks and assignments deleted after
+        the ``since`` cursor, at most ``limit`` of each; without ``since``,
+        every task. Poll again with ``next_cursor``, at once while
+        ``has_more``.
+
+        Only writes older than ``CHANGES_SETTLE_SECONDS`` are reported, so a
+        transaction that stamped its rows earlier but committed later than
+        others is not skipped.
+        """
+        TaskService._get_project_and_check_membership(db, project_id, user)
+        now = datetime.now(timezone.utc)
+        until = now - timedelta(seconds=settings.CHANGES_SETTLE_SECONDS)
+        if since is None:
+            # Deletions before a first sync are of nothing the client has.
+            task_pos, tombstone_pos = None, (until, 0)
+        else:
+            task_pos, tombstone_pos = decode_changes_cursor(since)
+            retention = timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+            if tombstone_pos[0] < now - retention:
+                raise GoneException(
+                    "cursor_expired",
+                    "Deletions since this cursor are no longer kept; "
+                    "sync again without since",
+                )
+
+        tasks = TaskRepository.changed_since(db, project_id, task_pos, until, limit + 1)
+        tombstones = ChangeLogRepository.tombstones_after(
+            db, project_id, tombstone_pos, until, limit + 1
+        )
+
+        def advance(position, rows, key) -> Position:
+            caught_up = len(rows) <= limit
+            rows = rows[:limit]
+            if rows:
+                position = (_utc(key(rows[-1])), rows[-1].id)
+            # Start later polls at ``until`` once caught up, so a quiet
+            # project's cursor does not age past the tombstone retention.
+            if caught_up and (position is None or position[0] < until):
+                position = (until, 0)
+            return position
+
+        has_more = len(tasks) > limit or len(tombstones) > limit
+        task_pos = advance(task_pos, tasks, lambda t: t.updated_at)
+        tombstone_pos = advance(tombstone_pos, tombstones, lambda t: t.deleted_at)
+        tasks, tombstones = tasks[:limit], tombstones[:limit]
+        return TaskChanges(
+            tasks=tasks,
+            deleted_tasks=[t for t in tombstones if t.user_id is None],
+            deleted_assignments=[t for t in tombstones if t.user_id is not None],
+            next_cursor=encode_changes_cursor(task_pos, tombstone_pos),
+            has_more=has_more,
+        )
+
+    @staticmethod
+    def my_tasks_version(db: Session, user: User) -> list[tuple[int, int]]:
+        return TaskRepository.assigned_project_versions(db, user.id)
 
     @staticmethod
     def list_my_tasks(
@@ -158,6 +498,8 @@ class TaskService:
         sort_dir: str = "desc",
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
     ):
         return TaskRepository.list_assigned_to_user(
             db,
@@ -168,4 +510,44 @@ class TaskService:
             sort_dir=sort_dir,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            include_total=include_total,
         )
+
+    @staticmethod
+    def bulk_update(
+        db: Session, project_id: int, user: User, data: TaskBulkUpdate
+    ) -> int:
+        """Apply ``data.changes`` to every task matching ``data.filter``;
+        returns how many tasks changed (or would change, for a dry run)."""
+        access = TaskService._get_project_and_check_membership(db, project_id, user)
+        if not access.can_manage:
+            raise ForbiddenException(
+                "permission_denied", "Only project owners can bulk update tasks"
+            )
+        values = data.changes.model_dump(exclude_none=True)
+        if not values:
+            raise BadRequestException("No changes given")
+        filters = data.filter
+        if (
+            filters.due_date_from
+            and filters.due_date_to
+            and filters.due_date_from > filters.due_date_to
+        ):
+            raise BadRequestException("due_date_from must not be after due_date_to")
+        count = TaskRepository.update_where(
+            db,
+            project_id,
+            values,
+            dry_run=data.dry_run,
+            **data.filter.model_dump(),
+        )
+        if count and not data.dry_run:
+            # Too many tasks to describe one by one: clients reload.
+            publish_event(
+                project_id, "tasks.bulk_updated", {"count": count, "changes": values}
+            )
+        return count
+
+
+AsyncTaskService = AsyncFacade(TaskService)
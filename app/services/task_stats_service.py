@@ -0,0 +1,110 @@
+"""Reconciliation of the per-project task counters.
+
+Every task write keeps ``project_task_stats`` in step in its own transaction,
+so the counters only drift when rows change behind the application's back,
+through manual SQL or a restored backup. The reconciliation recounts
+``tasks`` a batch of projects at a time, reports each project whose counters
+differ and, unless it is a dry run, stores the recount in the same
+transaction.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.repositories.task_stats_repository import COUNTER_COLUMNS, TaskStatsRepository
+
+
+@dataclass
+class ProjectDrift:
+    project_id: int
+    # Counter columns that were wrong, as (stored, actual).
+    columns: dict[str, tuple[int, int]] = field(default_factory=dict)
+    # Due dates whose open-task count was wrong.
+    due_dates: int = 0
+
+
+@dataclass
+class ReconcileProgress:
+    projects: int = 0
+    drifted: int = 0
+    orphans: int = 0
+
+
+class TaskStatsService:
+    @staticmethod
+    def reconcile_batch(
+        db: Session, project_ids: list[int], fix: bool = True
+    ) -> list[ProjectDrift]:
+        """Recount the projects' tasks and compare with their counters,
+        storing the recount for those that drifted when ``fix``. The caller
+        holds the project rows and commits."""
+        stored_rows, stored_due = TaskStatsRepository.stored(db, project_ids)
+        rows, due = TaskStatsRepository.recount(db, project_ids)
+        zeros = dict.fromkeys(COUNTER_COLUMNS, 0)
+        drifts = []
+        for project_id in project_ids:
+            stored = stored_rows.get(project_id, zeros)
+            actual = rows.get(project_id, zeros)
+            drift = ProjectDrift(
+                project_id,
+                columns={
+                    c: (stored[c], actual[c])
+                    for c in COUNTER_COLUMNS
+                    if stored[c] != actual[c]
+                },
+            )
+            for key in {*stored_due, *due}:
+                if key[0] == project_id and stored_due.get(key) != due.get(key):
+                    drift.due_dates += 1
+            if drift.columns or drift.due_dates:
+                drifts.append(drift)
+        if fix and drifts:
+            drifted = [drift.project_id for drift in drifts]
+            TaskStatsRepository.replace(
+                db,
+                drifted,
+                (
+                    {pid: row for pid, row in rows.items() if pid in drifted},
+                    {key: n for key, n in due.items() if key[0] in drifted},
+                ),
+            )
+        return drifts
+
+
+def reconcile(
+    db: Session,
+    batch_size: int,
+    fix: bool = True,
+    on_drift: Optional[Callable[[ProjectDrift], None]] = None,
+    on_progress: Optional[Callable[[ReconcileProgress], None]] = None,
+) -> ReconcileProgress:
+    """Reconcile every project's counters, ``batch_size`` projects per
+    transaction, then delete the counters of projects that no longer
+    exist. Each drifted project is reported to ``on_drift`` and the running
+    totals to ``on_progress``."""
+    progress = ReconcileProgress()
+    after_id = 0
+    while True:
+        # Locking the projects keeps task writes from landing between the
+        # recount and its storage; they wait for the batch to commit.
+        project_ids = TaskStatsRepository.project_ids_after(
+            db, after_id, batch_size, lock=fix
+        )
+        if not project_ids:
+            break
+        drifts = TaskStatsService.reconcile_batch(db, project_ids, fix)
+        db.commit()
+        for drift in drifts:
+            if on_drift is not None:
+                on_drift(drift)
+        progress.projects += len(project_ids)
+        progress.drifted += len(drifts)
+        if on_progress is not None:
+            on_progress(progress)
+        after_id = project_ids[-1]
+    if fix:
+        progress.orphans = TaskStatsRepository.delete_orphans(db)
+        db.commit()
+    return progress
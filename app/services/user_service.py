@@ -1,6 +1,9 @@
+from sqlalchemy import inspect
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
+from app.repositories.pagination import IncludeTotal
 from app.services.auth_service import AuthService
 from app.exceptions import (
     ConflictException,
@@ -9,18 +12,32 @@ from app.exceptions import (
     ForbiddenException,
 )
 from app.schemas.user import UpdateProfileRequest
+from app.database import AsyncFacade, AnySession, run_db
 
 
 class UserService:
     @staticmethod
-    def create_user(db: Session, username: str, email: str, password: str) -> User:
+    def _check_registration_available(db: Session, username: str, email: str) -> None:
         if UserRepository.get_by_email(db, email):
             raise ConflictException("duplicate_email", "Email already registered")
         if UserRepository.get_by_username(db, username):
             raise ConflictException("duplicate_username", "Username already taken")
-        hashed = AuthService.hash_password(password)
-        return UserRepository.create(
-            db, username=username, email=email, hashed_password=hashed
+        # End the read transaction so the pooled connection is returned while
+        # the password is hashed.
+        db.commit()
+
+    @staticmethod
+    async def create_user(
+        db: AnySession, username: str, email: str, password: str
+    ) -> User:
+        await run_db(db, UserService._check_registration_available, username, email)
+        hashed = await AuthService.hash_password_async(password)
+        return await run_db(
+            db,
+            UserRepository.create,
+            username=username,
+            email=email,
+            hashed_password=hashed,
         )
 
     @staticmethod
@@ -28,14 +45,32 @@ class UserService:
         user = UserRepository.get_by_id(db, user_id)
         if not user:
             raise NotFoundException("User not found")
+        return UserService.get_profile(db, user)
+
+    @staticmethod
+    def get_profile(db: Session, user: User) -> User:
+        # The authenticated user may be a cached principal with only the
+        # auth columns loaded; load the rest before it is serialized.
+        if inspect(user).expired_attributes:
+            db.refresh(user)
         return user
 
     @staticmethod
-    def list_users(db: Session, limit: int, offset: int):
-        return UserRepository.list_all(db, limit=limit, offset=offset)
+    def list_users(
+        db: Session,
+        limit: int,
+        offset: int,
+        cursor: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+    ):
+        return UserRepository.list_all(
+            db, limit=limit, offset=offset, cursor=cursor, include_total=include_total
+        )
 
     @staticmethod
-    def update_profile(db: Session, user: User, data: UpdateProfileRequest) -> User:
+    def _profile_field_updates(
+        db: Session, user: User, data: UpdateProfileRequest
+    ) -> tuple[dict, str]:
         updates = {}
         if data.username and data.username != user.username:
             if UserRepository.get_by_username(db, data.username):
@@ -45,22 +80,36 @@ class UserService:
             if UserRepository.get_by_email(db, data.email):
                 raise ConflictException("duplicate_email", "Email already registered")
             updates["email"] = data.email
+        # Read here, on the worker thread, so the async caller never lazy-loads.
+        return updates, user.hashed_password
+
+    @staticmethod
+    async def update_profile(
+        db: AnySession, user: User, data: UpdateProfileRequest
+    ) -> User:
+        updates, current_hash = await run_db(
+            db, UserService._profile_field_updates, user, data
+        )
         if data.new_password:
             if not data.current_password:
                 raise BadRequestException(
                     "Current password is required to set a new password"
                 )
-            if not AuthService.verify_password(
-                data.current_password, user.hashed_password
+            if not await AuthService.verify_password_async(
+                data.current_password, current_hash
             ):
                 raise BadRequestException("Current password is incorrect")
-            if AuthService.verify_password(data.new_password, user.hashed_password):
+            if await AuthService.verify_password_async(data.new_password, current_hash):
                 raise BadRequestException(
                     "New password must differ from current password"
                 )
-            updates["hashed_password"] = AuthService.hash_password(data.new_password)
+            updates["hashed_password"] = await AuthService.hash_password_async(
+                data.new_password
+            )
         if updates:
-            return UserRepository.update(db, user, **updates)
+            user = await run_db(db, UserRepository.update, user, **updates)
+            if "hashed_password" in updates:
+                AuthService.invalidate_principal(user.id)
         return user
 
     @staticmethod
@@ -68,14 +117,18 @@ class UserService:
         user = UserRepository.get_by_id(db, user_id)
         if not user:
             raise NotFoundException("User not found")
-        return UserRepository.update(db, user, is_active=False)
+        user = UserRepository.update(db, user, is_active=False)
+        AuthService.invalidate_principal(user_id)
+        return user
 
     @staticmethod
     def activate_user(db: Session, user_id: int) -> User:
         user = UserRepository.get_by_id(db, user_id)
         if not user:
             raise NotFoundException("User not found")
-        return UserRepository.update(db, user, is_active=True)
+        user = UserRepository.update(db, user, is_active=True)
+        AuthService.invalidate_principal(user_id)
+        return user
 
     @staticmethod
     def search_users(db: Session, q: str) -> list[User]:
@@ -87,3 +140,7 @@ class UserService:
         if not user:
             raise NotFoundException("User not found")
         UserRepository.delete(db, user)
+        AuthService.invalidate_principal(user_id)
+
+
+AsyncUserService = AsyncFacade(UserService)
@@ -0,0 +1,150 @@
+"""Login-storm benchmark.
+
+Saturates /auth/login with concurrent logins while a probe client keeps
+calling a non-auth endpoint (GET /projects), and reports the probe's latency
+percentiles for each password hashing executor mode. With the legacy
+``shared`` mode bcrypt occupies the request threadpool and the probe's p99
+climbs; with ``process`` it should stay close to the idle baseline.
+
+Runs in-process against a throwaway SQLite database:
+
+    python benchmarks/login_storm.py --duration 10 --storm 64 --modes shared process
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="login_storm_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.hashing import PasswordHashExecutor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import auth_service  # noqa: E402
+
+PASSWORD = "Bench1234"
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def setup_users(count: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    hashed = auth_service.AuthService.hash_password(PASSWORD)
+    with SessionLocal() as db:
+        for i in range(count):
+            db.add(
+                User(
+                    username=f"bench{i}",
+                    email=f"bench{i}@example.com",
+                    hashed_password=hashed,
+                )
+            )
+        db.commit()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(client, headers, stop: asyncio.Event, latencies: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        resp = await client.get("/api/v1/projects", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+
+
+async def login_loop(client, index: int, stop: asyncio.Event, outcomes: dict):
+    body = {"email": f"bench{index}@example.com", "password": PASSWORD}
+    while not stop.is_set():
+        resp = await client.post("/api/v1/auth/login", json=body)
+        outcomes[resp.status_code] = outcomes.get(resp.status_code, 0) + 1
+        if resp.status_code == 503:
+            await asyncio.sleep(0.01)
+
+
+async def run_phase(mode: str, storm: int, duration: float, workers: int) -> dict:
+    auth_service.password_hasher = PasswordHashExecutor(
+        mode=mode,
+        workers=workers,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+        rounds=settings.BCRYPT_ROUNDS,
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        resp = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "bench0@example.com", "password": PASSWORD},
+        )
+        headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+        stop = asyncio.Event()
+        latencies: list[float] = []
+        outcomes: dict[int, int] = {}
+        tasks = [asyncio.create_task(probe(client, headers, stop, latencies))]
+        tasks += [
+            asyncio.create_task(login_loop(client, 1 + i, stop, outcomes))
+            for i in range(storm)
+        ]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+    auth_service.password_hasher.shutdown()
+    return {
+        "mode": mode,
+        "storm": storm,
+        "probe_requests": len(latencies),
+        "p50_ms": statistics.median(latencies) if latencies else float("nan"),
+        "p99_ms": percentile(latencies, 99),
+        "logins_ok": outcomes.get(200, 0),
+        "logins_rejected": outcomes.get(503, 0),
+    }
+
+
+async def main(args) -> None:
+    setup_users(args.storm + 1)
+    rows = []
+    for mode in args.modes:
+        rows.append(await run_phase(mode, 0, args.duration, args.workers))
+        rows.append(await run_phase(mode, args.storm, args.duration, args.workers))
+    print(
+        f"{'mode':<8} {'storm':>5} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'logins':>7} {'503s':>6}"
+    )
+    for r in rows:
+        print(
+            f"{r['mode']:<8} {r['storm']:>5} {r['probe_requests']:>7} "
+            f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['logins_ok']:>7} "
+            f"{r['logins_rejected']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--storm", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["shared", "process"],
+        choices=["shared", "thread", "process"],
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""List serialization benchmark.
+
+Times one task page through the previous response path (hand-built pydantic
+models, FastAPI's ``response_model`` validation and stdlib ``JSONResponse``)
+against the single-pass path in ``app.serialization``, for several page
+sizes. Rows are built in memory, so only serialization is measured:
+
+    python benchmarks/serialization.py --sizes 20 200 500 --repeat 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.models.assignment import Assignment  # noqa: E402
+from app.models.task import Task, TaskPriority, TaskStatus  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.pagination import Page  # noqa: E402
+from app.routers.tasks import _build_task_response  # noqa: E402
+from app.schemas.common import PaginatedResponse  # noqa: E402
+from app.schemas.task import TaskResponse  # noqa: E402
+from app.serialization import dumps, orjson, page_payload, task_payload  # noqa: E402
+
+FIELD = create_response_field(name="bench", type_=PaginatedResponse[TaskResponse])
+
+
+def make_page(size: int) -> Page:
+    now = datetime.now(timezone.utc)
+    users = [
+        User(
+            id=i,
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            role=UserRole.user,
+            is_active=True,
+        )
+        for i in range(3)
+    ]
+    tasks = []
+    for i in range(size):
+        task = Task(
+            id=i,
+            title=f"Task {i} with a realistic title",
+            description="Some description text. " * 8,
+            status=list(TaskStatus)[i % 3],
+            priority=list(TaskPriority)[i % 3],
+            due_date=date.today() + timedelta(days=i % 30),
+            project_id=1,
+            created_by=0,
+            created_at=now,
+            updated_at=now,
+        )
+        task.assignments = [
+            Assignment(id=i * 2 + j, user_id=u.id, assignee=u)
+            for j, u in enumerate(users[: i % 3])
+        ]
+        tasks.append(task)
+    return Page(items=tasks, total=size * 10, has_more=True)
+
+
+async def old_path(page: Page) -> bytes:
+    model = PaginatedResponse.from_page(
+        page, len(page.items), 0, items=[_build_task_response(t) for t in page.items]
+    )
+    content = await serialize_response(field=FIELD, response_content=model)
+    return JSONResponse(content).body
+
+
+async def new_path(page: Page) -> bytes:
+    return dumps(page_payload(page, len(page.items), 0, map(task_payload, page.items)))
+
+
+async def timed(fn, page: Page, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn(page)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(args) -> None:
+    encoder = "orjson" if orjson is not None else "pydantic-core"
+    print(f"encoder: {encoder}")
+    print(f"{'items':>6} {'old ms':>8} {'new ms':>8} {'speedup':>8}")
+    for size in args.sizes:
+        page = make_page(size)
+        old = await timed(old_path, page, args.repeat)
+        new = await timed(new_path, page, args.repeat)
+        print(f"{size:>6} {old:>8.2f} {new:>8.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
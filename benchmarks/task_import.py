@@ -0,0 +1,135 @@
+"""Bulk task import benchmark.
+
+Generates CSV files of N tasks (a third of them with assignees, given by
+username or email) and reports import throughput in rows per second, next to
+a baseline of the same rows created one by one through ``TaskService``, as
+``POST /projects/{id}/tasks`` does:
+
+    python benchmarks/task_import.py --rows 10000 100000 --baseline-rows 1000
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set; point it
+at PostgreSQL to measure the COPY path.
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="task_import_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.project import ProjectCreate  # noqa: E402
+from app.schemas.task import TaskCreate  # noqa: E402
+from app.services.project_service import ProjectService  # noqa: E402
+from app.services.task_import import run_import  # noqa: E402
+from app.services.task_service import TaskService  # noqa: E402
+
+MEMBERS = 10
+
+
+def setup() -> tuple[User, list[User]]:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        users = [
+            User(
+                username=f"bench{i}",
+                email=f"bench{i}@example.com",
+                hashed_password="x",
+            )
+            for i in range(MEMBERS)
+        ]
+        db.add_all(users)
+        db.commit()
+        return users[0], users
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "description", "status", "priority", "assignees"])
+        for i in range(rows):
+            assignees = ""
+            if i % 3 == 0:
+                assignees = f"bench{i % MEMBERS};bench{(i + 1) % MEMBERS}@example.com"
+            writer.writerow(
+                [
+                    f"Imported task {i}",
+                    "Some description text. " * 4,
+                    ("todo", "in_progress", "done")[i % 3],
+                    ("low", "medium", "high")[i % 3],
+                    assignees,
+                ]
+            )
+
+
+def new_project(owner: User, members: list[User], name: str) -> int:
+    with SessionLocal() as db:
+        project = ProjectService.create_project(db, owner, ProjectCreate(name=name))
+        for member in members[1:]:
+            ProjectService.add_member(db, project.id, owner, member.id)
+        return project.id
+
+
+def bench_import(owner, members, rows: int, chunk_size: int) -> float:
+    path = os.path.join(_DB_DIR, f"tasks_{rows}.csv")
+    write_csv(path, rows)
+    project_id = new_project(owner, members, f"Import {rows}")
+    errors = []
+    with SessionLocal() as db, open(path, newline="") as stream:
+        start = time.perf_counter()
+        progress = asyncio.run(
+            run_import(db, project_id, owner, stream, "csv", chunk_size, errors.append)
+        )
+        elapsed = time.perf_counter() - start
+    assert progress.imported == rows, (progress, errors[:3])
+    return rows / elapsed
+
+
+def bench_baseline(owner, members, rows: int) -> float:
+    project_id = new_project(owner, members, "Baseline")
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        for i in range(rows):
+            assignee_ids = [members[i % MEMBERS].id] if i % 3 == 0 else None
+            TaskService.create_task(
+                db,
+                project_id,
+                owner,
+                TaskCreate(title=f"Created task {i}", assignee_ids=assignee_ids),
+            )
+        elapsed = time.perf_counter() - start
+    return rows / elapsed
+
+
+def main(args) -> None:
+    owner, members = setup()
+    results = []
+    if args.baseline_rows:
+        rate = bench_baseline(owner, members, args.baseline_rows)
+        results.append(("one by one", args.baseline_rows, rate))
+    for rows in args.rows:
+        rate = bench_import(owner, members, rows, args.chunk_size)
+        results.append(("import", rows, rate))
+    print(f"{'path':<11} {'rows':>8} {'rows/s':>10}")
+    for path, rows, rate in results:
+        print(f"{path:<11} {rows:>8} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--baseline-rows", type=int, default=1000)
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.TASK_IMPORT_CHUNK_SIZE
+    )
+    main(parser.parse_args())
@@ -0,0 +1,7 @@
+import apiClient from './client';
+import type { DashboardSummary } from '../types';
+
+export const dashboardApi = {
+  summary: () =>
+    apiClient.get<DashboardSummary>('/dashboard/summary').then((r) => r.data),
+};
@@ -0,0 +1,71 @@
+import { BASE_URL } from './client';
+import { authApi } from './auth';
+import type { ProjectEvent } from '../types';
+
+const DEFAULT_RETRY_MS = 3000;
+
+// Follows /projects/{id}/events until the signal aborts. EventSource cannot
+// send the Authorization header, so the stream is read with fetch; the
+// reconnect loop resumes from the last event id, as EventSource would.
+export async function subscribeProjectEvents(
+  projectId: number,
+  onEvent: (event: ProjectEvent) => void,
+  signal: AbortSignal,
+): Promise<void> {
+  let lastEventId: string | null = null;
+  let retryMs = DEFAULT_RETRY_MS;
+
+  while (!signal.aborted) {
+    try {
+      const headers: Record<string, string> = { Accept: 'text/event-stream' };
+      const token = localStorage.getItem('access_token');
+      if (token) headers.Authorization = `Bearer ${token}`;
+      if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+      const response = await fetch(`${BASE_URL}/projects/${projectId}/events`, {
+        headers,
+        signal,
+      });
+      if (response.status === 401) {
+        // Let the API client refresh the access token, then reconnect.
+        await authApi.me();
+        continue;
+      }
+      if (!response.ok || !response.body) {
+        // Deleted, or no longer visible to this user.
+        if (response.status === 403 || response.status === 404) return;
+        throw new Error(`Event stream failed: ${response.status}`);
+      }
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        let end: number;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+          const block = buffer.slice(0, end);
+          buffer = buffer.slice(end + 2);
+          let type: string | null = null;
+          let data = '';
+          for (const line of block.split('\n')) {
+            if (line.startsWith(':')) continue; // keep-alive
+            const sep = line.indexOf(': ');
+            const field = sep === -1 ? line : line.slice(0, sep);
+            const text = sep === -1 ? '' : line.slice(sep + 2);
+            if (field === 'id') lastEventId = text;
+            else if (field === 'event') type = text;
+            else if (field === 'data') data += text;
+            else if (field === 'retry') retryMs = Number(text) || retryMs;
+          }
+          if (type) onEvent({ type, data: JSON.parse(data || '{}') } as ProjectEvent);
+        }
+      }
+    } catch {
+      if (signal.aborted) return;
+    }
+    // The server ends streams periodically; reconnect after the advised delay.
+    await new Promise((resolve) => setTimeout(resolve, retryMs));
+  }
+}
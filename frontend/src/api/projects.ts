@@ -5,14 +5,27 @@ import type {
   UpdateProjectRequest,
   User,
   PaginatedResponse,
+  Board,
+  BoardFilters,
 } from '../types';
 
 export const projectsApi = {
-  list: (params?: { is_archived?: boolean; search?: string; limit?: number; offset?: number }) =>
+  list: (params?: {
+    is_archived?: boolean;
+    search?: string;
+    limit?: number;
+    offset?: number;
+    cursor?: string;
+    include_task_counts?: boolean;
+  }) =>
     apiClient.get<PaginatedResponse<Project>>('/projects', { params }).then((r) => r.data),
 
-  get: (id: number) =>
-    apiClient.get<Project>(`/projects/${id}`).then((r) => r.data),
+  get: (id: number, params?: { include_task_counts?: boolean }) =>
+    apiClient.get<Project>(`/projects/${id}`, { params }).then((r) => r.data),
+
+  // The first `limit` tasks of every status column, plus the project and its members.
+  board: (id: number, params?: BoardFilters) =>
+    apiClient.get<Board>(`/projects/${id}/board`, { params }).then((r) => r.data),
 
   create: (data: CreateProjectRequest) =>
     apiClient.post<Project>('/projects', data).then((r) => r.data),
@@ -26,8 +39,20 @@ export const projectsApi = {
   archive: (id: number) =>
     apiClient.patch<Project>(`/projects/${id}/archive`).then((r) => r.data),
 
-  getMembers: (id: number) =>
-    apiClient.get<User[]>(`/projects/${id}/members`).then((r) => r.data),
+  getMembers: async (id: number) => {
+    const members: User[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await apiClient
+        .get<PaginatedResponse<User>>(`/projects/${id}/members`, {
+          params: { limit: 100, cursor },
+        })
+        .then((r) => r.data);
+      members.push(...page.items);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return members;
+  },
 
   addMember: (projectId: number, userId: number) =>
     apiClient.post(`/projects/${projectId}/members`, { user_id: userId }).then((r) => r.data),
@@ -2,7 +2,7 @@ import apiClient from './client';
 import type { User, UpdateProfileRequest, PaginatedResponse } from '../types';
 
 export const usersApi = {
-  list: (params?: { limit?: number; offset?: number }) =>
+  list: (params?: { limit?: number; offset?: number; cursor?: string }) =>
     apiClient.get<PaginatedResponse<User>>('/users', { params }).then((r) => r.data),
 
   search: (q: string) =>
@@ -19,6 +19,9 @@ const STATUSES: TaskStatus[] = ['todo', 'in_progress', 'done'];
 
 interface KanbanBoardProps {
   tasks: Task[];
+  // Server-side column totals and cursors; without them every task is loaded.
+  columns?: Record<TaskStatus, { total: number; next_cursor: string | null }>;
+  onLoadMore?: (status: TaskStatus) => Promise<void>;
   onStatusChange: (taskId: number, newStatus: TaskStatus) => Promise<void>;
   onAddTask: (status: TaskStatus) => void;
   onEditTask: (task: Task) => void;
@@ -28,6 +31,8 @@ interface KanbanBoardProps {
 
 export function KanbanBoard({
   tasks,
+  columns,
+  onLoadMore,
   onStatusChange,
   onAddTask,
   onEditTask,
@@ -89,6 +94,9 @@ export function KanbanBoard({
             key={status}
             status={status}
             tasks={getTasksByStatus(status)}
+            total={columns?.[status].total}
+            hasMore={Boolean(columns?.[status].next_cursor)}
+            onLoadMore={onLoadMore}
             onAddTask={onAddTask}
             onEditTask={onEditTask}
             onDeleteTask={onDeleteTask}
@@ -1,5 +1,6 @@
 import { SortableContext, verticalListSortingStrategy } from '@dnd-kit/sortable';
 import { useDroppable } from '@dnd-kit/core';
+import { useState } from 'react';
 import { Plus } from 'lucide-react';
 import type { Task, TaskStatus } from '../../types';
 import { TaskCard } from './TaskCard';
@@ -7,6 +8,9 @@ import { TaskCard } from './TaskCard';
 interface KanbanColumnProps {
   status: TaskStatus;
   tasks: Task[];
+  total?: number;
+  hasMore?: boolean;
+  onLoadMore?: (status: TaskStatus) => Promise<void>;
   onAddTask: (status: TaskStatus) => void;
   onEditTask: (task: Task) => void;
   onDeleteTask: (task: Task) => void;
@@ -22,6 +26,9 @@ const columnConfig: Record<TaskStatus, { label: string; accent: string; dot: str
 export function KanbanColumn({
   status,
   tasks,
+  total,
+  hasMore = false,
+  onLoadMore,
   onAddTask,
   onEditTask,
   onDeleteTask,
@@ -30,6 +37,17 @@ export function KanbanColumn({
   const { setNodeRef, isOver } = useDroppable({ id: status });
   const { label, accent, dot } = columnConfig[status];
   const taskIds = tasks.map((t) => t.id);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const loadMore = async () => {
+    if (!onLoadMore) return;
+    setLoadingMore(true);
+    try {
+      await onLoadMore(status);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   return (
     <div className="flex flex-col w-72 flex-shrink-0">
@@ -41,7 +59,7 @@ export function KanbanColumn({
           <span className={`w-2 h-2 rounded-full ${dot}`} />
           <span className="text-slate-200 text-sm font-semibold">{label}</span>
           <span className="text-xs text-slate-500 bg-slate-700 px-1.5 py-0.5 rounded-full">
-            {tasks.length}
+            {total ?? tasks.length}
           </span>
         </div>
         <button
@@ -71,6 +89,15 @@ export function KanbanColumn({
             />
           ))}
         </SortableContext>
+        {hasMore && onLoadMore && (
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="text-xs text-slate-400 hover:text-indigo-400 py-1.5 transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading…' : `Load more (${(total ?? 0) - tasks.length})`}
+          </button>
+        )}
         {tasks.length === 0 && (
           <div className="flex-1 flex items-center justify-center">
             <p className="text-slate-600 text-xs text-center">Drop tasks here</p>
@@ -32,7 +32,7 @@ export function AdminUsersPage() {
     try {
       const data = await usersApi.list({ limit: PAGE_SIZE, offset: page * PAGE_SIZE });
       setUsers(data.items);
-      setTotal(data.total);
+      setTotal(data.total ?? 0);
     } finally {
       setLoading(false);
     }
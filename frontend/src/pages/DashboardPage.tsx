@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { FolderKanban, CheckSquare, Clock, AlertTriangle, ArrowRight } from 'lucide-react';
+import { dashboardApi } from '../api/dashboard';
 import { projectsApi } from '../api/projects';
 import { tasksApi } from '../api/tasks';
 import { useAuthStore } from '../store/authStore';
@@ -26,25 +27,19 @@ export function DashboardPage() {
   useEffect(() => {
     async function load() {
       try {
-        const [projectsData, myTasksData, overdueData] = await Promise.all([
-          projectsApi.list({ limit: 100 }),
+        const [summary, projectsData, myTasksData] = await Promise.all([
+          dashboardApi.summary(),
+          projectsApi.list({ limit: 4 }),
           tasksApi.mine({ limit: 5 }),
-          tasksApi.mine({ limit: 100 }),
         ]);
 
-        const inProgress = overdueData.items.filter((t) => t.status === 'in_progress').length;
-        const overdue = overdueData.items.filter((t) => {
-          if (!t.due_date || t.status === 'done') return false;
-          return new Date(t.due_date) < new Date();
-        }).length;
-
         setStats({
-          totalProjects: projectsData.total,
-          totalTasks: overdueData.total,
-          inProgressTasks: inProgress,
-          overdueTasks: overdue,
+          totalProjects: summary.projects,
+          totalTasks: summary.my_tasks.total,
+          inProgressTasks: summary.my_tasks.by_status.in_progress,
+          overdueTasks: summary.my_tasks.overdue,
         });
-        setRecentProjects(projectsData.items.slice(0, 4));
+        setRecentProjects(projectsData.items);
         setMyTasks(myTasksData.items);
       } finally {
         setLoading(false);
@@ -29,7 +29,7 @@ export function MyTasksPage() {
         offset: page * PAGE_SIZE,
       });
       setTasks(data.items);
-      setTotal(data.total);
+      setTotal(data.total ?? 0);
     } finally {
       setLoading(false);
     }
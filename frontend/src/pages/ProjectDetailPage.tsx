@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from "react";
+import { useEffect, useState, useCallback, useRef } from "react";
 import { useParams, useNavigate, Link } from "react-router-dom";
 import {
   ArrowLeft,
@@ -13,6 +13,7 @@ import {
   X,
 } from "lucide-react";
 import { projectsApi } from "../api/projects";
+import { subscribeProjectEvents } from "../api/events";
 import { tasksApi } from "../api/tasks";
 import { usersApi } from "../api/users";
 import { useAuthStore } from "../store/authStore";
@@ -29,8 +30,9 @@ import type {
   Task,
   TaskStatus,
   User,
-  TaskFilters,
+  BoardFilters,
   AssigneeInfo,
+  ProjectEvent,
 } from "../types";
 import toast from "react-hot-toast";
 import type { AxiosError } from "axios";
@@ -44,7 +46,19 @@ export function ProjectDetailPage() {
 
   const [project, setProject] = useState<Project | null>(null);
   const [tasks, setTasks] = useState<Task[]>([]);
+  // Mirrors `tasks` synchronously, so a write's response and the event for
+  // the same write (whichever arrives first) adjust the column totals once.
+  const tasksRef = useRef<Task[]>([]);
+  const removedIds = useRef(new Set<number>());
   const [members, setMembers] = useState<User[]>([]);
+  // Per-column totals and the cursor to load more of each from
+  const [columns, setColumns] = useState<
+    Record<TaskStatus, { total: number; next_cursor: string | null }>
+  >({
+    todo: { total: 0, next_cursor: null },
+    in_progress: { total: 0, next_cursor: null },
+    done: { total: 0, next_cursor: null },
+  });
   const [loading, setLoading] = useState(true); // only for initial page load
 
   // UI state
@@ -57,7 +71,7 @@ export function ProjectDetailPage() {
   const [membersOpen, setMembersOpen] = useState(false);
 
   // Filters
-  const [filters, setFilters] = useState<TaskFilters>({ limit: 200 });
+  const [filters, setFilters] = useState<BoardFilters>({ limit: 50 });
   const [searchText, setSearchText] = useState("");
   const [debouncedSearch, setDebouncedSearch] = useState("");
 
@@ -69,26 +83,60 @@ export function ProjectDetailPage() {
 
   const isOwner = project?.owner_id === user?.id || user?.role === "admin";
 
+  const boardParams = useCallback(
+    () => ({ ...filters, q: debouncedSearch || undefined }),
+    [filters, debouncedSearch],
+  );
+
+  const replaceTasks = useCallback((next: Task[]) => {
+    tasksRef.current = next;
+    setTasks(next);
+  }, []);
+
   const fetchAll = useCallback(async () => {
     try {
-      const [proj, taskData, memberData] = await Promise.all([
-        projectsApi.get(projectId),
-        tasksApi.list(projectId, {
-          ...filters,
-          q: debouncedSearch || undefined,
-        }),
-        projectsApi.getMembers(projectId),
-      ]);
-      setProject(proj);
-      setTasks(taskData.items);
-      setMembers(memberData);
+      const board = await projectsApi.board(projectId, boardParams());
+      setProject(board.project);
+      replaceTasks(board.columns.flatMap((c) => c.tasks));
+      setColumns(
+        Object.fromEntries(
+          board.columns.map((c) => [
+            c.status,
+            { total: c.total, next_cursor: c.next_cursor },
+          ]),
+        ) as typeof columns,
+      );
+      setMembers(board.members);
     } catch {
       toast.error("Failed to load project");
       navigate("/projects");
     } finally {
       setLoading(false); // clear initial spinner after first load
     }
-  }, [projectId, filters, debouncedSearch, navigate]);
+  }, [projectId, boardParams, navigate, replaceTasks]);
+
+  const handleLoadMore = async (status: TaskStatus) => {
+    const cursor = columns[status].next_cursor;
+    if (!cursor) return;
+    try {
+      const page = await tasksApi.list(projectId, {
+        ...boardParams(),
+        status,
+        cursor,
+      });
+      const loaded = tasksRef.current;
+      replaceTasks([
+        ...loaded,
+        ...page.items.filter((t) => !loaded.some((p) => p.id === t.id)),
+      ]);
+      setColumns((prev) => ({
+        ...prev,
+        [status]: { ...prev[status], next_cursor: page.next_cursor ?? null },
+      }));
+    } catch {
+      toast.error("Failed to load more tasks");
+    }
+  };
 
   useEffect(() => {
     fetchAll();
@@ -96,10 +144,141 @@ export function ProjectDetailPage() {
 
   // ── Task handlers ───────────────────────────────────────────────────────────
 
-  const handleStatusChange = async (taskId: number, newStatus: TaskStatus) => {
-    setTasks((prev) =>
-      prev.map((t) => (t.id === taskId ? { ...t, status: newStatus } : t)),
+  const adjustTotal = (status: TaskStatus, delta: number) =>
+    setColumns((prev) => ({
+      ...prev,
+      [status]: { ...prev[status], total: prev[status].total + delta },
+    }));
+
+  const upsertTask = (task: Task) => {
+    const loaded = tasksRef.current;
+    const previous = loaded.find((t) => t.id === task.id);
+    if (previous) {
+      replaceTasks(loaded.map((t) => (t.id === task.id ? task : t)));
+      if (previous.status !== task.status) {
+        adjustTotal(previous.status, -1);
+        adjustTotal(task.status, 1);
+      }
+    } else {
+      replaceTasks([...loaded, task]);
+      adjustTotal(task.status, 1);
+    }
+  };
+
+  // Returns false if the task was not loaded here.
+  const removeTask = (taskId: number) => {
+    const previous = tasksRef.current.find((t) => t.id === taskId);
+    if (!previous) return removedIds.current.has(taskId);
+    removedIds.current.add(taskId);
+    replaceTasks(tasksRef.current.filter((t) => t.id !== taskId));
+    adjustTotal(previous.status, -1);
+    return true;
+  };
+
+  // ── Live updates ────────────────────────────────────────────────────────────
+
+  const refetchTimer = useRef<ReturnType<typeof setTimeout>>();
+  const scheduleRefetch = () => {
+    clearTimeout(refetchTimer.current);
+    refetchTimer.current = setTimeout(fetchAll, 500);
+  };
+
+  // Changes can move tasks in or out of a filtered view, so it reloads.
+  const filtered = Boolean(
+    filters.priority || filters.assignee_id || debouncedSearch,
+  );
+
+  const handleEvent = (event: ProjectEvent) => {
+    const loaded = (taskId: number) =>
+      tasksRef.current.find((t) => t.id === taskId);
+    switch (event.type) {
+      case "task.created":
+      case "task.updated":
+        // An update to a task further down a column is already counted.
+        if (
+          filtered ||
+          (event.type === "task.updated" && !loaded(event.data.id))
+        )
+          scheduleRefetch();
+        else upsertTask(event.data);
+        break;
+      case "task.deleted":
+        if (!removeTask(event.data.id)) scheduleRefetch();
+        break;
+      case "assignment.created": {
+        const task = loaded(event.data.task_id);
+        const added = event.data.assignee;
+        if (filtered) scheduleRefetch();
+        else if (task)
+          upsertTask({
+            ...task,
+            assignees: [
+              ...(task.assignees ?? []).filter((a) => a.id !== added.id),
+              added,
+            ],
+          });
+        break;
+      }
+      case "assignment.deleted": {
+        const task = loaded(event.data.task_id);
+        const removed = event.data.user_id;
+        if (filtered) scheduleRefetch();
+        else if (task)
+          upsertTask({
+            ...task,
+            assignees: (task.assignees ?? []).filter((a) => a.id !== removed),
+          });
+        break;
+      }
+      case "project.updated":
+        setProject(event.data);
+        break;
+      case "project.deleted":
+        toast.error("This project was deleted");
+        navigate("/projects");
+        break;
+      case "member.added": {
+        const added = event.data.user;
+        setMembers((prev) =>
+          prev.some((m) => m.id === added.id) ? prev : [...prev, added],
+        );
+        break;
+      }
+      case "member.removed": {
+        const removed = event.data.user_id;
+        if (removed === user?.id && user?.role !== "admin") {
+          toast.error("You were removed from this project");
+          navigate("/projects");
+        } else {
+          setMembers((prev) => prev.filter((m) => m.id !== removed));
+        }
+        break;
+      }
+      default:
+        // Bulk changes, imports, and missed events (reset).
+        scheduleRefetch();
+    }
+  };
+
+  const handleEventRef = useRef(handleEvent);
+  handleEventRef.current = handleEvent;
+
+  useEffect(() => {
+    const controller = new AbortController();
+    subscribeProjectEvents(
+      projectId,
+      (event) => handleEventRef.current(event),
+      controller.signal,
     );
+    return () => {
+      controller.abort();
+      clearTimeout(refetchTimer.current);
+    };
+  }, [projectId]);
+
+  const handleStatusChange = async (taskId: number, newStatus: TaskStatus) => {
+    const task = tasksRef.current.find((t) => t.id === taskId);
+    if (task) upsertTask({ ...task, status: newStatus });
     try {
       await tasksApi.update(projectId, taskId, { status: newStatus });
       toast.success("Status updated");
@@ -113,24 +292,15 @@ export function ProjectDetailPage() {
     data: import("../types").CreateTaskRequest,
   ) => {
     const created = await tasksApi.create(projectId, data);
-    if (data.assignee_ids && data.assignee_ids.length > 0) {
-      // Refetch so assignees are populated
-      const refreshed = await tasksApi.get(projectId, created.id);
-      setTasks((prev) => [...prev, refreshed]);
-    } else {
-      setTasks((prev) => [...prev, created]);
-    }
+    upsertTask(created);
     toast.success("Task created");
   };
 
   const handleEditTask = async (data: import("../types").UpdateTaskRequest) => {
     if (!editingTask) return;
     try {
-      await tasksApi.update(projectId, editingTask.id, data);
-      const refreshed = await tasksApi.get(projectId, editingTask.id);
-      setTasks((prev) =>
-        prev.map((t) => (t.id === refreshed.id ? refreshed : t)),
-      );
+      const updated = await tasksApi.update(projectId, editingTask.id, data);
+      upsertTask(updated);
       toast.success("Task updated");
     } catch (error) {
       console.error("Failed to update task:", error);
@@ -157,7 +327,7 @@ export function ProjectDetailPage() {
     try {
       await tasksApi.delete(projectId, deleteTarget.id);
       toast.success("Task deleted");
-      setTasks((prev) => prev.filter((t) => t.id !== deleteTarget.id));
+      removeTask(deleteTarget.id);
       setDeleteTarget(null);
     } catch {
       toast.error("Failed to delete task");
@@ -296,7 +466,7 @@ export function ProjectDetailPage() {
         {(filters.priority || filters.assignee_id || searchText) && (
           <button
             onClick={() => {
-              setFilters({ limit: 200 });
+              setFilters({ limit: 50 });
               setSearchText("");
             }}
             className="flex items-center gap-1 text-xs text-slate-400 hover:text-slate-200 px-2 py-1 rounded bg-slate-700"
@@ -314,6 +484,8 @@ export function ProjectDetailPage() {
       <div className="flex-1 overflow-auto p-6">
         <KanbanBoard
           tasks={tasks}
+          columns={columns}
+          onLoadMore={handleLoadMore}
           onStatusChange={handleStatusChange}
           onAddTask={(status) => {
             setEditingTask(null);
@@ -31,9 +31,10 @@ export function ProjectsPage() {
       const data = await projectsApi.list({
         is_archived: showArchived,
         search: search || undefined,
+        include_task_counts: true,
       });
       setProjects(data.items);
-      setTotal(data.total);
+      setTotal(data.total ?? 0);
     } finally {
       setLoading(false);
     }
@@ -165,6 +166,26 @@ export function ProjectsPage() {
                     )}
                   </div>
                 </div>
+                {p.task_counts && p.task_counts.total > 0 && (
+                  <div className="mb-3">
+                    <div className="flex justify-between text-xs text-slate-500 mb-1">
+                      <span>
+                        {p.task_counts.by_status.done}/{p.task_counts.total} done
+                      </span>
+                      {p.task_counts.overdue > 0 && (
+                        <span className="text-red-400">{p.task_counts.overdue} overdue</span>
+                      )}
+                    </div>
+                    <div className="h-1.5 rounded-full bg-slate-700 overflow-hidden">
+                      <div
+                        className="h-full bg-green-500"
+                        style={{
+                          width: `${(100 * p.task_counts.by_status.done) / p.task_counts.total}%`,
+                        }}
+                      />
+                    </div>
+                  </div>
+                )}
                 <div className="flex items-center justify-between">
                   {p.is_archived && <Badge color="amber">Archived</Badge>}
                   <span className="text-slate-600 text-xs ml-auto">
@@ -50,6 +50,14 @@ export interface Project {
   updated_at: string;
   owner?: User;
   member_count?: number;
+  task_counts?: ProjectTaskCounts | null;
+}
+
+export interface ProjectTaskCounts {
+  total: number;
+  by_status: Record<TaskStatus, number>;
+  by_priority: Record<TaskPriority, number>;
+  overdue: number;
 }
 
 export interface CreateProjectRequest {
@@ -121,10 +129,12 @@ export interface TaskFilters {
   is_overdue?: boolean;
   created_by?: number;
   q?: string;
-  sort_by?: 'created_at' | 'due_date' | 'priority' | 'updated_at';
+  sort_by?: 'created_at' | 'due_date' | 'priority' | 'updated_at' | 'relevance';
   sort_dir?: 'asc' | 'desc';
   limit?: number;
   offset?: number;
+  cursor?: string;
+  include_total?: 'exact' | 'estimate' | 'none';
 }
 
 // ─── Assignment ───────────────────────────────────────────────────────────────
@@ -145,10 +155,60 @@ export interface AssignUserRequest {
 // ─── Pagination ───────────────────────────────────────────────────────────────
 
 export interface PaginatedResponse<T> {
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
   items: T[];
+  next_cursor?: string | null;
+  has_more?: boolean;
+  total_is_estimate?: boolean;
+}
+
+// ─── Board ────────────────────────────────────────────────────────────────────
+
+export interface BoardColumn {
+  status: TaskStatus;
+  total: number;
+  tasks: Task[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
+export interface Board {
+  project: Project;
+  members: User[];
+  columns: BoardColumn[];
+}
+
+export type BoardFilters = Omit<TaskFilters, 'status' | 'offset' | 'cursor' | 'include_total'>;
+
+// ─── Project events ───────────────────────────────────────────────────────────
+
+// Messages of GET /projects/{id}/events. `reset` means events were missed and
+// the page should reload.
+export type ProjectEvent =
+  | { type: 'task.created' | 'task.updated'; data: Task }
+  | { type: 'task.deleted'; data: { id: number } }
+  | { type: 'tasks.bulk_updated'; data: { count: number; changes: Partial<Task> } }
+  | { type: 'tasks.imported'; data: { count: number } }
+  | { type: 'assignment.created'; data: { task_id: number; assignee: User } }
+  | { type: 'assignment.deleted'; data: { task_id: number; user_id: number } }
+  | { type: 'assignments.changed'; data: { assigned: [number, number][]; unassigned: [number, number][] } }
+  | { type: 'project.updated'; data: Project }
+  | { type: 'project.deleted'; data: { id: number } }
+  | { type: 'member.added'; data: { user: User } }
+  | { type: 'member.removed'; data: { user_id: number } }
+  | { type: 'reset'; data: Record<string, never> };
+
+// ─── Dashboard ────────────────────────────────────────────────────────────────
+
+export interface DashboardSummary {
+  projects: number;
+  my_tasks: {
+    total: number;
+    by_status: Record<TaskStatus, number>;
+    overdue: number;
+  };
 }
 
 // ─── Error ────────────────────────────────────────────────────────────────────
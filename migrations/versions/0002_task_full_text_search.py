@@ -0,0 +1,128 @@
+"""task full-text search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+
+
+def _upgrade_postgresql() -> None:
+    # Nothing here rewrites tasks or holds its lock for long: the nullable
+    # column is a catalog change, the trigger fills it for new writes, the
+    # backfill commits a range of ids at a time and the index builds online.
+    op.execute("ALTER TABLE tasks ADD COLUMN search_vector tsvector")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger "
+        f"AS $$ BEGIN NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')}; "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF title, description ON tasks "
+        "FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()"
+    )
+    backfill = (
+        f"UPDATE tasks SET search_vector = {SEARCH_VECTOR_SQL.format(row='')} "
+        "WHERE search_vector IS NULL"
+    )
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            # Offline scripts cannot loop; the backfill is one statement there.
+            op.execute(backfill)
+        else:
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT max(id) FROM tasks")).scalar() or 0
+            for first_id in range(1, max_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    sa.text(f"{backfill} AND id >= :first AND id < :end"),
+                    {"first": first_id, "end": first_id + BACKFILL_BATCH_SIZE},
+                )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_tasks_search_vector "
+            "ON tasks USING gin (search_vector)"
+        )
+
+
+def _upgrade_sqlite() -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+        "title, description, content='tasks', content_rowid='id')"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks "
+        "BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        batch_end = bind.execute(
+            sa.text(
+                "SELECT max(id) FROM (SELECT id FROM tasks WHERE id > :last_id "
+                "ORDER BY id LIMIT :batch)"
+            ),
+            {"last_id": last_id, "batch": BACKFILL_BATCH_SIZE},
+        ).scalar()
+        if batch_end is None:
+            break
+        bind.execute(
+            sa.text(
+                "INSERT INTO tasks_fts(rowid, title, description) "
+                "SELECT id, title, description FROM tasks "
+                "WHERE id > :last_id AND id <= :batch_end"
+            ),
+            {"last_id": last_id, "batch_end": batch_end},
+        )
+        last_id = batch_end
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _upgrade_postgresql()
+    elif dialect == "sqlite":
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+        op.execute("DROP TRIGGER IF EXISTS tasks_search_vector_update ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS tasks_search_vector_update()")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
@@ -0,0 +1,81 @@
+"""project name trigram search and case-insensitive user lookup indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _upgrade_postgresql() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_projects_name_trgm "
+            "ON projects USING gin (name gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_users_email_lower ON users (lower(email))"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_users_username_lower "
+            "ON users (lower(username))"
+        )
+
+
+def _upgrade_sqlite() -> None:
+    op.execute("CREATE INDEX ix_users_email_lower ON users (lower(email))")
+    op.execute("CREATE INDEX ix_users_username_lower ON users (lower(username))")
+    op.execute(
+        "CREATE VIRTUAL TABLE projects_name_fts USING fts5("
+        "name, content='projects', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER projects_name_fts_ai AFTER INSERT ON projects BEGIN "
+        "INSERT INTO projects_name_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER projects_name_fts_ad AFTER DELETE ON projects BEGIN "
+        "INSERT INTO projects_name_fts(projects_name_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER projects_name_fts_au AFTER UPDATE OF name ON projects BEGIN "
+        "INSERT INTO projects_name_fts(projects_name_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); "
+        "INSERT INTO projects_name_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    # Project names are short; one rebuild pass indexes the existing rows.
+    op.execute("INSERT INTO projects_name_fts(projects_name_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _upgrade_postgresql()
+    elif dialect == "sqlite":
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    op.execute("DROP INDEX IF EXISTS ix_users_username_lower")
+    op.execute("DROP INDEX IF EXISTS ix_users_email_lower")
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_projects_name_trgm")
+    elif dialect == "sqlite":
+        for trigger in (
+            "projects_name_fts_ai",
+            "projects_name_fts_ad",
+            "projects_name_fts_au",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS projects_name_fts")
@@ -0,0 +1,77 @@
+"""per-project task counters
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = (
+    "total",
+    "todo",
+    "in_progress",
+    "done",
+    "low_priority",
+    "medium_priority",
+    "high_priority",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_task_stats",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *(
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+            for name in COUNTER_COLUMNS
+        ),
+    )
+    op.create_table(
+        "project_task_due_counts",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("due_date", sa.Date(), primary_key=True),
+        sa.Column("open_tasks", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Backfill from the existing tasks; enum columns store member names.
+    op.execute(
+        "INSERT INTO project_task_stats "
+        f"(project_id, {', '.join(COUNTER_COLUMNS)}) "
+        "SELECT project_id, count(*), "
+        "sum(CASE WHEN status = 'todo' THEN 1 ELSE 0 END), "
+        "sum(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END), "
+        "sum(CASE WHEN status = 'done' THEN 1 ELSE 0 END), "
+        "sum(CASE WHEN priority = 'low' THEN 1 ELSE 0 END), "
+        "sum(CASE WHEN priority = 'medium' THEN 1 ELSE 0 END), "
+        "sum(CASE WHEN priority = 'high' THEN 1 ELSE 0 END) "
+        "FROM tasks GROUP BY project_id"
+    )
+    op.execute(
+        "INSERT INTO project_task_due_counts (project_id, due_date, open_tasks) "
+        "SELECT project_id, due_date, count(*) FROM tasks "
+        "WHERE status != 'done' AND due_date IS NOT NULL "
+        "GROUP BY project_id, due_date"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_task_due_counts")
+    op.drop_table("project_task_stats")
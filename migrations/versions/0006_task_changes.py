@@ -0,0 +1,54 @@
+"""task change feed: updated_at index and tombstones
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_tombstones_project_deleted",
+        "tombstones",
+        ["project_id", "deleted_at", "id"],
+    )
+    op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"])
+    if op.get_bind().dialect.name == "postgresql":
+        # tasks is large and written constantly; do not block writes on it.
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_tasks_project_updated "
+                "ON tasks (project_id, updated_at, id)"
+            )
+    else:
+        op.create_index(
+            "ix_tasks_project_updated", "tasks", ["project_id", "updated_at", "id"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_project_updated", table_name="tasks")
+    op.drop_table("tombstones")
@@ -1,3 +1,10 @@
+import os
+from contextlib import contextmanager, nullcontext
+
+# Keep bcrypt work in-process for the suite; spawning a process pool per
+# TestClient lifespan would dominate the runtime.
+os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
@@ -5,13 +12,22 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.dashboard_cache import dashboard_cache
+from app.database import (
+    Base,
+    enforce_sqlite_foreign_keys,
+    get_db,
+    get_session_factory,
+)
+from app.events import event_broker
 from app.models.user import User, UserRole
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.assignment import Assignment
-from app.services.auth_service import AuthService
+from app.repositories.pagination import count_cache
+from app.response_cache import response_cache
+from app.services.auth_service import AuthService, principal_cache
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
@@ -20,7 +36,10 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+event.listen(engine, "connect", enforce_sqlite_foreign_keys)
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -30,6 +49,22 @@ def create_tables():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Test transactions are rolled back, so ids get reused across tests.
+    principal_cache.clear()
+    count_cache.clear()
+    response_cache.clear()
+    dashboard_cache.clear()
+    event_broker.clear()
+    yield
+    principal_cache.clear()
+    count_cache.clear()
+    response_cache.clear()
+    dashboard_cache.clear()
+    event_broker.clear()
+
+
 @pytest.fixture
 def db():
     connection = engine.connect()
@@ -47,6 +82,8 @@ def client(db: Session):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    # Background tasks run before TestClient returns, on the same session.
+    app.dependency_overrides[get_session_factory] = lambda: lambda: nullcontext(db)
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -72,6 +109,21 @@ def create_test_admin(db: Session) -> User:
     )
 
 
+@contextmanager
+def capture_statements():
+    """Collect the SQL statements sent to the test database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
 def get_auth_headers(
     client: TestClient, email="test@example.com", password="Test1234"
 ) -> dict:
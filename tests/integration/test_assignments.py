@@ -1,8 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from tests.conftest import create_test_user, get_auth_headers
+from tests.conftest import capture_statements, create_test_user, get_auth_headers
+from app.models.assignment import Assignment
 from app.models.project_member import ProjectMember
+from app.models.task import Task
 
 
 def _add_member(db, project_id, user_id):
@@ -103,3 +105,72 @@ def test_assign_as_non_owner_returns_403(
         json={"user_id": assignee.id},
     )
     assert resp.status_code == 403
+
+
+def test_bulk_assign_and_unassign(
+    client: TestClient, user_headers: dict, test_project, test_user, db: Session
+):
+    tasks = [
+        Task(title=f"Bulk {i}", project_id=test_project.id, created_by=test_user.id)
+        for i in range(3)
+    ]
+    db.add_all(tasks)
+    users = [
+        create_test_user(db, username=f"bulk{i}", email=f"bulk{i}@example.com")
+        for i in range(2)
+    ]
+    db.commit()
+    for u in users:
+        _add_member(db, test_project.id, u.id)
+    db.add(
+        Assignment(task_id=tasks[0].id, user_id=users[0].id, assigned_by=test_user.id)
+    )
+    db.commit()
+    pairs = [{"task_id": t.id, "user_id": u.id} for t in tasks for u in users]
+
+    with capture_statements() as statements:
+        resp = client.post(
+            f"/api/v1/projects/{test_project.id}/assignments:bulk",
+            headers=user_headers,
+            json={"assign": pairs[1:], "unassign": [pairs[0]]},
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["assigned"] == pairs[1:]
+    assert body["already_assigned"] == []
+    assert body["unassigned"] == [pairs[0]]
+    assert sum(s.startswith("INSERT INTO assignments") for s in statements) == 1
+
+    resp = client.post(
+        f"/api/v1/projects/{test_project.id}/assignments:bulk",
+        headers=user_headers,
+        json={"assign": pairs[1:], "unassign": [pairs[0]]},
+    )
+    body = resp.json()
+    assert body["assigned"] == [] and body["already_assigned"] == pairs[1:]
+    assert body["not_assigned"] == [pairs[0]]
+
+
+def test_bulk_assign_rejects_non_members_and_foreign_tasks(
+    client: TestClient, user_headers: dict, test_project, test_task, db: Session
+):
+    outsider = create_test_user(db, username="bulkout", email="bulkout@example.com")
+    db.commit()
+    resp = client.post(
+        f"/api/v1/projects/{test_project.id}/assignments:bulk",
+        headers=user_headers,
+        json={
+            "assign": [
+                {"task_id": test_task.id, "user_id": outsider.id},
+                {"task_id": 999999, "user_id": outsider.id},
+            ]
+        },
+    )
+    assert resp.status_code == 400
+    details = resp.json()["error"]["details"]
+    assert [d["code"] for d in details] == ["not_a_member", "resource_not_found"]
+    listed = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks/{test_task.id}/assignments",
+        headers=user_headers,
+    )
+    assert listed.json() == []
@@ -0,0 +1,116 @@
+import json
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, enforce_sqlite_foreign_keys, get_db
+from app.main import app
+
+
+@pytest.fixture
+async def async_client():
+    """Client whose requests run on an AsyncSession, one per request."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    event.listen(engine.sync_engine, "connect", enforce_sqlite_foreign_keys)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _register_and_login(client, username: str) -> dict:
+    email = f"{username}@example.com"
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": email, "password": "Async1234"},
+    )
+    assert resp.status_code == 201
+    resp = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": "Async1234"}
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def test_auth_flow_on_async_session(async_client):
+    headers = await _register_and_login(async_client, "asyncuser")
+    # Second call is served from the principal cache on a fresh session.
+    for _ in range(2):
+        resp = await async_client.get("/api/v1/auth/me", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["username"] == "asyncuser"
+    resp = await async_client.patch(
+        "/api/v1/users/me", headers=headers, json={"username": "asyncrenamed"}
+    )
+    assert resp.json()["username"] == "asyncrenamed"
+    assert (
+        await async_client.post("/api/v1/auth/logout", headers=headers)
+    ).status_code == 204
+    assert (
+        await async_client.get("/api/v1/auth/me", headers=headers)
+    ).status_code == 401
+
+
+async def test_project_and_task_flow_on_async_session(async_client):
+    owner = await _register_and_login(async_client, "asyncowner")
+    await _register_and_login(async_client, "asyncmember")
+    member_id = (
+        await async_client.get("/api/v1/users/search?q=asyncmember", headers=owner)
+    ).json()[0]["id"]
+
+    project = (
+        await async_client.post(
+            "/api/v1/projects", headers=owner, json={"name": "Async Project"}
+        )
+    ).json()
+    base = f"/api/v1/projects/{project['id']}"
+    resp = await async_client.post(
+        f"{base}/members", headers=owner, json={"user_id": member_id}
+    )
+    assert resp.status_code == 201
+    assert resp.json()["user"]["username"] == "asyncmember"
+
+    resp = await async_client.post(
+        f"{base}/tasks",
+        headers=owner,
+        json={"title": "Async Task", "assignee_ids": [member_id]},
+    )
+    assert resp.status_code == 201
+    task = resp.json()
+    assert [a["id"] for a in task["assignees"]] == [member_id]
+
+    resp = await async_client.patch(
+        f"{base}/tasks/{task['id']}",
+        headers=owner,
+        json={"status": "done", "assignee_ids": []},
+    )
+    assert resp.json()["status"] == "done"
+    assert resp.json()["assignees"] == []
+
+    resp = await async_client.get(f"{base}/tasks", headers=owner)
+    assert resp.json()["total"] == 1
+    resp = await async_client.post(
+        f"{base}/tasks/{task['id']}/assignments",
+        headers=owner,
+        json={"user_id": member_id},
+    )
+    assert resp.status_code == 201
+    resp = await async_client.get(f"{base}/tasks:export", headers=owner)
+    [exported] = [json.loads(line) for line in resp.text.splitlines()]
+    assert [a["id"] for a in exported["assignees"]] == [member_id]
+    resp = await async_client.delete(f"{base}/tasks/{task['id']}", headers=owner)
+    assert resp.status_code == 204
+    resp = await async_client.delete(base, headers=owner)
+    assert resp.status_code == 204
@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from tests.conftest import create_test_user
+from tests.conftest import create_test_user, get_auth_headers
 
 
 def test_register_success(client: TestClient):
@@ -134,3 +134,47 @@ def test_logout_invalidates_token(client: TestClient, test_user, user_headers: d
     # Old token should be invalid
     resp2 = client.get("/api/v1/auth/me", headers=user_headers)
     assert resp2.status_code == 401
+
+
+def test_repeated_requests_hit_principal_cache(
+    client: TestClient, test_user, user_headers: dict
+):
+    from app.services.auth_service import principal_cache
+
+    client.get("/api/v1/projects", headers=user_headers)
+    hits = principal_cache.hits
+    resp = client.get("/api/v1/projects", headers=user_headers)
+    assert resp.status_code == 200
+    assert principal_cache.hits == hits + 1
+
+
+def test_deactivation_takes_effect_despite_cached_principal(
+    client: TestClient, db: Session, admin_headers: dict
+):
+    create_test_user(db, username="cached", email="cached@example.com")
+    db.commit()
+    headers = get_auth_headers(client, email="cached@example.com")
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    client.patch(f"/api/v1/users/{user_id}/deactivate", headers=admin_headers)
+    resp = client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 403
+    assert resp.json()["error"]["code"] == "account_disabled"
+
+
+def test_token_issued_after_logout_is_accepted(
+    client: TestClient, test_user, user_headers: dict
+):
+    client.post("/api/v1/auth/logout", headers=user_headers)
+    fresh_headers = get_auth_headers(client)
+    # Warm the cache with the new version, then present the old token.
+    assert client.get("/api/v1/auth/me", headers=fresh_headers).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=user_headers).status_code == 401
+
+
+def test_cache_stats_require_admin(
+    client: TestClient, user_headers: dict, admin_headers: dict
+):
+    assert client.get("/api/v1/metrics/caches", headers=user_headers).status_code == 403
+    resp = client.get("/api/v1/metrics/caches", headers=admin_headers)
+    assert resp.status_code == 200
+    assert {"hits", "misses", "size"} <= resp.json()["principal"].keys()
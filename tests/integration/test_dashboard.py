@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.dashboard_cache import dashboard_cache
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.task import Task, TaskStatus
+from tests.conftest import capture_statements, create_test_user, get_auth_headers
+
+URL = "/api/v1/dashboard/summary"
+
+
+def _add_task(db, project, user, status=TaskStatus.todo, due_date=None, assign=True):
+    task = Task(
+        title="Dash",
+        project_id=project.id,
+        created_by=user.id,
+        status=status,
+        due_date=due_date,
+    )
+    db.add(task)
+    db.flush()
+    if assign:
+        db.add(Assignment(task_id=task.id, user_id=user.id, assigned_by=user.id))
+    db.commit()
+    return task
+
+
+def test_dashboard_summary_counts_in_one_query(
+    client: TestClient, db: Session, user_headers: dict, test_project, test_user
+):
+    yesterday = date.today() - timedelta(days=1)
+    _add_task(db, test_project, test_user)
+    _add_task(db, test_project, test_user, TaskStatus.in_progress, yesterday)
+    _add_task(db, test_project, test_user, TaskStatus.done, yesterday)
+    _add_task(db, test_project, test_user, assign=False)
+    archived = Project(name="Old", owner_id=test_user.id, is_archived=True)
+    db.add(archived)
+    db.commit()
+    _add_task(db, archived, test_user, TaskStatus.in_progress)
+    client.get("/api/v1/auth/me", headers=user_headers)
+
+    with capture_statements() as statements:
+        resp = client.get(URL, headers=user_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "projects": 1,
+        "my_tasks": {
+            "total": 4,
+            "by_status": {"todo": 1, "in_progress": 2, "done": 1},
+            "overdue": 1,
+        },
+    }
+    assert len(statements) == 1 and "UNION ALL" in statements[0]
+
+    with capture_statements() as statements:
+        assert client.get(URL, headers=user_headers).json() == resp.json()
+    assert statements == []
+
+
+def test_dashboard_summary_is_invalidated_by_relevant_writes(
+    client: TestClient,
+    db: Session,
+    user_headers: dict,
+    admin_headers: dict,
+    test_project,
+    test_task,
+    test_user,
+):
+    base = f"/api/v1/projects/{test_project.id}/tasks/{test_task.id}"
+    assert client.get(URL, headers=user_headers).json()["my_tasks"]["total"] == 0
+
+    client.post(
+        f"{base}/assignments", headers=user_headers, json={"user_id": test_user.id}
+    )
+    assert client.get(URL, headers=user_headers).json()["my_tasks"]["total"] == 1
+
+    client.patch(base, headers=user_headers, json={"status": "done"})
+    summary = client.get(URL, headers=user_headers).json()
+    assert summary["my_tasks"]["by_status"]["done"] == 1
+
+    # Joining someone else's project changes the member's project count.
+    other = create_test_user(db, username="dashowner", email="dash@example.com")
+    project = Project(name="Theirs", owner_id=other.id)
+    db.add(project)
+    db.flush()
+    db.add(ProjectMember(project_id=project.id, user_id=other.id))
+    db.commit()
+    owner_headers = get_auth_headers(client, email="dash@example.com")
+    client.post(
+        f"/api/v1/projects/{project.id}/members",
+        headers=owner_headers,
+        json={"user_id": test_user.id},
+    )
+    assert client.get(URL, headers=user_headers).json()["projects"] == 2
+
+    # Admins count every project, so a new project anywhere changes theirs.
+    assert client.get(URL, headers=admin_headers).json()["projects"] == 2
+    client.post("/api/v1/projects", headers=owner_headers, json={"name": "New"})
+    assert client.get(URL, headers=admin_headers).json()["projects"] == 3
+    assert dashboard_cache.stats()["stale"] >= 3
+    metrics = client.get("/api/v1/metrics/caches", headers=admin_headers).json()
+    assert "dashboard" in metrics
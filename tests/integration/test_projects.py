@@ -1,7 +1,13 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from tests.conftest import create_test_user, get_auth_headers
+from tests.conftest import capture_statements, create_test_user, get_auth_headers
+from app.models.assignment import Assignment
+from app.models.project_member import ProjectMember
+from app.models.task import Task, TaskPriority, TaskStatus
 
 
 def test_create_project_success(client: TestClient, user_headers: dict):
@@ -21,6 +27,18 @@ def test_list_projects_only_returns_accessible(
     assert test_project.id in ids
 
 
+def test_list_projects_without_total(
+    client: TestClient, user_headers: dict, test_project
+):
+    resp = client.get(
+        "/api/v1/projects", headers=user_headers, params={"include_total": "none"}
+    )
+    data = resp.json()
+    assert data["total"] is None
+    assert data["has_more"] is False
+    assert [p["id"] for p in data["items"]] == [test_project.id]
+
+
 def test_get_project_success(client: TestClient, user_headers: dict, test_project):
     resp = client.get(f"/api/v1/projects/{test_project.id}", headers=user_headers)
     assert resp.status_code == 200
@@ -77,6 +95,103 @@ def test_delete_project_as_owner(
     assert resp.status_code == 204
 
 
+def _rows(db: Session, model, **where) -> int:
+    from sqlalchemy import func, select
+
+    stmt = select(func.count()).select_from(model).filter_by(**where)
+    return db.execute(stmt).scalar_one()
+
+
+def test_delete_project_leaves_the_cascade_to_the_database(
+    client: TestClient, user_headers: dict, db: Session, test_project, test_user
+):
+    from app.models.project_task_stats import ProjectTaskStats
+
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    task = client.post(base, headers=user_headers, json={"title": "T"}).json()
+    client.post(
+        f"{base}/{task['id']}/assignments",
+        headers=user_headers,
+        json={"user_id": test_user.id},
+    )
+
+    with capture_statements() as statements:
+        resp = client.delete(
+            f"/api/v1/projects/{test_project.id}", headers=user_headers
+        )
+    assert resp.status_code == 204
+    assert [s for s in statements if s.startswith("DELETE")] == [
+        "DELETE FROM projects WHERE projects.id = ?"
+    ]
+    assert not any("FROM tasks" in s or "FROM assignments" in s for s in statements)
+    for model in (Task, ProjectMember, ProjectTaskStats):
+        assert _rows(db, model, project_id=test_project.id) == 0
+    assert _rows(db, Assignment, task_id=task["id"]) == 0
+
+
+def test_large_project_is_hidden_then_purged_in_batches(
+    client: TestClient,
+    user_headers: dict,
+    db: Session,
+    test_project,
+    test_user,
+    monkeypatch,
+):
+    from app.config import settings
+    from app.models.project import Project
+    from app.services.project_purge import purge_pending
+    from app.services.project_service import ProjectService
+
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    client.post(
+        f"{base}:batch",
+        headers=user_headers,
+        json={"items": [{"title": f"T{i}"} for i in range(5)]},
+    )
+    task_id = client.get(base, headers=user_headers).json()["items"][0]["id"]
+    client.post(
+        f"{base}/{task_id}/assignments",
+        headers=user_headers,
+        json={"user_id": test_user.id},
+    )
+
+    monkeypatch.setattr(settings, "PROJECT_PURGE_MIN_TASKS", 4)
+    assert ProjectService.delete_project(db, test_project.id, test_user) is True
+    assert _rows(db, Task, project_id=test_project.id) == 5
+    for url in (f"/api/v1/projects/{test_project.id}", base):
+        assert client.get(url, headers=user_headers).status_code == 404
+    assert client.get("/api/v1/projects", headers=user_headers).json()["items"] == []
+    assert client.get("/api/v1/tasks/mine", headers=user_headers).json()["items"] == []
+
+    progress = []
+    purged = purge_pending(db, 2, lambda p: progress.append((p.deleted, p.total)))
+    assert [p.project_id for p in purged] == [test_project.id]
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert _rows(db, Project, id=test_project.id) == 0
+    assert _rows(db, Task, project_id=test_project.id) == 0
+    assert _rows(db, Assignment, task_id=task_id) == 0
+
+
+def test_delete_large_project_accepted_and_purged_in_background(
+    client: TestClient, user_headers: dict, db: Session, test_project, monkeypatch
+):
+    from app.config import settings
+    from app.models.project import Project
+
+    client.post(
+        f"/api/v1/projects/{test_project.id}/tasks:batch",
+        headers=user_headers,
+        json={"items": [{"title": f"T{i}"} for i in range(3)]},
+    )
+    monkeypatch.setattr(settings, "PROJECT_PURGE_MIN_TASKS", 2)
+    monkeypatch.setattr(settings, "PROJECT_PURGE_BATCH_SIZE", 2)
+
+    resp = client.delete(f"/api/v1/projects/{test_project.id}", headers=user_headers)
+    assert resp.status_code == 202
+    assert _rows(db, Project, id=test_project.id) == 0
+    assert _rows(db, Task, project_id=test_project.id) == 0
+
+
 def test_add_member_to_project(
     client: TestClient, user_headers: dict, test_project, db: Session
 ):
@@ -123,7 +238,27 @@ def test_list_members(client: TestClient, user_headers: dict, test_project):
         f"/api/v1/projects/{test_project.id}/members", headers=user_headers
     )
     assert resp.status_code == 200
-    assert isinstance(resp.json(), list)
+    data = resp.json()
+    assert data["total"] == 1
+    assert data["items"][0]["username"] == "testuser"
+
+
+def test_list_members_paginates_by_cursor(
+    client: TestClient, db: Session, user_headers: dict, test_project
+):
+    for i in range(4):
+        member = create_test_user(db, username=f"pm{i}", email=f"pm{i}@example.com")
+        db.add(ProjectMember(project_id=test_project.id, user_id=member.id))
+    db.commit()
+    url = f"/api/v1/projects/{test_project.id}/members"
+    first = client.get(url, headers=user_headers, params={"limit": 3}).json()
+    assert first["total"] == 5 and first["has_more"]
+    second = client.get(
+        url, headers=user_headers, params={"limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert not second["has_more"]
+    names = [u["username"] for u in first["items"] + second["items"]]
+    assert names == ["testuser", "pm0", "pm1", "pm2", "pm3"]
 
 
 def test_admin_sees_all_projects(client: TestClient, admin_headers: dict, test_project):
@@ -131,3 +266,206 @@ def test_admin_sees_all_projects(client: TestClient, admin_headers: dict, test_p
     assert resp.status_code == 200
     ids = [p["id"] for p in resp.json()["items"]]
     assert test_project.id in ids
+
+
+def _revalidate(client, url, headers):
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = client.get(url, headers={**headers, "If-None-Match": etag})
+    return etag, again
+
+
+def test_get_project_conditional(client: TestClient, user_headers: dict, test_project):
+    url = f"/api/v1/projects/{test_project.id}"
+    etag, again = _revalidate(client, url, user_headers)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    client.patch(url, headers=user_headers, json={"name": "Renamed"})
+    changed = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Renamed"
+    assert changed.headers["etag"] != etag
+
+
+def test_list_members_conditional_tracks_membership_and_profiles(
+    client: TestClient, user_headers: dict, test_project, db: Session
+):
+    url = f"/api/v1/projects/{test_project.id}/members"
+    etag, again = _revalidate(client, url, user_headers)
+    assert again.status_code == 304
+
+    other = create_test_user(db, username="etagmember", email="etagm@example.com")
+    db.commit()
+    client.post(url, headers=user_headers, json={"user_id": other.id})
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    # A password change is not part of any listing.
+    client.patch(
+        "/api/v1/users/me",
+        headers=user_headers,
+        json={"current_password": "Test1234", "new_password": "Other1234"},
+    )
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # Member listings embed the user, so a profile change invalidates them.
+    client.patch("/api/v1/users/me", headers=user_headers, json={"username": "renamed"})
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+@pytest.fixture
+def board_tasks(db: Session, test_project, test_user) -> list[Task]:
+    statuses = [TaskStatus.todo] * 7 + [TaskStatus.in_progress] * 3
+    tasks = [
+        Task(
+            title=f"Board {i}",
+            project_id=test_project.id,
+            created_by=test_user.id,
+            status=status,
+            priority=TaskPriority.high if i % 2 else TaskPriority.low,
+        )
+        for i, status in enumerate(statuses)
+    ]
+    db.add_all(tasks)
+    db.flush()
+    db.add_all(
+        Assignment(task_id=task.id, user_id=test_user.id, assigned_by=test_user.id)
+        for task in tasks
+    )
+    db.commit()
+    return tasks
+
+
+def test_board_groups_tasks_by_status_with_column_cursors(
+    client: TestClient, user_headers: dict, test_project, test_user, board_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/board"
+    with capture_statements() as statements:
+        resp = client.get(url, headers=user_headers, params={"limit": 3})
+    assert resp.status_code == 200
+    # Access check, the windowed board query and the members: not one per column.
+    assert len(statements) == 3
+
+    data = resp.json()
+    assert data["project"]["id"] == test_project.id
+    assert [m["id"] for m in data["members"]] == [test_user.id]
+    columns = {c["status"]: c for c in data["columns"]}
+    assert list(columns) == [s.value for s in TaskStatus]
+    assert [(columns[s]["total"], len(columns[s]["tasks"])) for s in columns] == [
+        (7, 3),
+        (3, 3),
+        (0, 0),
+    ]
+    assert columns["in_progress"]["has_more"] is False
+    assert columns["in_progress"]["next_cursor"] is None
+    assert columns["todo"]["tasks"][0]["assignees"][0]["id"] == test_user.id
+
+    # A column continues in the task listing, in the same order.
+    todo = columns["todo"]
+    ids = [t["id"] for t in todo["tasks"]]
+    cursor = todo["next_cursor"]
+    while cursor:
+        page = client.get(
+            f"/api/v1/projects/{test_project.id}/tasks",
+            headers=user_headers,
+            params={"status": "todo", "limit": 3, "cursor": cursor},
+        ).json()
+        ids += [t["id"] for t in page["items"]]
+        cursor = page["next_cursor"]
+    expected = [t.id for t in board_tasks if t.status == TaskStatus.todo]
+    assert ids == expected[::-1]
+
+
+def test_board_applies_filters_and_checks_access(
+    client: TestClient, db: Session, user_headers: dict, test_project, board_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/board"
+    resp = client.get(
+        url,
+        headers=user_headers,
+        params={"priority": "high", "sort_by": "priority", "sort_dir": "asc"},
+    )
+    totals = {c["status"]: c["total"] for c in resp.json()["columns"]}
+    assert totals == {"todo": 3, "in_progress": 2, "done": 0}
+
+    resp = client.get(
+        url,
+        headers=user_headers,
+        params={"due_date_from": "2030-01-02", "due_date_to": "2030-01-01"},
+    )
+    assert resp.status_code == 400
+
+    create_test_user(db, username="boardout", email="boardout@example.com")
+    db.commit()
+    resp = client.get(url, headers=get_auth_headers(client, "boardout@example.com"))
+    assert resp.status_code in (403, 404)
+
+
+def _read_events(client: TestClient, url: str, headers: dict) -> list[dict]:
+    """The SSE messages of one (time-limited) stream, keep-alives dropped."""
+    resp = client.get(url, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    messages = []
+    for block in resp.text.split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            messages.append(fields)
+    return messages
+
+
+def test_event_stream_resumes_from_last_event_id(
+    client: TestClient, db: Session, user_headers: dict, test_project, monkeypatch
+):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "EVENTS_MAX_STREAM_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "EVENTS_HEARTBEAT_SECONDS", 0.05)
+    url = f"/api/v1/projects/{test_project.id}/events"
+    tasks = f"/api/v1/projects/{test_project.id}/tasks"
+    task = client.post(tasks, headers=user_headers, json={"title": "Live"}).json()
+
+    # An id the server cannot resume from gets a reset to the latest event.
+    [reset] = _read_events(client, url, {**user_headers, "Last-Event-ID": "x-1"})
+    assert reset["event"] == "reset"
+
+    client.patch(f"{tasks}/{task['id']}", headers=user_headers, json={"status": "done"})
+    member = create_test_user(db, username="streamer", email="streamer@example.com")
+    db.commit()
+    client.post(
+        url.replace("events", "members"),
+        headers=user_headers,
+        json={"user_id": member.id},
+    )
+    client.delete(f"{tasks}/{task['id']}", headers=user_headers)
+
+    messages = _read_events(client, url, {**user_headers, "Last-Event-ID": reset["id"]})
+    assert [m["event"] for m in messages] == [
+        "task.updated",
+        "member.added",
+        "task.deleted",
+    ]
+    assert '"status":"done"' in messages[0]["data"]
+    assert messages[2]["data"] == '{"id":%d}' % task["id"]
+
+    # A removed member's open stream ends at the removal, and cannot be
+    # reopened.
+    monkeypatch.setattr(settings, "EVENTS_MAX_STREAM_SECONDS", 10)
+    member_headers = get_auth_headers(client, "streamer@example.com")
+    with ThreadPoolExecutor(1) as pool:
+        stream = pool.submit(_read_events, client, url, member_headers)
+        time.sleep(0.2)
+        client.delete(
+            f"{url.replace('events', 'members')}/{member.id}", headers=user_headers
+        )
+        messages = stream.result(timeout=5)
+    assert [m["event"] for m in messages] == ["member.removed"]
+    assert client.get(url, headers=member_headers).status_code in (403, 404)
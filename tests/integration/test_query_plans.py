@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from tests.conftest import engine
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def query_plan(db: Session, statement: str, parameters) -> str:
+    rows = db.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return "\n".join(row[-1] for row in rows)
+
+
+def plan_of(db: Session, fn, *args, **kwargs) -> str:
+    with captured_statements() as statements:
+        fn(db, *args, **kwargs)
+    return "\n".join(query_plan(db, *statement) for statement in statements)
+
+
+@pytest.mark.parametrize(
+    "lookup, value, index",
+    [
+        (UserRepository.get_by_email, "TEST@example.com", "ix_users_email_lower"),
+        (
+            UserRepository.get_credentials_by_email,
+            "test@example.com",
+            "ix_users_email_lower",
+        ),
+        (UserRepository.get_by_username, "TestUser", "ix_users_username_lower"),
+    ],
+)
+def test_case_insensitive_user_lookups_use_lower_indexes(
+    db: Session, test_user, lookup, value, index
+):
+    plan = plan_of(db, lookup, value)
+    assert f"USING INDEX {index}" in plan
+    assert "SCAN users" not in plan
+
+
+def test_project_name_search_uses_trigram_index(db: Session, test_project):
+    plan = plan_of(db, ProjectRepository.list_all, search="roje")
+    assert "SCAN projects_name_fts VIRTUAL TABLE INDEX" in plan
+    assert ProjectRepository.list_all(db, search="ROJE").items == [test_project]
+
+
+def test_task_search_uses_full_text_index(db: Session, test_task):
+    plan = plan_of(db, TaskRepository.list_for_project, test_task.project_id, q="tes")
+    assert "SCAN tasks_fts VIRTUAL TABLE INDEX" in plan
+
+
+def test_task_changes_seek_on_updated_at_index(db: Session, test_task):
+    since = (test_task.updated_at, 0)
+    plan = plan_of(
+        db, TaskRepository.changed_since, test_task.project_id, since, since[0], 100
+    )
+    assert "ix_tasks_project_updated" in plan
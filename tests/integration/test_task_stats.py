@@ -0,0 +1,164 @@
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from tests.conftest import capture_statements
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.task import TaskPriority, TaskStatus
+from app.repositories.task_repository import TaskRepository
+from app.services.task_stats_service import TaskStatsService, reconcile
+
+
+def _drift(db: Session, project_id: int):
+    return TaskStatsService.reconcile_batch(db, [project_id], fix=False)
+
+
+def _counts(client, headers, project_id):
+    resp = client.get(
+        f"/api/v1/projects/{project_id}",
+        headers=headers,
+        params={"include_task_counts": True},
+    )
+    assert resp.status_code == 200
+    return resp.json()["task_counts"]
+
+
+def test_counters_follow_every_task_write_path(
+    client: TestClient, db: Session, user_headers: dict, test_project, test_user
+):
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    yesterday = date.today() - timedelta(days=1)
+    next_week = (date.today() + timedelta(days=7)).isoformat()
+
+    # The API refuses past due dates, so the overdue task is written directly.
+    TaskRepository.create(
+        db,
+        title="Late",
+        project_id=test_project.id,
+        created_by=test_user.id,
+        due_date=yesterday,
+    )
+    single = client.post(
+        base, headers=user_headers, json={"title": "One", "priority": "high"}
+    ).json()
+    client.patch(
+        f"{base}/{single['id']}", headers=user_headers, json={"status": "done"}
+    )
+    batch = client.post(
+        f"{base}:batch",
+        headers=user_headers,
+        json={
+            "items": [
+                {"title": f"Batch {i}", "due_date": next_week, "priority": "low"}
+                for i in range(4)
+            ]
+        },
+    ).json()
+    batch_ids = [r["task"]["id"] for r in batch["results"]]
+    client.patch(
+        f"{base}:batch",
+        headers=user_headers,
+        json={"items": [{"id": batch_ids[0], "status": "in_progress"}]},
+    )
+    client.post(
+        f"{base}:bulk-update",
+        headers=user_headers,
+        json={"filter": {"priority": "low"}, "changes": {"priority": "medium"}},
+    )
+    client.post(
+        f"{base}:import",
+        headers=user_headers,
+        content=b'{"title": "Imported", "status": "done"}\n',
+    )
+    client.delete(f"{base}/{single['id']}", headers=user_headers)
+    client.request(
+        "DELETE", f"{base}:batch", headers=user_headers, json={"ids": batch_ids[2:]}
+    )
+    assert _drift(db, test_project.id) == []
+
+    assert _counts(client, user_headers, test_project.id) == {
+        "total": 4,
+        "by_status": {"todo": 2, "in_progress": 1, "done": 1},
+        "by_priority": {"low": 0, "medium": 4, "high": 0},
+        "overdue": 1,
+    }
+
+
+def test_reconcile_reports_and_fixes_drift(
+    db: Session, test_project, test_task, test_user
+):
+    # test_task is inserted behind the repository's back.
+    TaskRepository.create(
+        db,
+        title="Tracked",
+        project_id=test_project.id,
+        created_by=test_user.id,
+        status=TaskStatus.in_progress,
+        priority=TaskPriority.high,
+    )
+    [drift] = _drift(db, test_project.id)
+    assert drift.columns == {"total": (1, 2), "todo": (0, 1), "medium_priority": (0, 1)}
+
+    reported = []
+    progress = reconcile(db, batch_size=1, on_drift=reported.append)
+    assert (progress.projects, progress.drifted) == (1, 1)
+    assert reported[0].project_id == test_project.id
+    assert _drift(db, test_project.id) == []
+
+    db.execute(
+        update(ProjectTaskStats)
+        .where(ProjectTaskStats.project_id == test_project.id)
+        .values(total=ProjectTaskStats.total + 5)
+    )
+    db.commit()
+    progress = reconcile(db, batch_size=10, fix=False)
+    assert progress.drifted == 1
+    assert reconcile(db, batch_size=10).drifted == 1
+    assert reconcile(db, batch_size=10).drifted == 0
+
+
+def test_project_listing_includes_counts_in_one_query(
+    client: TestClient, db: Session, user_headers: dict, test_project, test_user
+):
+    for status in (TaskStatus.todo, TaskStatus.done):
+        TaskRepository.create(
+            db,
+            title="T",
+            project_id=test_project.id,
+            created_by=test_user.id,
+            status=status,
+        )
+    with capture_statements() as plain_statements:
+        plain = client.get("/api/v1/projects", headers=user_headers).json()
+    assert "task_counts" not in plain["items"][0]
+
+    with capture_statements() as statements:
+        resp = client.get(
+            "/api/v1/projects",
+            headers=user_headers,
+            params={"include_task_counts": True},
+        )
+    counts = resp.json()["items"][0]["task_counts"]
+    assert counts["total"] == 2
+    assert counts["by_status"] == {"todo": 1, "in_progress": 0, "done": 1}
+    # One counter query for the page, and tasks are never scanned.
+    assert len(statements) == len(plain_statements) + 1
+    assert not any("FROM tasks" in s for s in statements)
+
+
+def test_project_etag_with_counts_differs(
+    client: TestClient, user_headers: dict, test_project
+):
+    url = f"/api/v1/projects/{test_project.id}"
+    plain = client.get(url, headers=user_headers)
+    counted = client.get(url, headers=user_headers, params={"include_task_counts": 1})
+    assert counted.headers["etag"] != plain.headers["etag"]
+    assert counted.json()["task_counts"]["total"] == 0
+    again = client.get(
+        url,
+        headers={**user_headers, "If-None-Match": counted.headers["etag"]},
+        params={"include_task_counts": 1},
+    )
+    assert again.status_code == 304
@@ -1,10 +1,14 @@
+import csv
+import io
+import json
 import pytest
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from tests.conftest import create_test_user, get_auth_headers
+from tests.conftest import capture_statements, create_test_user, get_auth_headers
 from app.models.project import Project
 from app.models.project_member import ProjectMember
+from app.models.task import Task, TaskPriority, TaskStatus
 
 
 def test_create_task_as_member(client: TestClient, user_headers: dict, test_project):
@@ -97,6 +101,86 @@ def test_list_tasks_search_by_keyword(
     assert any("SearchableTask_XYZ" in item["title"] for item in data["items"])
 
 
+def _search(client, headers, project_id, q, **params):
+    resp = client.get(
+        f"/api/v1/projects/{project_id}/tasks",
+        headers=headers,
+        params={"q": q, **params},
+    )
+    assert resp.status_code == 200
+    return [item["title"] for item in resp.json()["items"]]
+
+
+def test_list_tasks_search_matches_prefixes_and_descriptions(
+    client: TestClient, user_headers: dict, test_project
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    for title, description in [
+        ("Deploy pipeline", None),
+        ("Write docs", "covers the deployment checklist"),
+        ("Unrelated", "nothing to see"),
+    ]:
+        client.post(
+            url,
+            headers=user_headers,
+            json={"title": title, "description": description, "priority": "low"},
+        )
+    assert sorted(_search(client, user_headers, test_project.id, "depl")) == [
+        "Deploy pipeline",
+        "Write docs",
+    ]
+    assert _search(client, user_headers, test_project.id, "deploy pipe") == [
+        "Deploy pipeline"
+    ]
+    assert _search(client, user_headers, test_project.id, "'\"*") == []
+
+
+def test_list_tasks_search_follows_updates(
+    client: TestClient, user_headers: dict, test_project, test_task
+):
+    client.patch(
+        f"/api/v1/projects/{test_project.id}/tasks/{test_task.id}",
+        headers=user_headers,
+        json={"title": "Renamed zebra"},
+    )
+    assert _search(client, user_headers, test_project.id, "zebr") == ["Renamed zebra"]
+    assert _search(client, user_headers, test_project.id, "Test Task") == []
+
+
+def test_list_tasks_sort_by_relevance(
+    client: TestClient, user_headers: dict, test_project
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    for title, description in [
+        ("Misc", "also mentions invoices somewhere in a long description"),
+        ("Invoices export", "invoices invoices"),
+    ]:
+        client.post(
+            url,
+            headers=user_headers,
+            json={"title": title, "description": description, "priority": "low"},
+        )
+    titles = _search(
+        client, user_headers, test_project.id, "invoice", sort_by="relevance"
+    )
+    assert titles == ["Invoices export", "Misc"]
+
+
+def test_list_tasks_relevance_requires_query_and_offset_paging(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    resp = client.get(url, headers=user_headers, params={"sort_by": "relevance"})
+    assert resp.status_code == 400
+
+    params = {"q": "paged", "sort_by": "relevance", "limit": 5}
+    page = client.get(url, headers=user_headers, params=params).json()
+    assert page["has_more"] is True
+    assert page["next_cursor"] is None
+    resp = client.get(url, headers=user_headers, params={**params, "cursor": "x"})
+    assert resp.status_code == 400
+
+
 def test_list_tasks_sort_by_due_date(
     client: TestClient, user_headers: dict, test_project
 ):
@@ -107,6 +191,144 @@ def test_list_tasks_sort_by_due_date(
     assert resp.status_code == 200
 
 
+@pytest.fixture
+def many_tasks(db: Session, test_project, test_user) -> list[Task]:
+    # Shared timestamps, NULL due dates and repeated priorities force the
+    # id tie-breaker and NULL handling to do the work.
+    priorities = list(TaskPriority)
+    tasks = [
+        Task(
+            title=f"Paged {i}",
+            project_id=test_project.id,
+            created_by=test_user.id,
+            status=TaskStatus.todo,
+            priority=priorities[i % 3],
+            due_date=None if i % 4 == 0 else date.today() + timedelta(days=i % 5),
+        )
+        for i in range(23)
+    ]
+    db.add_all(tasks)
+    db.commit()
+    return tasks
+
+
+def _walk_pages(client, url, headers, limit=5):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(url, headers=headers, params=params)
+        assert resp.status_code == 200
+        data = resp.json()
+        ids += [item["id"] for item in data["items"]]
+        if not data["has_more"]:
+            assert data["next_cursor"] is None
+            return ids
+        cursor = data["next_cursor"]
+
+
+@pytest.mark.parametrize(
+    "sort_by", ["created_at", "updated_at", "due_date", "priority"]
+)
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+def test_list_tasks_cursor_walk_matches_offset_order(
+    client: TestClient, user_headers: dict, test_project, many_tasks, sort_by, sort_dir
+):
+    url = (
+        f"/api/v1/projects/{test_project.id}/tasks"
+        f"?sort_by={sort_by}&sort_dir={sort_dir}"
+    )
+    expected = [
+        item["id"]
+        for item in client.get(url + "&limit=100", headers=user_headers).json()["items"]
+    ]
+    assert len(expected) == len(many_tasks)
+    assert _walk_pages(client, url, user_headers) == expected
+
+
+def test_list_tasks_due_date_nulls_sort_last(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    for sort_dir in ("asc", "desc"):
+        resp = client.get(
+            f"/api/v1/projects/{test_project.id}/tasks",
+            headers=user_headers,
+            params={"sort_by": "due_date", "sort_dir": sort_dir, "limit": 100},
+        )
+        due = [item["due_date"] for item in resp.json()["items"]]
+        first_null = due.index(None)
+        assert all(d is None for d in due[first_null:])
+
+
+def test_list_tasks_invalid_cursor_returns_400(
+    client: TestClient, user_headers: dict, test_project
+):
+    resp = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks?cursor=not-a-cursor",
+        headers=user_headers,
+    )
+    assert resp.status_code == 400
+
+
+def test_list_tasks_cursor_from_other_sort_returns_400(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    cursor = client.get(url + "?limit=2", headers=user_headers).json()["next_cursor"]
+    resp = client.get(
+        url, headers=user_headers, params={"cursor": cursor, "sort_by": "due_date"}
+    )
+    assert resp.status_code == 400
+
+
+def test_list_tasks_include_total_none_still_reports_has_more(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    resp = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks",
+        headers=user_headers,
+        params={"include_total": "none", "limit": 20},
+    )
+    data = resp.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert len(data["items"]) == 20
+
+
+def test_list_tasks_include_total_estimate_uses_count_cache(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    params = {"include_total": "estimate", "q": "Paged"}
+    first = client.get(url, headers=user_headers, params=params).json()
+    assert first["total"] == len(many_tasks)
+    assert first["total_is_estimate"] is True
+
+    client.post(
+        url,
+        headers=user_headers,
+        json={"title": "Paged extra", "status": "todo", "priority": "low"},
+    )
+    # Served from the per-filter cache until its TTL runs out...
+    cached = client.get(url, headers=user_headers, params=params).json()
+    assert cached["total"] == len(many_tasks)
+    # ...while exact counts, and other filters, are unaffected.
+    exact = client.get(url, headers=user_headers, params={"q": "Paged"}).json()
+    assert exact["total"] == len(many_tasks) + 1
+    assert exact["total_is_estimate"] is False
+
+
+def test_list_tasks_rejects_unknown_include_total(
+    client: TestClient, user_headers: dict, test_project
+):
+    resp = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks?include_total=sometimes",
+        headers=user_headers,
+    )
+    assert resp.status_code == 422
+
+
 def test_update_task_as_owner(
     client: TestClient, user_headers: dict, test_project, test_task
 ):
@@ -145,6 +367,12 @@ def test_list_my_tasks(client: TestClient, user_headers: dict):
     assert "items" in resp.json()
 
 
+def test_list_my_tasks_without_total(client: TestClient, user_headers: dict):
+    resp = client.get("/api/v1/tasks/mine?include_total=none", headers=user_headers)
+    assert resp.status_code == 200
+    assert resp.json()["total"] is None
+
+
 def test_create_task_past_due_date_returns_400(
     client: TestClient, user_headers: dict, test_project
 ):
@@ -160,3 +388,578 @@ def test_create_task_past_due_date_returns_400(
         },
     )
     assert resp.status_code == 400
+
+
+def _batch_url(project_id):
+    return f"/api/v1/projects/{project_id}/tasks:batch"
+
+
+def test_batch_create_tasks_atomic(
+    client: TestClient, user_headers: dict, test_project, test_user
+):
+    items = [{"title": f"Batch {i}", "assignee_ids": [test_user.id]} for i in range(3)]
+    with capture_statements() as statements:
+        resp = client.post(
+            _batch_url(test_project.id), json={"items": items}, headers=user_headers
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["succeeded"] == 3 and body["failed"] == 0
+    assert [r["status_code"] for r in body["results"]] == [201] * 3
+    assert [r["task"]["title"] for r in body["results"]] == [
+        "Batch 0",
+        "Batch 1",
+        "Batch 2",
+    ]
+    assert body["results"][0]["task"]["assignees"][0]["id"] == test_user.id
+    assert sum(s.startswith("INSERT INTO tasks") for s in statements) == 1
+    assert sum(s.startswith("INSERT INTO assignments") for s in statements) == 1
+
+
+def test_batch_create_tasks_atomic_failure_writes_nothing(
+    client: TestClient, user_headers: dict, test_project
+):
+    past = (date.today() - timedelta(days=1)).isoformat()
+    items = [{"title": "Fine"}, {"title": "Late", "due_date": past}]
+    resp = client.post(
+        _batch_url(test_project.id), json={"items": items}, headers=user_headers
+    )
+    assert resp.status_code == 400
+    error = resp.json()["error"]
+    assert error["code"] == "batch_failed"
+    assert [d["index"] for d in error["details"]] == [1]
+    listed = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks", headers=user_headers
+    )
+    assert listed.json()["total"] == 0
+
+
+def test_batch_create_tasks_best_effort_applies_valid_items(
+    client: TestClient, db: Session, user_headers: dict, test_project
+):
+    outsider = create_test_user(db, username="outsider", email="out@example.com")
+    db.commit()
+    items = [
+        {"title": "Kept"},
+        {"title": "Rejected", "assignee_ids": [outsider.id]},
+        {"title": "Also kept"},
+    ]
+    resp = client.post(
+        _batch_url(test_project.id),
+        json={"mode": "best_effort", "items": items},
+        headers=user_headers,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["succeeded"] == 2 and body["failed"] == 1
+    rejected = body["results"][1]
+    assert rejected["status_code"] == 403
+    assert rejected["error"]["code"] == "not_a_member"
+    assert rejected["id"] is None
+    listed = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks", headers=user_headers
+    )
+    assert sorted(t["title"] for t in listed.json()["items"]) == ["Also kept", "Kept"]
+
+
+def test_batch_rejects_too_many_items(
+    client: TestClient, user_headers: dict, test_project, monkeypatch
+):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "TASK_BATCH_MAX_ITEMS", 2)
+    resp = client.post(
+        _batch_url(test_project.id),
+        json={"items": [{"title": str(i)} for i in range(3)]},
+        headers=user_headers,
+    )
+    assert resp.status_code == 400
+
+
+def test_batch_update_tasks(
+    client: TestClient, db: Session, user_headers: dict, many_tasks, test_user
+):
+    project_id = many_tasks[0].project_id
+    first, second = many_tasks[0].id, many_tasks[1].id
+    items = [
+        {"id": first, "status": "done", "assignee_ids": [test_user.id]},
+        {"id": second, "priority": "high"},
+        {"id": 999999, "title": "Missing"},
+        {"id": first, "title": "Twice"},
+    ]
+    with capture_statements() as statements:
+        resp = client.patch(
+            _batch_url(project_id),
+            json={"mode": "best_effort", "items": items},
+            headers=user_headers,
+        )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status_code"] for r in results] == [200, 200, 404, 400]
+    assert results[0]["task"]["status"] == "done"
+    assert results[0]["task"]["assignees"][0]["id"] == test_user.id
+    assert results[1]["task"]["priority"] == "high"
+    assert sum(s.startswith("INSERT INTO assignments") for s in statements) == 1
+
+    resp = client.patch(
+        _batch_url(project_id), json={"items": items}, headers=user_headers
+    )
+    assert resp.status_code == 400
+    assert [d["index"] for d in resp.json()["error"]["details"]] == [2, 3]
+
+
+def test_batch_delete_tasks(
+    client: TestClient, db: Session, user_headers: dict, many_tasks
+):
+    project_id = many_tasks[0].project_id
+    ids = [t.id for t in many_tasks[:5]]
+    with capture_statements() as statements:
+        resp = client.request(
+            "DELETE",
+            _batch_url(project_id),
+            json={"ids": ids},
+            headers=user_headers,
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["succeeded"] == 5
+    assert {r["status_code"] for r in body["results"]} == {204}
+    assert sum(s.startswith("DELETE FROM tasks") for s in statements) == 1
+    listed = client.get(f"/api/v1/projects/{project_id}/tasks", headers=user_headers)
+    assert listed.json()["total"] == len(many_tasks) - 5
+
+
+def test_batch_delete_as_non_creator_member_is_rejected(
+    client: TestClient, db: Session, test_project, test_task
+):
+    member = create_test_user(db, username="member", email="member@example.com")
+    db.add(ProjectMember(project_id=test_project.id, user_id=member.id))
+    db.commit()
+    headers = get_auth_headers(client, email="member@example.com")
+    resp = client.request(
+        "DELETE",
+        _batch_url(test_project.id),
+        json={"mode": "best_effort", "ids": [test_task.id]},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["error"]["code"] == "permission_denied"
+
+
+def test_bulk_update_by_filter(
+    client: TestClient, db: Session, user_headers: dict, test_project, test_user
+):
+    yesterday = date.today() - timedelta(days=1)
+    db.add_all(
+        Task(
+            title=f"Sprint {i}",
+            project_id=test_project.id,
+            created_by=test_user.id,
+            status=TaskStatus.in_progress if i < 4 else TaskStatus.todo,
+            due_date=yesterday if i % 2 == 0 else date.today() + timedelta(days=7),
+        )
+        for i in range(6)
+    )
+    db.commit()
+    url = f"/api/v1/projects/{test_project.id}/tasks:bulk-update"
+    body = {
+        "filter": {"status": "in_progress", "due_date_to": yesterday.isoformat()},
+        "changes": {"status": "done"},
+    }
+
+    resp = client.post(url, json={**body, "dry_run": True}, headers=user_headers)
+    assert resp.json() == {"affected": 2, "dry_run": True}
+
+    with capture_statements() as statements:
+        resp = client.post(url, json=body, headers=user_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"affected": 2, "dry_run": False}
+    assert sum(s.startswith("UPDATE tasks") for s in statements) == 1
+
+    done = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks?status=done", headers=user_headers
+    )
+    assert sorted(t["title"] for t in done.json()["items"]) == ["Sprint 0", "Sprint 2"]
+    # Already-done tasks are not rewritten on a repeat.
+    resp = client.post(url, json=body, headers=user_headers)
+    assert resp.json()["affected"] == 0
+
+
+def test_bulk_update_with_search_filter(
+    client: TestClient, user_headers: dict, test_project
+):
+    for title in ("Fix login bug", "Fix signup bug", "Write docs"):
+        client.post(
+            f"/api/v1/projects/{test_project.id}/tasks",
+            json={"title": title},
+            headers=user_headers,
+        )
+    resp = client.post(
+        f"/api/v1/projects/{test_project.id}/tasks:bulk-update",
+        json={"filter": {"q": "bug"}, "changes": {"priority": "high"}},
+        headers=user_headers,
+    )
+    assert resp.json()["affected"] == 2
+
+
+def test_bulk_update_requires_owner_and_changes(
+    client: TestClient, db: Session, user_headers: dict, test_project
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks:bulk-update"
+    resp = client.post(url, json={"changes": {}}, headers=user_headers)
+    assert resp.status_code == 400
+    inverted = {"due_date_from": "2030-01-02", "due_date_to": "2030-01-01"}
+    resp = client.post(
+        url,
+        json={"filter": inverted, "changes": {"status": "done"}},
+        headers=user_headers,
+    )
+    assert resp.status_code == 400
+
+    member = create_test_user(db, username="member", email="member@example.com")
+    db.add(ProjectMember(project_id=test_project.id, user_id=member.id))
+    db.commit()
+    headers = get_auth_headers(client, email="member@example.com")
+    resp = client.post(url, json={"changes": {"status": "done"}}, headers=headers)
+    assert resp.status_code == 403
+
+
+def test_list_tasks_conditional_skips_loading_rows(
+    client: TestClient, user_headers: dict, test_project, test_task
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks?status=todo"
+    first = client.get(url, headers=user_headers)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    with capture_statements() as statements:
+        resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert not any("FROM tasks" in s for s in statements)
+
+    other = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks?status=done",
+        headers={**user_headers, "If-None-Match": etag},
+    )
+    assert other.status_code == 200
+
+    client.patch(
+        f"/api/v1/projects/{test_project.id}/tasks/{test_task.id}",
+        headers=user_headers,
+        json={"title": "Changed"},
+    )
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["title"] == "Changed"
+
+
+def test_get_task_conditional(
+    client: TestClient, user_headers: dict, test_project, test_task, db: Session
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks/{test_task.id}"
+    etag = client.get(url, headers=user_headers).headers["etag"]
+    resp = client.get(url, headers={**user_headers, "If-None-Match": f"W/{etag}"})
+    assert resp.status_code == 304
+
+    member = create_test_user(db, username="etagas", email="etagas@example.com")
+    db.add(ProjectMember(project_id=test_project.id, user_id=member.id))
+    db.commit()
+    client.post(f"{url}/assignments", headers=user_headers, json={"user_id": member.id})
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["assignees"][0]["id"] == member.id
+
+
+def test_list_my_tasks_conditional(
+    client: TestClient, user_headers: dict, test_project, test_user
+):
+    url = "/api/v1/tasks/mine"
+    etag = client.get(url, headers=user_headers).headers["etag"]
+    assert (
+        client.get(url, headers={**user_headers, "If-None-Match": etag}).status_code
+        == 304
+    )
+    client.post(
+        f"/api/v1/projects/{test_project.id}/tasks",
+        headers=user_headers,
+        json={"title": "Mine", "assignee_ids": [test_user.id]},
+    )
+    resp = client.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["title"] == "Mine"
+
+
+def test_list_tasks_served_from_response_cache_until_a_write(
+    client: TestClient, user_headers: dict, admin_headers: dict, test_project, test_task
+):
+    from app.response_cache import response_cache
+
+    url = f"/api/v1/projects/{test_project.id}/tasks"
+    first = client.get(url, headers=user_headers)
+    with capture_statements() as statements:
+        second = client.get(url, headers=user_headers)
+    assert second.content == first.content
+    assert not any("FROM tasks" in s for s in statements)
+    assert response_cache.stats()["hits"] == 1
+
+    # Admins are a different access class and get their own entry.
+    client.get(url, headers=admin_headers)
+    assert response_cache.stats()["hits"] == 1
+
+    client.patch(f"{url}/{test_task.id}", headers=user_headers, json={"status": "done"})
+    third = client.get(url, headers=user_headers)
+    assert third.json()["items"][0]["status"] == "done"
+
+    metrics = client.get("/api/v1/metrics/caches", headers=admin_headers).json()
+    assert metrics["response"]["misses"] == 3
+    assert metrics["response"]["bytes"] > 0
+
+
+def test_export_tasks_ndjson_streams_in_chunks(
+    client: TestClient,
+    db: Session,
+    user_headers: dict,
+    test_project,
+    test_user,
+    many_tasks,
+    monkeypatch,
+):
+    from app.config import settings
+    from app.models.assignment import Assignment
+
+    db.add_all(
+        Assignment(task_id=t.id, user_id=test_user.id, assigned_by=test_user.id)
+        for t in many_tasks[::2]
+    )
+    db.commit()
+    monkeypatch.setattr(settings, "TASK_EXPORT_CHUNK_SIZE", 5)
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+
+    with capture_statements() as statements:
+        resp = client.get(f"{base}:export", headers=user_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in resp.headers["content-disposition"]
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    # One assignee query per chunk of 5, never one per task.
+    assert sum("FROM assignments JOIN users" in s for s in statements) == 5
+
+    # SQLite drops the UTC offset on the way back, so compare without it.
+    def strip_tz(task):
+        return {
+            **task,
+            **{k: task[k].rstrip("Z") for k in ("created_at", "updated_at")},
+        }
+
+    listed = client.get(f"{base}?limit=500", headers=user_headers).json()["items"]
+    assert list(map(strip_tz, exported)) == sorted(
+        map(strip_tz, listed), key=lambda t: t["id"]
+    )
+    assert exported[0]["assignees"][0]["username"] == test_user.username
+
+
+def test_export_tasks_csv_applies_listing_filters(
+    client: TestClient, user_headers: dict, test_project, many_tasks
+):
+    url = f"/api/v1/projects/{test_project.id}/tasks:export"
+    resp = client.get(f"{url}?format=csv&priority=high&q=paged", headers=user_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    expected = [t.id for t in many_tasks if t.priority == TaskPriority.high]
+    assert [int(r["id"]) for r in rows] == expected
+    assert {r["priority"] for r in rows} == {"high"}
+    assert rows[0]["assignees"] == ""
+
+
+def test_export_tasks_checks_access_before_streaming(
+    client: TestClient, db: Session, user_headers: dict, test_project
+):
+    create_test_user(db, username="outsider", email="outsider@example.com")
+    db.commit()
+    headers = get_auth_headers(client, email="outsider@example.com")
+    url = f"/api/v1/projects/{test_project.id}/tasks:export"
+    assert client.get(url, headers=headers).status_code in (403, 404)
+    resp = client.get(
+        f"{url}?due_date_from=2030-01-02&due_date_to=2030-01-01", headers=user_headers
+    )
+    assert resp.status_code == 400
+
+
+def test_import_tasks_csv_validates_and_resolves_assignees_per_chunk(
+    client: TestClient,
+    db: Session,
+    user_headers: dict,
+    test_project,
+    test_user,
+    monkeypatch,
+):
+    from app.config import settings
+
+    create_test_user(db, username="outsider", email="outsider@example.com")
+    db.commit()
+    monkeypatch.setattr(settings, "TASK_IMPORT_CHUNK_SIZE", 3)
+    body = (
+        "title,description,status,priority,due_date,assignees\n"
+        'One,"multi\nline",in_progress,high,,testuser\n'
+        "Two,,,,,TEST@example.com;testuser\n"
+        " ,,,,,\n"
+        "Four,,bogus,,,\n"
+        "Five,,,,2000-01-01,\n"
+        "Six,,,,,nobody\n"
+        "Seven,,,,,outsider\n"
+        "Eight,,done,low,,\n"
+    )
+    url = f"/api/v1/projects/{test_project.id}/tasks:import?format=csv"
+
+    with capture_statements() as statements:
+        resp = client.post(url, headers=user_headers, content=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["processed"], data["imported"], data["failed"]) == (8, 3, 5)
+    assert [(e["row"], e["code"]) for e in data["errors"]] == [
+        (3, "validation_error"),
+        (4, "validation_error"),
+        (5, "bad_request"),
+        (6, "bad_request"),
+        (7, "not_a_member"),
+    ]
+    assert data["errors"][1]["details"][0]["field"] == "status"
+    assert data["errors"][3]["record"]["assignees"] == "nobody"
+    # Three chunks, each resolving its assignees with one query.
+    assert sum("lower(users.username) IN" in s for s in statements) == 3
+    assert sum(s.startswith("INSERT INTO tasks") for s in statements) == 3
+
+    tasks = client.get(
+        f"/api/v1/projects/{test_project.id}/tasks?sort_by=created_at&sort_dir=asc",
+        headers=user_headers,
+    ).json()["items"]
+    by_title = {t["title"]: t for t in tasks}
+    assert set(by_title) == {"One", "Two", "Eight"}
+    assert by_title["One"]["description"] == "multi\nline"
+    assert by_title["One"]["status"] == "in_progress"
+    assert [a["id"] for a in by_title["Two"]["assignees"]] == [test_user.id]
+    assert by_title["Eight"]["priority"] == "low"
+
+
+def test_import_tasks_round_trips_an_ndjson_export(
+    client: TestClient, db: Session, user_headers: dict, test_project, test_user
+):
+    from app.models.assignment import Assignment
+
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    created = client.post(
+        base,
+        headers=user_headers,
+        json={"title": "Original", "assignee_ids": [test_user.id]},
+    ).json()
+    exported = client.get(f"{base}:export", headers=user_headers).content
+
+    resp = client.post(
+        f"{base}:import", headers=user_headers, content=exported + b"not json\n"
+    )
+    data = resp.json()
+    assert (data["imported"], data["failed"]) == (1, 1)
+    assert data["errors"][0]["row"] == 2
+    copies = db.query(Assignment).filter(Assignment.user_id == test_user.id).all()
+    assert len({a.task_id for a in copies} - {created["id"]}) == 1
+
+
+def test_import_tasks_requires_membership_and_caps_reported_errors(
+    client: TestClient, db: Session, user_headers: dict, test_project, monkeypatch
+):
+    from app.config import settings
+
+    url = f"/api/v1/projects/{test_project.id}/tasks:import"
+    create_test_user(db, username="outsider", email="outsider@example.com")
+    db.commit()
+    headers = get_auth_headers(client, email="outsider@example.com")
+    assert client.post(url, headers=headers, content=b"").status_code in (403, 404)
+
+    monkeypatch.setattr(settings, "TASK_IMPORT_MAX_REPORTED_ERRORS", 2)
+    resp = client.post(url, headers=user_headers, content=b'{"title": ""}\n' * 5)
+    data = resp.json()
+    assert data["failed"] == 5
+    assert len(data["errors"]) == 2 and data["errors_truncated"] is True
+
+
+def test_changes_report_writes_and_deletions_since_cursor(
+    client: TestClient,
+    db: Session,
+    user_headers: dict,
+    test_project,
+    test_user,
+    monkeypatch,
+):
+    from app.config import settings
+    from app.repositories.change_log_repository import ChangeLogRepository
+
+    monkeypatch.setattr(settings, "CHANGES_SETTLE_SECONDS", 0)
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    url = f"/api/v1/projects/{test_project.id}/changes"
+    first, second = (
+        client.post(base, headers=user_headers, json={"title": t}).json()
+        for t in ("First", "Second")
+    )
+
+    sync = client.get(url, headers=user_headers).json()
+    assert [t["id"] for t in sync["tasks"]] == [first["id"], second["id"]]
+    assert sync["deleted_tasks"] == [] and sync["has_more"] is False
+
+    assignments = f"{base}/{second['id']}/assignments"
+    client.post(assignments, headers=user_headers, json={"user_id": test_user.id})
+    client.delete(f"{assignments}/{test_user.id}", headers=user_headers)
+    client.delete(f"{base}/{first['id']}", headers=user_headers)
+    third = client.post(base, headers=user_headers, json={"title": "Third"}).json()
+
+    changes = client.get(
+        url, headers=user_headers, params={"since": sync["next_cursor"]}
+    ).json()
+    assert [t["id"] for t in changes["tasks"]] == [second["id"], third["id"]]
+    assert changes["tasks"][0]["assignees"] == []
+    assert [t["id"] for t in changes["deleted_tasks"]] == [first["id"]]
+    assert [(a["task_id"], a["user_id"]) for a in changes["deleted_assignments"]] == [
+        (second["id"], test_user.id)
+    ]
+
+    quiet = client.get(
+        url, headers=user_headers, params={"since": changes["next_cursor"]}
+    ).json()
+    assert (quiet["tasks"], quiet["deleted_tasks"]) == ([], [])
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert ChangeLogRepository.prune(db, later, batch_size=1) == 2
+
+
+def test_changes_page_by_limit_and_reject_bad_or_expired_cursors(
+    client: TestClient, user_headers: dict, test_project, monkeypatch
+):
+    from app.config import settings
+    from app.services.task_service import encode_changes_cursor
+
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    url = f"/api/v1/projects/{test_project.id}/changes"
+    client.post(
+        f"{base}:batch",
+        headers=user_headers,
+        json={"items": [{"title": f"T{i}"} for i in range(3)]},
+    )
+    # Writes younger than the settle window are held back.
+    assert client.get(url, headers=user_headers).json()["tasks"] == []
+
+    monkeypatch.setattr(settings, "CHANGES_SETTLE_SECONDS", 0)
+    seen, cursor, has_more = [], None, True
+    while has_more:
+        params = {"limit": 2, **({"since": cursor} if cursor else {})}
+        page = client.get(url, headers=user_headers, params=params).json()
+        seen += [t["title"] for t in page["tasks"]]
+        cursor, has_more = page["next_cursor"], page["has_more"]
+    assert seen == ["T0", "T1", "T2"]
+
+    resp = client.get(url, headers=user_headers, params={"since": "garbage"})
+    assert resp.status_code == 400
+    long_ago = datetime.now(timezone.utc) - timedelta(days=365)
+    expired = encode_changes_cursor((long_ago, 0), (long_ago, 0))
+    resp = client.get(url, headers=user_headers, params={"since": expired})
+    assert resp.status_code == 410
+    assert resp.json()["error"]["code"] == "cursor_expired"
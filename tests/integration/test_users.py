@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from tests.conftest import create_test_user
+from tests.conftest import create_test_user, get_auth_headers
 from app.models.user import UserRole
 
 
@@ -13,6 +13,20 @@ def test_list_users_as_admin_returns_200(client: TestClient, admin_headers: dict
     assert "total" in data
 
 
+@pytest.mark.parametrize("include_total", ["none", "estimate"])
+def test_list_users_include_total(
+    client: TestClient, admin_headers: dict, test_user, include_total
+):
+    resp = client.get(
+        "/api/v1/users",
+        headers=admin_headers,
+        params={"include_total": include_total, "limit": 1},
+    )
+    data = resp.json()
+    assert data["has_more"] is True
+    assert data["total"] == (None if include_total == "none" else 2)
+
+
 def test_list_users_as_regular_user_returns_403(client: TestClient, user_headers: dict):
     resp = client.get("/api/v1/users", headers=user_headers)
     assert resp.status_code == 403
@@ -48,6 +62,75 @@ def test_delete_user_as_admin(client: TestClient, admin_headers: dict, db: Sessi
     assert resp.status_code == 204
 
 
+def test_delete_user_records_tasks_and_assignments_taken_along(
+    client: TestClient,
+    admin_headers: dict,
+    user_headers: dict,
+    db: Session,
+    test_project,
+    test_user,
+    monkeypatch,
+):
+    from app.config import settings
+    from app.services.task_stats_service import TaskStatsService
+
+    monkeypatch.setattr(settings, "CHANGES_SETTLE_SECONDS", 0)
+    other = create_test_user(db, username="leaving", email="leaving@example.com")
+    db.commit()
+    client.post(
+        f"/api/v1/projects/{test_project.id}/members",
+        headers=user_headers,
+        json={"user_id": other.id},
+    )
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    kept = client.post(base, headers=user_headers, json={"title": "Kept"}).json()
+    client.post(
+        f"{base}/{kept['id']}/assignments",
+        headers=user_headers,
+        json={"user_id": other.id},
+    )
+    other_headers = get_auth_headers(client, email="leaving@example.com")
+    gone = client.post(base, headers=other_headers, json={"title": "Gone"}).json()
+    url = f"/api/v1/projects/{test_project.id}/changes"
+    cursor = client.get(url, headers=user_headers).json()["next_cursor"]
+
+    resp = client.delete(f"/api/v1/users/{other.id}", headers=admin_headers)
+    assert resp.status_code == 204
+    changes = client.get(url, headers=user_headers, params={"since": cursor}).json()
+    assert [t["id"] for t in changes["deleted_tasks"]] == [gone["id"]]
+    assert [(a["task_id"], a["user_id"]) for a in changes["deleted_assignments"]] == [
+        (kept["id"], other.id)
+    ]
+    assert TaskStatsService.reconcile_batch(db, [test_project.id], fix=False) == []
+
+
+def test_delete_removed_member_moves_project_version(
+    client: TestClient,
+    admin_headers: dict,
+    user_headers: dict,
+    db: Session,
+    test_project,
+):
+    other = create_test_user(db, username="removed", email="removed@example.com")
+    db.commit()
+    members = f"/api/v1/projects/{test_project.id}/members"
+    client.post(members, headers=user_headers, json={"user_id": other.id})
+    base = f"/api/v1/projects/{test_project.id}/tasks"
+    other_headers = get_auth_headers(client, email="removed@example.com")
+    gone = client.post(base, headers=other_headers, json={"title": "Gone"}).json()
+    client.delete(f"{members}/{other.id}", headers=user_headers)
+    first = client.get(base, headers=user_headers)
+    assert [t["id"] for t in first.json()["items"]] == [gone["id"]]
+
+    resp = client.delete(f"/api/v1/users/{other.id}", headers=admin_headers)
+    assert resp.status_code == 204
+    again = client.get(
+        base, headers={**user_headers, "If-None-Match": first.headers["etag"]}
+    )
+    assert again.status_code == 200
+    assert again.json()["items"] == []
+
+
 def test_update_own_profile(client: TestClient, user_headers: dict, test_user):
     resp = client.patch(
         "/api/v1/users/me", headers=user_headers, json={"username": "updatedname"}
@@ -81,3 +81,42 @@ def test_decode_expired_token_raises():
     with pytest.raises(UnauthorizedException) as exc:
         AuthService.decode_access_token(token)
     assert exc.value.code == "token_expired"
+
+
+@pytest.mark.parametrize("mode", ["process", "thread", "shared"])
+async def test_password_hash_executor_round_trip(mode):
+    from app.hashing import PasswordHashExecutor
+
+    executor = PasswordHashExecutor(mode=mode, workers=1, max_pending=4, rounds=4)
+    try:
+        hashed = await executor.hash("MyPassword1")
+        assert await executor.verify("MyPassword1", hashed) is True
+        assert await executor.verify("WrongPass1", hashed) is False
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+async def test_password_hash_executor_rejects_beyond_admission_limit():
+    import asyncio
+    from app.hashing import PasswordHashExecutor, HashingOverloaded
+
+    executor = PasswordHashExecutor(mode="thread", workers=1, max_pending=1, rounds=10)
+    try:
+        first = asyncio.ensure_future(executor.hash("MyPassword1"))
+        await asyncio.sleep(0)
+        with pytest.raises(HashingOverloaded):
+            await executor.hash("MyPassword2")
+        await first
+    finally:
+        executor.shutdown()
+
+
+async def test_verify_password_async_maps_overload_to_503(monkeypatch):
+    from app.exceptions import ServiceUnavailableException
+    from app.services import auth_service
+
+    monkeypatch.setattr(auth_service.password_hasher, "max_pending", 0)
+    with pytest.raises(ServiceUnavailableException) as exc:
+        await AuthService.verify_password_async("MyPassword1", "irrelevant")
+    assert exc.value.code == "server_busy"
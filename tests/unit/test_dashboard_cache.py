@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.commit_hooks import on_commit
+from app.dashboard_cache import DashboardCache
+
+
+def test_commit_hooks_run_after_commit_only():
+    calls = []
+    with Session(create_engine("sqlite://")) as session:
+        on_commit(session, lambda: calls.append("rolled back"))
+        session.execute(text("SELECT 1"))
+        session.rollback()
+        on_commit(session, lambda: calls.append("committed"))
+        session.execute(text("SELECT 1"))
+        assert calls == []
+        session.commit()
+    assert calls == ["committed"]
+
+
+def test_dashboard_cache_entries_go_stale_with_their_projects():
+    cache = DashboardCache(maxsize=10, ttl=60)
+    today = date.today()
+    cache.set(1, cache.now(), {10}, False, today, {"user": 1})
+    cache.set(2, cache.now(), {20}, True, today, {"user": 2})
+
+    cache.projects_changed([20])
+    assert cache.get(1, today) == {"user": 1}
+    assert cache.get(2, today) is None
+
+    cache.set(2, cache.now(), {20}, True, today, {"user": 2})
+    cache.project_set_changed()
+    assert cache.get(1, today) == {"user": 1}
+    assert cache.get(2, today) is None
+    # Overdue counts depend on the date.
+    assert cache.get(1, today + timedelta(days=1)) is None
+    assert cache.stats()["stale"] == 3
+
+
+def test_dashboard_cache_drops_project_stamps_older_than_the_ttl(monkeypatch):
+    import app.dashboard_cache as module
+
+    clock = [0.0]
+    monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    cache = DashboardCache(maxsize=10, ttl=60)
+    today = date.today()
+    # Built before the change below but, as if its query ran long, stored
+    # after; it must not outlive the stamp that made it stale.
+    cache.set(1, cache.now(), {10}, False, today, {"user": 1})
+    cache.projects_changed([10])
+
+    clock[0] = 100
+    cache.set(2, cache.now(), {30}, False, today, {"user": 2})
+    cache.projects_changed([20])
+    assert list(cache._project_changed_at) == [20]
+    assert cache.get(1, today) is None
+    assert cache.get(2, today) == {"user": 2}
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from app.events import (
+    MemoryEventBroker,
+    RedisEventBroker,
+    StreamLagged,
+    event_stream,
+)
+
+
+def _broker(**kwargs) -> MemoryEventBroker:
+    options = {"replay_size": 10, "max_projects": 10, "buffer_size": 10, **kwargs}
+    return MemoryEventBroker(**options)
+
+
+def _published(broker: MemoryEventBroker, project_id: int):
+    return [event for _, event in broker._logs[project_id].events]
+
+
+async def test_resume_replays_missed_events_then_follows_live_ones():
+    broker = _broker()
+    broker.publish(1, "task.created", {"id": 1})
+    broker.publish(2, "task.created", {"id": 2})
+    broker.publish(1, "task.updated", {"id": 1})
+    first, missed = _published(broker, 1)
+
+    subscription = await broker.subscribe(1, first.id)
+    assert subscription.reset is None
+    broker.publish(1, "task.deleted", {"id": 1})
+    received = [await subscription.next(1), await subscription.next(1)]
+    assert [e.type for e in received] == ["task.updated", "task.deleted"]
+    assert received[0] == missed
+    assert await subscription.next(0.01) is None
+
+    subscription.close()
+    assert broker.stats()["subscribers"] == 0
+
+
+@pytest.mark.parametrize("last_event_id", ["other-1", "garbage", "trimmed", "evicted"])
+async def test_resume_from_lost_position_resets(last_event_id):
+    broker = _broker(replay_size=2, max_projects=1)
+    for i in range(4):
+        broker.publish(1, "task.created", {"id": i})
+    if last_event_id == "trimmed":
+        # Event 2 followed it and is gone; events 3 and 4 are still kept.
+        last_event_id = f"{broker.epoch}-1"
+    elif last_event_id == "evicted":
+        broker.publish(2, "task.created", {"id": 4})
+        last_event_id = f"{broker.epoch}-3"
+
+    subscription = await broker.subscribe(1, last_event_id)
+    assert subscription.reset == f"{broker.epoch}-{broker._seq}"
+    assert await subscription.next(0.01) is None
+    assert broker.stats()["resets"] == 1
+
+
+async def test_project_without_recent_events_resumes_without_reset():
+    broker = _broker(max_projects=1)
+    broker.publish(1, "task.created", {"id": 1})
+    broker.publish(2, "task.created", {"id": 2})
+    subscription = await broker.subscribe(3, f"{broker.epoch}-2")
+    assert subscription.reset is None
+
+
+async def test_slow_subscriber_is_dropped_and_resumes_from_replay():
+    broker = _broker(buffer_size=2)
+    subscription = await broker.subscribe(1, None)
+    for i in range(3):
+        broker.publish(1, "task.created", {"id": i})
+    await asyncio.sleep(0)
+
+    with pytest.raises(StreamLagged):
+        await subscription.next(1)
+    stats = broker.stats()
+    assert (stats["lagged"], stats["subscribers"]) == (1, 0)
+
+    first = _published(broker, 1)[0]
+    resumed = await broker.subscribe(1, first.id)
+    assert [(await resumed.next(1)).data["id"] for _ in range(2)] == [1, 2]
+
+
+async def test_event_stream_sends_heartbeats_and_ends_on_closing_event():
+    broker = _broker()
+    broker.publish(1, "task.created", {"id": 1})
+    subscription = await broker.subscribe(1, "stale-1")
+
+    async def publish_later():
+        await asyncio.sleep(0.05)
+        broker.publish(1, "project.deleted", {"id": 1})
+        broker.publish(1, "task.created", {"id": 2})
+
+    publisher = asyncio.ensure_future(publish_later())
+    chunks = [
+        chunk
+        async for chunk in event_stream(
+            subscription, 0.02, 5, lambda e: e.type == "project.deleted"
+        )
+    ]
+    await publisher
+
+    assert chunks[0] == b"retry: 3000\n\n"
+    assert chunks[1] == b"id: %s\nevent: reset\ndata: {}\n\n" % (
+        f"{broker.epoch}-1".encode()
+    )
+    assert b": keep-alive\n\n" in chunks
+    assert chunks[-1] == b'id: %s\nevent: project.deleted\ndata: {"id":1}\n\n' % (
+        f"{broker.epoch}-2".encode()
+    )
+    assert broker.stats()["subscribers"] == 0
+
+
+class _Streams:
+    def __init__(self):
+        self.added = []
+
+    def xadd(self, key, fields, maxlen, approximate):
+        self.added.append((key, fields["type"]))
+
+
+class _AsyncStreams(_Streams):
+    async def xadd(self, key, fields, maxlen, approximate):
+        await asyncio.sleep(0)
+        super().xadd(key, fields, maxlen, approximate)
+
+
+async def test_redis_broker_publishes_from_the_loop_once_started():
+    client, async_client = _Streams(), _AsyncStreams()
+    broker = RedisEventBroker(client, async_client, replay_size=10, buffer_size=10)
+    broker.publish(1, "task.created", {"id": 1})
+    assert client.added == [("events:1", "task.created")]
+
+    await broker.start()
+    await asyncio.to_thread(broker.publish, 1, "task.updated", {"id": 1})
+    broker.publish(2, "task.deleted", {"id": 2})
+    await broker.stop()
+    assert async_client.added == [
+        ("events:1", "task.updated"),
+        ("events:2", "task.deleted"),
+    ]
+    assert len(client.added) == 1 and broker.stats()["published"] == 3
@@ -1,10 +1,13 @@
 import pytest
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
+from app.models.project_member import ProjectMember
+from app.services.project_access import get_project_access
 from app.services.project_service import ProjectService
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.exceptions import ForbiddenException, NotFoundException, ConflictException
 from app.models.user import UserRole
-from tests.conftest import create_test_user
+from tests.conftest import capture_statements, create_test_user
 
 
 def make_project(db, user, name="My Project"):
@@ -90,3 +93,46 @@ def test_admin_can_update_any_project(db: Session):
         db, project.id, admin, ProjectUpdate(name="Admin Updated")
     )
     assert updated.name == "Admin Updated"
+
+
+def _count_queries(fn):
+    with capture_statements() as statements:
+        result = fn()
+    return result, len(statements)
+
+
+def test_project_access_is_one_query_and_memoized(db: Session):
+    owner = create_test_user(db, username="owner6", email="owner6@example.com")
+    member = create_test_user(db, username="mem6", email="mem6@example.com")
+    db.commit()
+    project = make_project(db, owner)
+    for i in range(20):
+        extra = create_test_user(db, username=f"x{i}", email=f"x{i}@example.com")
+        db.add(ProjectMember(project_id=project.id, user_id=extra.id))
+    db.add(ProjectMember(project_id=project.id, user_id=member.id))
+    db.commit()
+    db.refresh(member)
+    project_id = project.id
+
+    access, queries = _count_queries(lambda: get_project_access(db, project_id, member))
+    assert queries == 1
+    assert access.is_member and not access.is_owner and not access.can_manage
+    assert "members" not in inspect(access.project).dict
+
+    _, queries = _count_queries(
+        lambda: ProjectService.get_project(db, project_id, member)
+    )
+    assert queries == 0
+
+
+def test_project_access_memo_dropped_on_commit(db: Session):
+    owner = create_test_user(db, username="owner7", email="owner7@example.com")
+    member = create_test_user(db, username="mem7", email="mem7@example.com")
+    db.commit()
+    project = make_project(db, owner)
+    ProjectService.add_member(db, project.id, owner, member.id)
+    assert get_project_access(db, project.id, member).is_member
+
+    ProjectService.remove_member(db, project.id, owner, member.id)
+    with pytest.raises(NotFoundException):
+        get_project_access(db, project.id, member)
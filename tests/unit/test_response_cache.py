@@ -0,0 +1,51 @@
+from app.response_cache import (
+    LocalKeyValueStore,
+    MemoryResponseBackend,
+    SharedResponseBackend,
+)
+
+
+async def test_memory_backend_evicts_least_recently_used_by_bytes():
+    cache = MemoryResponseBackend(max_bytes=10, max_entry_bytes=10)
+    await cache.set("a", b"aaaa")
+    await cache.set("b", b"bbbb")
+    assert await cache.get("a") == b"aaaa"
+    await cache.set("c", b"cccc")
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"aaaa" and await cache.get("c") == b"cccc"
+    stats = cache.stats()
+    assert stats["bytes"] == 8
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+async def test_memory_backend_skips_oversized_bodies_and_can_be_disabled():
+    cache = MemoryResponseBackend(max_bytes=100, max_entry_bytes=4)
+    await cache.set("big", b"12345")
+    assert await cache.get("big") is None
+    disabled = MemoryResponseBackend(0, 0)
+    await disabled.set("a", b"x")
+    assert await disabled.get("a") is None
+
+
+async def test_shared_backend_round_trips_through_the_store():
+    store = LocalKeyValueStore()
+    worker_a = SharedResponseBackend(store, ttl=60)
+    worker_b = SharedResponseBackend(store, ttl=60)
+    await worker_a.set("k", b"body")
+    assert await worker_b.get("k") == b"body"
+    assert worker_b.stats()["hit_ratio"] == 1.0
+
+
+async def test_shared_backend_treats_store_errors_as_misses():
+    class Down:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ex):
+            raise ConnectionError("down")
+
+    cache = SharedResponseBackend(Down(), ttl=60)
+    await cache.set("k", b"body")
+    assert await cache.get("k") is None
+    assert cache.stats()["errors"] == 2
@@ -0,0 +1,72 @@
+import json
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from tests.conftest import create_test_user
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.task import Task, TaskPriority
+from app.repositories.pagination import Page
+from app.repositories.task_repository import TaskRepository
+from app.schemas.assignment import AssignmentResponse
+from app.schemas.common import PaginatedResponse
+from app.schemas.project import ProjectResponse
+from app.routers.tasks import _build_task_response
+from app.schemas.task import TaskResponse
+from app.schemas.user import UserResponse
+from app.serialization import (
+    assignment_payload,
+    dumps,
+    page_payload,
+    project_payload,
+    task_payload,
+    user_payload,
+)
+
+
+def _same_document(fast: bytes, model) -> None:
+    assert json.loads(fast) == json.loads(model.model_dump_json())
+
+
+def test_task_page_matches_response_schema(db: Session):
+    user = create_test_user(db)
+    project = Project(name="Serialize", owner_id=user.id)
+    db.add(project)
+    db.flush()
+    task = Task(
+        title="T",
+        project_id=project.id,
+        created_by=user.id,
+        priority=TaskPriority.high,
+        due_date=date(2030, 1, 1),
+    )
+    db.add(task)
+    db.flush()
+    db.add(Assignment(task_id=task.id, user_id=user.id, assigned_by=user.id))
+    db.commit()
+    task = TaskRepository.get_by_id(db, task.id)
+    page = Page(items=[task], total=1, next_cursor="abc", has_more=True)
+
+    expected = PaginatedResponse[TaskResponse].from_page(
+        page, 20, 0, items=[_build_task_response(task)]
+    )
+    _same_document(
+        dumps(page_payload(page, 20, 0, map(task_payload, page.items))), expected
+    )
+    _same_document(
+        dumps(project_payload(project)), ProjectResponse.model_validate(project)
+    )
+    _same_document(dumps(user_payload(user)), UserResponse.model_validate(user))
+    assignment = task.assignments[0]
+    _same_document(
+        dumps(assignment_payload(assignment)),
+        AssignmentResponse.model_validate(assignment),
+    )
+
+
+def test_dumps_writes_utc_like_pydantic():
+    from datetime import datetime, timezone
+
+    moment = datetime(2030, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc)
+    assert dumps({"at": moment}) == b'{"at":"2030-01-02T03:04:05.000600Z"}'
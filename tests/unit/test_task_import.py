@@ -0,0 +1,50 @@
+import contextlib
+import json
+from datetime import date, datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app import cli
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.repositories.bulk_copy import copy_buffer
+from app.services.project_service import ProjectService
+from app.schemas.project import ProjectCreate
+from tests.conftest import create_test_user
+
+
+def test_copy_buffer_writes_enum_names_iso_dates_nulls_and_empty_strings():
+    rows = [
+        (1, 'Say "hi", twice', None, TaskStatus.in_progress, date(2030, 1, 2)),
+        (
+            2,
+            "multi\nline",
+            "",
+            TaskPriority.high,
+            datetime(2030, 1, 2, tzinfo=timezone.utc),
+        ),
+    ]
+    assert copy_buffer(rows).read() == (
+        '"1","Say ""hi"", twice",\\N,"in_progress","2030-01-02"\n'
+        '"2","multi\nline","","high","2030-01-02T00:00:00+00:00"\n'
+    )
+
+
+def test_cli_import_writes_error_file(db: Session, tmp_path, monkeypatch, capsys):
+    owner = create_test_user(db, username="cliowner", email="cli@example.com")
+    db.commit()
+    project = ProjectService.create_project(db, owner, ProjectCreate(name="CLI"))
+    monkeypatch.setattr(cli, "SessionLocal", lambda: contextlib.nullcontext(db))
+    source = tmp_path / "tasks.csv"
+    source.write_text("title,assignees\nKept,cliowner\n,\n")
+
+    status = cli.main(
+        ["import-tasks", str(project.id), str(source), "--as", "CLI@example.com"]
+    )
+    assert status == 1
+    assert "2 rows: 1 imported, 1 failed" in capsys.readouterr().err
+    [error] = map(json.loads, (tmp_path / "tasks.csv.errors.ndjson").open())
+    assert (error["row"], error["code"]) == (2, "validation_error")
+    [task] = db.query(Task).filter(Task.project_id == project.id).all()
+    assert [a.user_id for a in task.assignments] == [owner.id]
+
+    assert cli.main(["import-tasks", "1", str(source), "--as", "x@y.z"]) == 2
@@ -7,7 +7,9 @@ from app.schemas.task import TaskCreate, TaskUpdate
 from app.schemas.project import ProjectCreate
 from app.models.task import TaskStatus, TaskPriority
 from app.exceptions import ForbiddenException, NotFoundException, BadRequestException
-from tests.conftest import create_test_user
+from sqlalchemy import event
+from app.models.project_member import ProjectMember
+from tests.conftest import capture_statements, create_test_user
 
 
 def setup_project_and_task(db):
@@ -120,3 +122,174 @@ def test_list_tasks_search(db: Session):
     tasks, total = TaskService.list_tasks(db, project.id, owner, q="login")
     assert total == 1
     assert "login" in tasks[0].title.lower()
+
+
+def test_create_task_with_assignees_is_one_transaction(db: Session):
+    owner = create_test_user(db, username="towner7", email="towner7@example.com")
+    db.commit()
+    project = ProjectService.create_project(db, owner, ProjectCreate(name="P7"))
+    assignees = [
+        create_test_user(db, username=f"ta{i}", email=f"ta{i}@example.com")
+        for i in range(10)
+    ]
+    db.add_all(ProjectMember(project_id=project.id, user_id=u.id) for u in assignees)
+    db.commit()
+    assignee_ids = [u.id for u in assignees]
+    project_id = project.id
+    db.refresh(owner)
+
+    commits = []
+
+    def on_commit(session):
+        commits.append(session)
+
+    event.listen(db, "after_commit", on_commit)
+    try:
+        with capture_statements() as statements:
+            task = TaskService.create_task(
+                db,
+                project_id,
+                owner,
+                TaskCreate(title="Bulk", assignee_ids=assignee_ids + assignee_ids[:2]),
+            )
+    finally:
+        event.remove(db, "after_commit", on_commit)
+
+    assert len(commits) == 1
+    # access check, membership check, task insert, assignment insert, reload of
+    # the task with its assignments and assignees
+    assert len(statements) <= 7
+    assert sum("INSERT INTO assignments" in s for s in statements) == 1
+    assert sorted(a.user_id for a in task.assignments) == sorted(assignee_ids)
+
+
+def test_create_task_with_non_member_assignee_raises(db: Session):
+    owner = create_test_user(db, username="towner8", email="towner8@example.com")
+    outsider = create_test_user(db, username="outsider", email="out@example.com")
+    db.commit()
+    project = ProjectService.create_project(db, owner, ProjectCreate(name="P8"))
+    with pytest.raises(ForbiddenException):
+        TaskService.create_task(
+            db,
+            project.id,
+            owner,
+            TaskCreate(title="Nope", assignee_ids=[owner.id, outsider.id]),
+        )
+    tasks, total = TaskService.list_tasks(db, project.id, owner)
+    assert total == 0
+
+
+def _project_with_members(db, name, count):
+    owner = create_test_user(db, username=f"{name}o", email=f"{name}o@example.com")
+    db.commit()
+    project = ProjectService.create_project(db, owner, ProjectCreate(name=name))
+    members = [
+        create_test_user(db, username=f"{name}{i}", email=f"{name}{i}@example.com")
+        for i in range(count)
+    ]
+    db.add_all(ProjectMember(project_id=project.id, user_id=m.id) for m in members)
+    db.commit()
+    db.refresh(owner)
+    return owner, project.id, [m.id for m in members]
+
+
+def _writes(statements):
+    return [s for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+
+
+def test_update_task_with_unchanged_assignees_writes_nothing(db: Session):
+    owner, project_id, member_ids = _project_with_members(db, "ua", 3)
+    task = TaskService.create_task(
+        db, project_id, owner, TaskCreate(title="Same", assignee_ids=member_ids)
+    )
+    assigned_at = {a.user_id: a.assigned_at for a in task.assignments}
+    task_id = task.id
+
+    with capture_statements() as statements:
+        task = TaskService.update_task(
+            db, project_id, task_id, owner, TaskUpdate(assignee_ids=member_ids[::-1])
+        )
+    assert _writes(statements) == []
+    assert {a.user_id: a.assigned_at for a in task.assignments} == assigned_at
+
+
+def test_update_task_applies_assignee_diff_in_bulk(db: Session):
+    owner, project_id, member_ids = _project_with_members(db, "ub", 5)
+    task = TaskService.create_task(
+        db, project_id, owner, TaskCreate(title="Diff", assignee_ids=member_ids[:3])
+    )
+    kept = {
+        a.user_id: a.assigned_at for a in task.assignments if a.user_id != member_ids[0]
+    }
+    task_id = task.id
+
+    with capture_statements() as statements:
+        task = TaskService.update_task(
+            db,
+            project_id,
+            task_id,
+            owner,
+            TaskUpdate(status=TaskStatus.done, assignee_ids=member_ids[1:]),
+        )
+    writes = _writes(statements)
+    # task UPDATE, assignment DELETE and INSERT, the unassignment's
+    # tombstone, project version bump and the task counter upsert
+    assert sorted(w.split()[0] for w in writes) == [
+        "DELETE",
+        "INSERT",
+        "INSERT",
+        "INSERT",
+        "UPDATE",
+        "UPDATE",
+    ]
+    assert task.status == TaskStatus.done
+    assigned = {a.user_id: a.assigned_at for a in task.assignments}
+    assert sorted(assigned) == sorted(member_ids[1:])
+    assert all(assigned[uid] == at for uid, at in kept.items())
+
+
+def test_update_task_rejects_non_member_assignee(db: Session):
+    owner, project_id, member_ids = _project_with_members(db, "uc", 1)
+    outsider = create_test_user(db, username="ucx", email="ucx@example.com")
+    db.commit()
+    task = TaskService.create_task(db, project_id, owner, TaskCreate(title="T"))
+    with pytest.raises(ForbiddenException):
+        TaskService.update_task(
+            db, project_id, task.id, owner, TaskUpdate(assignee_ids=[outsider.id])
+        )
+
+
+def test_update_task_status_round_trips(db: Session):
+    owner, project_id, member_ids = _project_with_members(db, "us", 2)
+    task = TaskService.create_task(
+        db, project_id, owner, TaskCreate(title="Status", assignee_ids=member_ids)
+    )
+    task_id = task.id
+
+    with capture_statements() as statements:
+        task = TaskService.update_task(
+            db, project_id, task_id, owner, TaskUpdate(status=TaskStatus.done)
+        )
+        # Everything the response needs is loaded; serializing costs nothing.
+        assignees = sorted(a.assignee.id for a in task.assignments)
+        task.updated_at, task.title
+
+    # access check, task with assignees, UPDATE ... RETURNING, version bump,
+    # task counters
+    assert len(statements) == 5
+    assert _writes(statements) == statements[-3:]
+    assert "RETURNING" in statements[-3]
+    assert statements[-2].startswith("UPDATE projects SET")
+    assert statements[-1].startswith("INSERT INTO project_task_stats")
+    assert task.status == TaskStatus.done
+    assert assignees == sorted(member_ids)
+
+
+def test_create_task_without_assignees_is_not_reloaded(db: Session):
+    owner, project_id, _ = _project_with_members(db, "uc", 0)
+    with capture_statements() as statements:
+        task = TaskService.create_task(db, project_id, owner, TaskCreate(title="New"))
+        task.created_at, task.assignments
+    # access check, the INSERT, the project version bump and task counters
+    assert len(statements) == 4
+    assert task.assignments == []